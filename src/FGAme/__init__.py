@@ -8,6 +8,7 @@ from .objects import *
 from . import mathtools as math
 from . import draw
 from .sound import play, music, stop_music, stop_sfx, mute, Sound, Music, SFX
+from .preloader import Preloader, preload
 from .draw import Color
 from . import physics
 from .zero import run, start
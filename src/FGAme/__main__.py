@@ -1,4 +1,6 @@
 import argparse
+import os
+
 import FGAme
 from FGAme import __version__
 
@@ -10,8 +12,31 @@ def get_parser():
     parser = argparse.ArgumentParser('FGAme')
     version = '%(prog)s ' + __version__
     parser.add_argument('--version', '-v', action='version', version=version)
+    subparsers = parser.add_subparsers(dest='command')
+
+    bundle = subparsers.add_parser(
+        'bundle', help='pack an assets directory into a single bundle file')
+    bundle.add_argument('root', help='assets directory')
+    bundle.add_argument('--output', '-o', default='assets.fgb',
+                        help='output file (default: assets.fgb)')
+    bundle.add_argument('--decode', '-d', action='store_true',
+                        help='store images as raw RGBA and WAV files as PCM')
     return parser
 
+
+def build_bundle(args):
+    """
+    Executes the "bundle" command.
+    """
+
+    from FGAme.bundle import build_bundle, Bundle
+
+    build_bundle(args.root, args.output, decode=args.decode)
+    with Bundle(args.output) as bundle:
+        size = os.path.getsize(args.output)
+        print('%s: %d assets, %d bytes' % (args.output, len(bundle), size))
+
+
 def main(args=None):
     """
     Main entry point for your project.
@@ -25,8 +50,10 @@ def main(args=None):
     parser = get_parser()
     args = parser.parse_args(args)
 
-    # Put your main script logic here
-    print('No action defined for FGAme module!')
+    if args.command == 'bundle':
+        build_bundle(args)
+    else:
+        print('No action defined for FGAme module!')
 
 
 if __name__ == '__main__':
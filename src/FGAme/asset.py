@@ -1,14 +1,173 @@
+import io
+import json
 import os
 import sys
+import time
 from lazyutils import lazy
 
 import FGAme
+from FGAme.bundle import find_entry
 from FGAme.utils import snake_case
 
+MANIFEST_NAME = '.asset-index.json'
+
+
+class AssetIndex:
+    """
+    Maps logical asset names to files inside a root directory.
+
+    The index is built once by scanning the directory tree or by reading a
+    manifest file named ``.asset-index.json`` at the root, which can be created
+    with :meth:`write_manifest`. Names found in the index do not touch the
+    filesystem. Names missing from the index are probed directly on disk, so
+    files created after the index was built are still found.
+
+    Args:
+        root:
+            Root directory. It is not an error if it does not exist.
+        watch (bool):
+            If True, the index checks the modification time of scanned
+            directories (at most once every `watch_interval` seconds) and
+            rebuilds itself if some of them have changed.
+    """
+
+    watch_interval = 1.0
+
+    def __init__(self, root, watch=False):
+        self.root = os.path.abspath(root)
+        self.watch = watch
+        self._files = {}
+        self._mtimes = {}
+        self._last_check = 0.0
+        self.refresh()
+
+    def __len__(self):
+        return len(self._files)
+
+    def __contains__(self, name):
+        return name in self._files
+
+    def refresh(self):
+        """
+        Rebuild index.
+        """
+
+        self._files = {}
+        self._mtimes = {}
+        self._last_check = time.time()
+        manifest = os.path.join(self.root, MANIFEST_NAME)
+        if os.path.exists(manifest):
+            with open(manifest) as F:
+                files = json.load(F)['files']
+            self._mtimes[manifest] = os.path.getmtime(manifest)
+        else:
+            files = self._scan()
+        for file in files:
+            name, ext = os.path.splitext(file)
+            self._files.setdefault(name, {})[ext] = file
+            if ext:
+                # Full names are found with an empty extension
+                self._files.setdefault(file, {})[''] = file
+
+    def _scan(self):
+        files = []
+        for dirpath, _, filenames in os.walk(self.root):
+            self._mtimes[dirpath] = os.path.getmtime(dirpath)
+            base = os.path.relpath(dirpath, self.root)
+            base = '' if base == '.' else base.replace(os.sep, '/') + '/'
+            files.extend(base + name for name in filenames
+                         if name != MANIFEST_NAME)
+        return files
+
+    def _check(self):
+        now = time.time()
+        if now - self._last_check < self.watch_interval:
+            return
+        self._last_check = now
+        for path, mtime in self._mtimes.items():
+            try:
+                if os.path.getmtime(path) != mtime:
+                    break
+            except OSError:
+                break
+        else:
+            if self._mtimes or not os.path.exists(self.root):
+                return
+        self.refresh()
+
+    def lookup(self, name, extensions=('',)):
+        """
+        Return the full path for the given name using the first matching
+        extension or None if no file is found.
+        """
+
+        if self.watch:
+            self._check()
+        files = self._files.get(name, {})
+        for ext in extensions:
+            if ext in files:
+                return os.path.join(self.root, *files[ext].split('/'))
+        return self._probe(name, extensions)
+
+    def _probe(self, name, extensions):
+        # Index miss: check the filesystem and remember new files
+        base = os.path.join(self.root, *name.split('/'))
+        for ext in extensions:
+            path = base + ext
+            if os.path.isfile(path):
+                self._files.setdefault(name, {})[ext] = name + ext
+                return path
+        return None
+
+    def write_manifest(self):
+        """
+        Save a manifest with all files at the root directory. Future indexes
+        for this directory will read it instead of scanning.
+        """
+
+        files = sorted({file for exts in self._files.values()
+                        for file in exts.values()})
+        path = os.path.join(self.root, MANIFEST_NAME)
+        with open(path, 'w') as F:
+            json.dump({'files': files}, F, indent=2)
+        return path
+
+
+_indexes = {}
+_caller_dirs = {}
+
+
+def get_index(root, watch=False):
+    """
+    Return the shared AssetIndex for the given root directory.
+    """
+
+    root = os.path.abspath(root)
+    try:
+        index = _indexes[root]
+    except KeyError:
+        index = _indexes[root] = AssetIndex(root, watch)
+    if watch:
+        index.watch = True
+    return index
+
+
+def clear_indexes():
+    """
+    Discard all asset indexes. They are rebuilt on the next lookup.
+    """
+
+    _indexes.clear()
+    _caller_dirs.clear()
+
 
 class Asset:
     """
     Generic asset
+
+    Assets are searched in the mounted bundles (see :mod:`FGAme.bundle`)
+    before the filesystem. Bundled assets have a None path and store the
+    bundle entry in the ``entry`` attribute.
     """
 
     extensions = ['']
@@ -22,11 +181,16 @@ class Asset:
         if file_type is not None:
             self.file_type = file_type
         self.extensions = list(extensions or self.extensions)
-        try:
-            self.path = self.best_path()
-        except ValueError:
+        self.entry = find_entry('%s/%s' % (self.file_type, name),
+                                self.extensions)
+        if self.entry is not None:
             self.path = None
-        self.is_valid = self.path is not None
+        else:
+            try:
+                self.path = self.best_path()
+            except ValueError:
+                self.path = None
+        self.is_valid = self.path is not None or self.entry is not None
 
     def __repr__(self):
         return '%s(%r)' % (type(self).__name__, self.name)
@@ -54,17 +218,9 @@ class Asset:
         glob = os.path.dirname(FGAme.__file__)
         yield os.path.join(glob, 'assets', self.file_type)
 
-        # Inspect frame globals and use asset directory from calling module
-        frame = sys._getframe()
-        modname = frame.f_globals.get('__name__', 'FGAme').partition('.')[0]
-        while modname == 'FGAme':
-            frame = frame.f_back
-            if frame is None:
-                return
-            modname = frame.f_globals.get('__name__', 'FGAme').partition('.')[0]
-        mod = sys.modules[modname]
-        base = os.path.dirname(mod.__file__)
-        yield os.path.join(base, 'assets')
+        caller_dir = _caller_directory()
+        if caller_dir is not None:
+            yield caller_dir
 
     def best_path(self):
         """
@@ -72,8 +228,9 @@ class Asset:
         If no suitable files are found, raise a ValueError.
         """
 
-        for path in self.paths():
-            if os.path.exists(path):
+        for directory in self.directories():
+            path = get_index(directory).lookup(self.name, self.extensions)
+            if path is not None:
                 return path
         raise ValueError('no file found for asset %r' % self.name)
 
@@ -82,6 +239,11 @@ class Asset:
         Return an open file descriptor.
         """
 
+        if self.entry is not None:
+            if mode not in ('r', 'rb'):
+                raise ValueError('bundled assets are read-only')
+            F = self.entry.open()
+            return F if mode == 'rb' else io.TextIOWrapper(F, encoding)
         return open(self.path, mode=mode, encoding=encoding)
 
     def __enter__(self):
@@ -89,4 +251,27 @@ class Asset:
         return F.__enter__()
 
     def __exit__(self, *args):
-        self.__file.__exit__(*args)
\ No newline at end of file
+        self.__file.__exit__(*args)
+
+
+def _caller_directory():
+    # Return the assets directory of the first module outside FGAme in the
+    # call stack. Directories are cached per module.
+    frame = sys._getframe(1)
+    while frame is not None:
+        modname = frame.f_globals.get('__name__', 'FGAme').partition('.')[0]
+        if modname != 'FGAme':
+            break
+        frame = frame.f_back
+    else:
+        return None
+
+    try:
+        return _caller_dirs[modname]
+    except KeyError:
+        pass
+    path = getattr(sys.modules.get(modname), '__file__', None)
+    if path is not None:
+        path = os.path.join(os.path.dirname(os.path.abspath(path)), 'assets')
+    _caller_dirs[modname] = path
+    return path
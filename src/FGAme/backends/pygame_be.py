@@ -65,9 +65,32 @@ class PyGameCanvas(Canvas):
         pt1, pt2 = [(int(x), int(Y - y)) for (x, y) in segment]
         self._pg_segment(self._screen, color, pt1, pt2, int(width))
 
-    def raw_texture(self, texture, pos=(0, 0)):
+    def raw_circles_solid(self, centers, radii, colors):
+        Y = self.height
+        screen = self._screen
+        draw_circle = self._pg_draw_circle
+        for (x, y), radius, color in zip(centers, radii, colors):
+            draw_circle(screen, color, (int(x), Y - int(y)), int(radius), 0)
+
+    def raw_aabbs_solid(self, aabbs, colors):
+        Y = self.height
+        screen = self._screen
+        draw_rect = self._pg_draw_rect
+        for (x, x_, y, y_), color in zip(aabbs, colors):
+            x, x_, y, y_ = int(x), int(x_), int(y), int(y_)
+            draw_rect(screen, color, (x, Y - y_, x_ - x, y_ - y), 0)
+
+    def raw_polys_solid(self, polys, colors):
+        Y = self.height
+        screen = self._screen
+        draw_poly = self._pg_draw_poly
+        for vertices, color in zip(polys, colors):
+            vertices = [(int(x), int(Y - y)) for (x, y) in vertices]
+            draw_poly(screen, color, vertices, 0)
+
+    def _pg_texture(self, texture):
         try:
-            pg_texture = texture.data
+            return texture.data
         except AttributeError:
             pil_data = texture.get_pil_data()
             if pil_data.mode not in 'RGB' or 'RGBA':
@@ -76,25 +99,76 @@ class PyGameCanvas(Canvas):
                 pil_data.tobytes(),
                 texture.shape, pil_data.mode)
             texture.set_backend_data(pg_texture)
+            return pg_texture
 
-        x, y, dx, dy = pg_texture.get_rect()
-        x += pos[0]
-        y += pos[1] + dy
-        self._screen.blit(pg_texture, (x, self.height - y, dx, dy))
+    def raw_texture(self, texture, pos=(0, 0)):
+        # Sub-textures are drawn as a region of the page, which is converted
+        # only once
+        page = getattr(texture, 'page', None)
+        if page is not None:
+            pg_texture = self._pg_texture(page)
+            area = texture.rect
+        else:
+            pg_texture = self._pg_texture(texture)
+            area = None
+
+        dx, dy = texture.shape
+        x, y = pos
+        self._screen.blit(pg_texture, (x, self.height - y - dy, dx, dy), area)
+
+    def raw_render_offscreen(self, shape, draw_func):
+        # Temporarily redirects all drawing functions to an off-screen surface
+        surface = pygame.Surface(shape, pygame.SRCALPHA)
+        screen, height = self._screen, self.height
+        self._screen, self.height = surface, shape[1]
+        try:
+            draw_func()
+        finally:
+            self._screen, self.height = screen, height
+        return surface
+
+    def raw_offscreen(self, surface, pos=(0, 0)):
+        x, y = pos
+        y = self.height - int(y) - surface.get_height()
+        self._screen.blit(surface, (int(x), y))
 
     def paint_pixel(self, pos, color=Color(0, 0, 0)):
         x, y = self._map_point(*pos)
         self._screen.set_at(x, y, rgb(color))
 
     def prepare_image(self, asset):
-        path = asset.path
-        return pygame.image.load(path)
+        entry = asset.entry
+        if entry is None:
+            return pygame.image.load(asset.path)
+        if entry.kind == 'rgba':
+            size = tuple(entry.meta['size'])
+            return pygame.image.frombuffer(entry.data, size, 'RGBA')
+        return pygame.image.load(entry.open(), entry.name + entry.ext)
 
     def draw_background(self):
         self._screen.fill(self.background_color)
         if self.background_image is not None:
             self._screen.blit(self.background_image, (0, 0))
 
+    supports_dirty_rects = True
+
+    def _pg_rect(self, rect):
+        Y = self.height
+        x, x_, y, y_ = rect
+        x, y = int(x), int(y)
+        return pygame.Rect(x, Y - int(y_ + 1),
+                           int(x_ + 1) - x, int(y_ + 1) - y)
+
+    def clip_region(self, rect):
+        if rect is None:
+            self._screen.set_clip(None)
+        else:
+            self._screen.set_clip(self._pg_rect(rect))
+            self.draw_background()
+
+    def flip_regions(self, rects):
+        pygame.display.update([self._pg_rect(rect) for rect in rects])
+
 
 class PyGameInput(Input):
     def __init__(self):
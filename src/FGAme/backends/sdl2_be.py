@@ -198,21 +198,70 @@ class SDL2Canvas(Canvas):
             gfx.polygonRGBA(
                 self._renderer, X, Y, N, *Color(color)))
 
-    def raw_texture(self, texture, pos=(0, 0)):
+    def raw_circles_solid(self, centers, radii, colors):
+        height = self.height
+        renderer = self._renderer
+        filled_circle = gfx.filledCircleRGBA
+        no_error = self._no_error
+        for (x, y), radius, color in zip(centers, radii, colors):
+            no_error(filled_circle(renderer, trunc(x), trunc(height - y),
+                                   trunc(radius), *(color or self._black)))
+
+    def raw_aabbs_solid(self, aabbs, colors):
+        # Rectangles are grouped by color and sent with a single call to
+        # SDL_RenderFillRects for each group
+        height = self.height
+        groups = {}
+        for (xmin, xmax, ymin, ymax), color in zip(aabbs, colors):
+            rect = sdl2.SDL_Rect(trunc(xmin), trunc(height - ymax),
+                                 trunc(xmax - xmin), trunc(ymax - ymin))
+            groups.setdefault(tuple(color or self._black), []).append(rect)
+
+        renderer = self._renderer
+        for color, rects in groups.items():
+            R, G, B, A = Color(color)
+            self._no_error(sdl2.SDL_SetRenderDrawColor(renderer, R, G, B, A))
+            array = (sdl2.SDL_Rect * len(rects))(*rects)
+            self._no_error(
+                sdl2.SDL_RenderFillRects(renderer, array, len(rects)))
+
+    def raw_polys_solid(self, polys, colors):
+        height = self.height
+        renderer = self._renderer
+        for vertices, color in zip(polys, colors):
+            N = len(vertices)
+            int16_array = ctypes.c_int16 * N
+            X = int16_array(*(trunc(x) for (x, _) in vertices))
+            Y = int16_array(*(trunc(height - y) for (_, y) in vertices))
+            self._no_error(
+                gfx.filledPolygonRGBA(renderer, X, Y, N, *Color(color)))
+
+    def _sdl_texture(self, texture):
         try:
-            sdl_texture = texture.data
+            return texture.data
         except AttributeError:
             pil_data = texture.get_pil_data()
             if pil_data.mode not in 'RGBA':
                 pil_data = pil_data.convert('RGBA')
             sdl_texture = self.__convert_PIL_to_SDL(pil_data)
             texture.set_backend_data(sdl_texture)
+            return sdl_texture
 
+    def raw_texture(self, texture, pos=(0, 0)):
+        # Sub-textures are copied from a region of the page, which is uploaded
+        # only once
         dx = texture.width
         dy = texture.height
+        page = getattr(texture, 'page', None)
+        if page is not None:
+            sdl_texture = self._sdl_texture(page)
+            rect_src = sdl2.SDL_Rect(*texture.rect)
+        else:
+            sdl_texture = self._sdl_texture(texture)
+            rect_src = sdl2.SDL_Rect(0, 0, dx, dy)
+
         x, y = pos
         y = self.height - y - dy
-        rect_src = sdl2.SDL_Rect(0, 0, dx, dy)
         rect_dest = sdl2.SDL_Rect(int(x), int(y), dx, dy)
         source = sdl_texture
         sdl2.SDL_RenderCopy(self._renderer, source, rect_src, rect_dest)
@@ -13,6 +13,7 @@ class EmptyCanvas(Canvas):
         draw_raw_poly_solid = draw_raw_poly_border = \
         draw_raw_segment = \
         draw_raw_texture = \
+        raw_circles_solid = raw_aabbs_solid = raw_polys_solid = \
         paint_pixel = \
         clear_background = __do_nothing
 
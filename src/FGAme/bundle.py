@@ -0,0 +1,409 @@
+"""
+Packed asset bundles.
+
+A bundle stores a whole assets/ tree in a single file. It starts with a small
+binary header followed by a JSON index and by the contents of each asset. All
+blobs are aligned to :data:`ALIGN` bytes. Images and WAV files can be stored
+pre-decoded as raw RGBA pixels and PCM samples, which skips decoding at load
+time.
+
+Bundles are read through mmap: :meth:`Bundle.read` returns memoryviews into
+the mapped file and raw pixel buffers are handed to PIL without copies.
+
+Create bundles from the command line::
+
+    $ python -m FGAme bundle assets/ -o assets.fgb --decode
+
+and mount them at startup:
+
+    >>> mount('assets.fgb')                                    # doctest: +SKIP
+
+Mounted bundles are searched by :class:`FGAme.asset.Asset`,
+:class:`FGAme.draw.Texture` and the sound classes before the filesystem.
+Assets are named by their path relative to the root of the bundled tree,
+without extension, e.g., "sfx/laser-blaster" or "images/hero".
+"""
+
+import io
+import json
+import mmap
+import os
+import struct
+import wave
+
+MAGIC = b'FGAB'
+VERSION = 1
+ALIGN = 16
+HEADER = struct.Struct('<4sHHI')  # magic, version, reserved, index size
+IMAGE_EXTENSIONS = ['.png', '.gif', '.bmp', '.jpeg', '.jpg', '.tiff']
+
+
+class BundleError(ValueError):
+    """
+    Raised when reading an invalid bundle file.
+    """
+
+
+class Entry:
+    """
+    A single asset inside a bundle.
+
+    Attributes:
+        name:
+            Logical name (relative path without extension).
+        ext:
+            Extension of the original file.
+        kind:
+            One of 'file' (original file contents), 'rgba' (raw pixels) or
+            'pcm' (raw audio samples).
+        meta:
+            Dictionary with additional information. 'rgba' entries store the
+            image "size" and 'pcm' entries store "frequency", "channels" and
+            "sampwidth".
+    """
+
+    def __init__(self, bundle, name, ext, kind, offset, size, meta):
+        self.bundle = bundle
+        self.name = name
+        self.ext = ext
+        self.kind = kind
+        self.offset = offset
+        self.size = size
+        self.meta = meta
+
+    def __repr__(self):
+        return '<Entry %s%s (%s, %d bytes)>' % (self.name, self.ext, self.kind,
+                                                self.size)
+
+    @property
+    def data(self):
+        """
+        A read-only memoryview with the contents of the entry.
+        """
+
+        start = self.bundle._data_start + self.offset
+        return self.bundle._view[start:start + self.size]
+
+    def open(self):
+        """
+        Return a file-like object with the contents of the entry.
+
+        The data is copied. Use the data attribute for zero-copy access.
+        """
+
+        return io.BytesIO(self.data)
+
+    def load_image(self):
+        """
+        Return a PIL image. Raw RGBA entries share memory with the bundle.
+        """
+
+        import PIL.Image
+
+        if self.kind == 'rgba':
+            size = tuple(self.meta['size'])
+            return PIL.Image.frombuffer('RGBA', size, self.data,
+                                        'raw', 'RGBA', 0, 1)
+        image = PIL.Image.open(self.open())
+        image.load()
+        return image
+
+    def load_sound(self):
+        """
+        Return a pygame Sound object.
+
+        PCM entries are used directly if their format matches the mixer.
+        Otherwise they are converted by pygame.
+        """
+
+        import pygame
+
+        if self.kind == 'pcm':
+            meta = self.meta
+            fmt = {1: 8, 2: -16}.get(meta['sampwidth'])
+            mixer = (meta['frequency'], fmt, meta['channels'])
+            if pygame.mixer.get_init() == mixer:
+                return pygame.mixer.Sound(buffer=self.data)
+            return pygame.mixer.Sound(file=io.BytesIO(self.to_wav()))
+        return pygame.mixer.Sound(file=self.open())
+
+    def to_wav(self):
+        """
+        Return the contents of a PCM entry as bytes of a WAV file.
+        """
+
+        if self.kind != 'pcm':
+            raise TypeError('not a PCM entry: %r' % self)
+        F = io.BytesIO()
+        with wave.open(F, 'wb') as out:
+            out.setnchannels(self.meta['channels'])
+            out.setsampwidth(self.meta['sampwidth'])
+            out.setframerate(self.meta['frequency'])
+            out.writeframes(self.data)
+        return F.getvalue()
+
+
+class Bundle:
+    """
+    A memory-mapped asset bundle.
+
+    Args:
+        path:
+            Path to a bundle file created by :func:`build_bundle`.
+    """
+
+    def __init__(self, path):
+        self.path = os.path.abspath(path)
+        with open(self.path, 'rb') as F:
+            header = F.read(HEADER.size)
+            if len(header) < HEADER.size:
+                raise BundleError('%s: truncated file' % path)
+            magic, version, _, index_size = HEADER.unpack(header)
+            if magic != MAGIC:
+                raise BundleError('%s: not an asset bundle' % path)
+            if version > VERSION:
+                raise BundleError('%s: unsupported version %s' %
+                                  (path, version))
+            index = json.loads(F.read(index_size).decode('utf8'))
+            self._mmap = mmap.mmap(F.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self._view = memoryview(self._mmap)
+        self._data_start = _align(HEADER.size + index_size)
+        self._entries = {}
+        for item in index['entries']:
+            entry = Entry(self, item['name'], item['ext'], item['kind'],
+                          item['offset'], item['size'], item.get('meta', {}))
+            self._entries.setdefault(entry.name, {})[entry.ext] = entry
+
+    def __repr__(self):
+        return 'Bundle(%r)' % self.path
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __iter__(self):
+        return iter(self._entries)
+
+    def __contains__(self, name):
+        return name in self._entries
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """
+        Release the memory map.
+
+        Raises a BufferError if memoryviews or images obtained from raw
+        entries are still alive.
+        """
+
+        self._view.release()
+        self._mmap.close()
+
+    def entries(self):
+        """
+        Iterate over all entries.
+        """
+
+        for exts in self._entries.values():
+            yield from exts.values()
+
+    def find(self, name, extensions=None):
+        """
+        Return the entry with the given name or None.
+
+        If a list of extensions is given, return the first entry whose
+        original file has one of these extensions. An empty extension matches
+        any file. Names may also include the extension, as in
+        "images/hero.png".
+        """
+
+        try:
+            exts = self._entries[name]
+        except KeyError:
+            base, ext = os.path.splitext(name)
+            if ext and ext in self._entries.get(base, ()):
+                return self._entries[base][ext]
+            return None
+        if extensions is None:
+            return next(iter(exts.values()))
+        for ext in extensions:
+            if ext in exts:
+                return exts[ext]
+            elif ext == '':
+                return next(iter(exts.values()))
+        return None
+
+    def read(self, name, extensions=None):
+        """
+        Return a memoryview with the contents of the given entry.
+        """
+
+        entry = self.find(name, extensions)
+        if entry is None:
+            raise KeyError(name)
+        return entry.data
+
+
+class BundleWriter:
+    """
+    Creates bundle files.
+
+    Example:
+        >>> writer = BundleWriter()
+        >>> writer.add_data('data/hello', '.txt', b'hello world')
+        >>> writer.save('data.fgb')                             # doctest: +SKIP
+    """
+
+    def __init__(self):
+        self._items = []
+
+    def __len__(self):
+        return len(self._items)
+
+    def add_data(self, name, ext, data, kind='file', meta=None):
+        """
+        Add raw data to the bundle.
+        """
+
+        self._items.append((name, ext, kind, meta or {}, bytes(data)))
+
+    def add_file(self, path, name=None, decode=False):
+        """
+        Add file to the bundle.
+
+        If decode is True, images are stored as raw RGBA pixels and WAV files
+        are stored as PCM samples.
+        """
+
+        base, ext = os.path.splitext(path)
+        if name is None:
+            name = base.replace(os.sep, '/')
+
+        if decode and ext.lower() in IMAGE_EXTENSIONS:
+            import PIL.Image
+
+            with PIL.Image.open(path) as image:
+                image = image.convert('RGBA')
+                meta = {'size': list(image.size)}
+                self.add_data(name, ext, image.tobytes(), 'rgba', meta)
+        elif decode and ext.lower() == '.wav':
+            with wave.open(path, 'rb') as F:
+                meta = {'frequency': F.getframerate(),
+                        'channels': F.getnchannels(),
+                        'sampwidth': F.getsampwidth()}
+                data = F.readframes(F.getnframes())
+            self.add_data(name, ext, data, 'pcm', meta)
+        else:
+            with open(path, 'rb') as F:
+                self.add_data(name, ext, F.read())
+
+    def add_tree(self, root, decode=False):
+        """
+        Add all files inside the given directory. Names are relative to root.
+        """
+
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames.sort()
+            for filename in sorted(filenames):
+                if filename.startswith('.'):
+                    continue
+                path = os.path.join(dirpath, filename)
+                name = os.path.splitext(os.path.relpath(path, root))[0]
+                self.add_file(path, name.replace(os.sep, '/'), decode)
+
+    def save(self, path):
+        """
+        Write bundle to the given path.
+        """
+
+        entries = []
+        offset = 0
+        for name, ext, kind, meta, data in self._items:
+            entry = {'name': name, 'ext': ext, 'kind': kind,
+                     'offset': offset, 'size': len(data)}
+            if meta:
+                entry['meta'] = meta
+            entries.append(entry)
+            offset = _align(offset + len(data))
+        index = json.dumps({'entries': entries}).encode('utf8')
+
+        with open(path, 'wb') as F:
+            F.write(HEADER.pack(MAGIC, VERSION, 0, len(index)))
+            F.write(index)
+            _pad(F, HEADER.size + len(index))
+            for _, _, _, _, data in self._items:
+                F.write(data)
+                _pad(F, len(data))
+
+
+def build_bundle(root, path, decode=False):
+    """
+    Pack all files in the root directory into a bundle saved at path.
+    """
+
+    writer = BundleWriter()
+    writer.add_tree(root, decode)
+    writer.save(path)
+    return path
+
+
+def _align(n):
+    return (n + ALIGN - 1) // ALIGN * ALIGN
+
+
+def _pad(F, n):
+    F.write(b'\0' * (_align(n) - n))
+
+
+#
+# Mounted bundles
+#
+_mounted = []
+
+
+def mount(bundle):
+    """
+    Make assets in bundle available to the asset loaders. Accepts a Bundle or
+    a path to a bundle file.
+
+    Bundles mounted later take precedence.
+    """
+
+    if not isinstance(bundle, Bundle):
+        bundle = Bundle(bundle)
+    _mounted.insert(0, bundle)
+    return bundle
+
+
+def unmount(bundle):
+    """
+    Remove bundle from the list of mounted bundles.
+    """
+
+    _mounted.remove(bundle)
+
+
+def mounted():
+    """
+    Return a list of all mounted bundles.
+    """
+
+    return list(_mounted)
+
+
+def find_entry(name, extensions=None):
+    """
+    Search the mounted bundles and return the first entry with the given name
+    or None.
+    """
+
+    for bundle in _mounted:
+        entry = bundle.find(name, extensions)
+        if entry is not None:
+            return entry
+    return None
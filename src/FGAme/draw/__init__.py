@@ -2,4 +2,6 @@ from colortools import Color, colorproperty, rgb, rgba, COLOR_NAMES
 from .shapes import Drawable, Shape, Solid, Segment, Path, AABB, Circle, \
     Circuit, Poly, RegularPoly, Rectangle, Triangle
 from .tree import RenderTree
-from .image import Image
\ No newline at end of file
+from .image import Image, Texture, SubTexture, TileSheet, \
+    TextureCache, texture_cache, get_texture
+from .atlas import TextureAtlas
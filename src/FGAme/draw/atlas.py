@@ -0,0 +1,196 @@
+import PIL.Image
+
+from FGAme.draw.image import Texture, SubTexture, TileSheet, get_texture
+
+
+class ShelfPacker(object):
+    """
+    Packs rectangles into a fixed size area using the shelf algorithm.
+
+    Rectangles are placed from left to right in horizontal shelves. A new
+    rectangle goes to the lowest shelf that fits it tightly or opens a new
+    shelf bellow the last one. Sorting rectangles by decreasing height before
+    inserting them gives the best results.
+
+    Example:
+        >>> packer = ShelfPacker(64, 64)
+        >>> packer.insert(32, 16), packer.insert(32, 16), packer.insert(8, 8)
+        ((0, 0), (32, 0), (0, 16))
+    """
+
+    def __init__(self, width, height, padding=0):
+        self.width = width
+        self.height = height
+        self.padding = padding
+        self._shelves = []  # list of [y, height, next_x]
+        self._next_y = 0
+
+    def insert(self, width, height):
+        """
+        Reserve a width x height region and return its (x, y) position or
+        None if the rectangle does not fit.
+        """
+
+        pad = self.padding
+        width += pad
+        height += pad
+        best = None
+        for shelf in self._shelves:
+            y, shelf_height, x = shelf
+            if height <= shelf_height and x + width <= self.width + pad:
+                if best is None or shelf_height < best[1]:
+                    best = shelf
+        if best is not None:
+            x = best[2]
+            best[2] += width
+            return x, best[0]
+
+        y = self._next_y
+        if y + height > self.height + pad or width > self.width + pad:
+            return None
+        self._shelves.append([y, height, width])
+        self._next_y += height
+        return 0, y
+
+
+class TextureAtlas(object):
+    """
+    Collection of large textures (pages) that hold many smaller images.
+
+    Images added to the atlas are copied to one of its pages and are
+    represented by lightweight :class:`SubTexture` handles that can be used
+    anywhere a texture is accepted, e.g., ``Image(atlas['hero'])``. Backends
+    upload each page only once and draw sub-textures as regions of it.
+
+    Args:
+        page_size:
+            (width, height) of each page in pixels. Images larger than a page
+            get a page of their own.
+        padding:
+            Number of transparent pixels between neighboring images. Avoids
+            bleeding when textures are filtered.
+
+    Example:
+        >>> atlas = TextureAtlas((64, 64))
+        >>> a = atlas.add(PIL.Image.new('RGBA', (16, 16)), 'a')
+        >>> b = atlas.add(PIL.Image.new('RGBA', (16, 16)), 'b')
+        >>> a.page is b.page, b.rect
+        (True, (17, 0, 16, 16))
+    """
+
+    def __init__(self, page_size=(1024, 1024), padding=1):
+        self.page_size = tuple(page_size)
+        self.padding = padding
+        self.pages = []
+        self._packers = []
+        self._named = {}
+
+    def __len__(self):
+        return len(self._named)
+
+    def __contains__(self, name):
+        return name in self._named
+
+    def __getitem__(self, name):
+        return self._named[name]
+
+    def add(self, image, name=None):
+        """
+        Copy image into the atlas and return a SubTexture handle.
+
+        The image can be a texture, a path, a PIL image or a SubTexture (such
+        as a TileSheet cell). If name is given, the handle can later be
+        retrieved as ``atlas[name]``. Names default to the image path, if it
+        exists.
+        """
+
+        if name is None and isinstance(image, str):
+            name = image
+        if name is not None and name in self._named:
+            return self._named[name]
+
+        pil = _get_pil(image)
+        width, height = pil.size
+        page, (x, y) = self._allocate(width, height)
+        if pil.mode != 'RGBA':
+            pil = pil.convert('RGBA')
+        page._pil.paste(pil, (x, y))
+        page.__dict__.pop('data', None)  # invalidates backend data
+
+        if name is None:
+            name = getattr(image, 'path', None)
+        sub = SubTexture(page, (x, y, width, height), name)
+        if name is not None:
+            self._named[name] = sub
+        return sub
+
+    def add_many(self, images):
+        """
+        Add a sequence of images and return a list of handles in the same
+        order.
+
+        Images are packed by decreasing height, which produces denser pages
+        than adding them one by one. Elements of the sequence can be images or
+        (name, image) pairs.
+        """
+
+        items = []
+        for idx, item in enumerate(images):
+            if isinstance(item, tuple):
+                name, image = item
+            else:
+                name, image = None, item
+            pil = _get_pil(image)
+            items.append((pil.size[1], idx, name, image))
+        items.sort(key=lambda x: (-x[0], x[1]))
+
+        result = [None] * len(items)
+        for _, idx, name, image in items:
+            result[idx] = self.add(image, name)
+        return result
+
+    def add_tilesheet(self, sheet, name=None):
+        """
+        Add all cells of a TileSheet and return a list of handles in
+        row-major order.
+
+        If name is given, cells are registered as ``'%s-%d-%d' % (name, i,
+        j)``.
+        """
+
+        if not isinstance(sheet, TileSheet):
+            raise TypeError('expect a TileSheet, got %r' % sheet)
+
+        images = []
+        for j in range(sheet.num_rows):
+            for i in range(sheet.num_cols):
+                cell = sheet[i, j]
+                if name is None:
+                    images.append(cell)
+                else:
+                    images.append(('%s-%d-%d' % (name, i, j), cell))
+        return self.add_many(images)
+
+    def _allocate(self, width, height):
+        for page, packer in zip(self.pages, self._packers):
+            pos = packer.insert(width, height)
+            if pos is not None:
+                return page, pos
+
+        page_w, page_h = self.page_size
+        packer = ShelfPacker(max(page_w, width), max(page_h, height),
+                             self.padding)
+        page = _new_page((packer.width, packer.height))
+        self.pages.append(page)
+        self._packers.append(packer)
+        return page, packer.insert(width, height)
+
+
+def _new_page(shape):
+    return Texture.from_image(PIL.Image.new('RGBA', shape, (0, 0, 0, 0)))
+
+
+def _get_pil(image):
+    if isinstance(image, PIL.Image.Image):
+        return image
+    return get_texture(image).get_pil_data()
@@ -0,0 +1,132 @@
+from FGAme.draw.tree import _get_bounds
+
+
+class DirtyRects(object):
+    """
+    Tracks which regions of a render tree changed since the last frame.
+
+    Each call to :meth:`collect` compares the current state of the tree with
+    the state recorded in the previous call and returns a list of
+    (xmin, xmax, ymin, ymax) rectangles in world coordinates that must be
+    repainted. Bodies are only inspected if their ``flags.dirty_draw`` bit is
+    set. Other objects are compared by their bounding boxes. Since collect()
+    clears the bit, it also invalidates the cache of static layers that hold
+    changed bodies.
+
+    Args:
+        max_fraction (float):
+            If the dirty area exceeds this fraction of the viewport, collect()
+            returns None to signal that a full redraw is cheaper.
+        margin (float):
+            Each rectangle is enlarged by this amount in all directions to
+            account for antialiasing and line widths.
+    """
+
+    def __init__(self, max_fraction=0.5, margin=2):
+        from FGAme.physics.flags import flags
+
+        self.max_fraction = max_fraction
+        self.margin = margin
+        self._dirty_draw = flags.dirty_draw
+        self._not_dirty_draw = flags.not_dirty_draw
+        self._bounds = {}
+        self._viewport = None
+
+    def reset(self):
+        """
+        Forget recorded state. The next call to collect() requests a full
+        redraw.
+        """
+
+        self._bounds.clear()
+        self._viewport = None
+
+    def collect(self, tree, viewport):
+        """
+        Return the list of regions that changed since the last call or None
+        if the whole viewport must be repainted.
+        """
+
+        dirty_draw = self._dirty_draw
+        clear_mask = self._not_dirty_draw
+        old = self._bounds
+        new = {}
+        rects = []
+        full = viewport != self._viewport
+
+        for obj in tree.walk():
+            key = id(obj)
+            entry = old.pop(key, None)
+            visible = obj.visible
+            flags = getattr(obj, 'flags', None)
+
+            if flags is not None:
+                if (entry is not None and not flags & dirty_draw and
+                        entry[1] == visible):
+                    new[key] = entry
+                    continue
+                obj.flags = flags & clear_mask
+                if entry is not None and flags & dirty_draw:
+                    layer = tree.layer_of(obj)
+                    if tree.is_static(layer):
+                        tree.invalidate(layer)
+
+            bounds = _get_bounds(obj)
+            if bounds is None:
+                full = True
+            new[key] = (bounds, visible)
+            if entry is None:
+                if visible:
+                    rects.append(bounds)
+            elif entry != (bounds, visible):
+                if entry[1]:
+                    rects.append(entry[0])
+                if visible:
+                    rects.append(bounds)
+            elif visible and flags is not None:
+                rects.append(bounds)  # redrawn in place (e.g. new color)
+
+        # Objects removed from the tree
+        for bounds, visible in old.values():
+            if visible:
+                rects.append(bounds)
+
+        self._bounds = new
+        self._viewport = viewport
+        if full:
+            return None
+        return self._clip(self._merge(rects), viewport)
+
+    def _merge(self, rects):
+        # Merges overlapping rectangles greedily
+        margin = self.margin
+        merged = []
+        for xmin, xmax, ymin, ymax in rects:
+            rect = [xmin - margin, xmax + margin, ymin - margin, ymax + margin]
+            changed = True
+            while changed:
+                changed = False
+                for other in merged:
+                    if (other[0] <= rect[1] and rect[0] <= other[1] and
+                            other[2] <= rect[3] and rect[2] <= other[3]):
+                        merged.remove(other)
+                        rect = [min(rect[0], other[0]), max(rect[1], other[1]),
+                                min(rect[2], other[2]), max(rect[3], other[3])]
+                        changed = True
+                        break
+            merged.append(rect)
+        return merged
+
+    def _clip(self, rects, viewport):
+        xmin, xmax, ymin, ymax = viewport
+        area = 0.0
+        result = []
+        for r in rects:
+            r = (max(r[0], xmin), min(r[1], xmax),
+                 max(r[2], ymin), min(r[3], ymax))
+            if r[0] < r[1] and r[2] < r[3]:
+                area += (r[1] - r[0]) * (r[3] - r[2])
+                result.append(r)
+        if area > self.max_fraction * (xmax - xmin) * (ymax - ymin):
+            return None
+        return result
@@ -1,9 +1,11 @@
+import itertools
+import math
 import os, PIL.Image
+from collections import OrderedDict
 
 from FGAme.draw import AABB
 from FGAme.mathtools import asvector
 from FGAme.resources import resources
-from FGAme.utils import lru_cache
 
 # try:
 #     import PIL.Image
@@ -35,11 +37,32 @@ for k, v in list(REFERENCE_NAMES.items()):
 del k, v
 
 
+def _find_bundled_image(name):
+    # Procura imagem nos pacotes de recursos montados
+    from FGAme.bundle import find_entry
+    from FGAme.resources import IMG_PRIORITIES
+
+    entry = find_entry('images/' + name, IMG_PRIORITIES)
+    if entry is None:
+        entry = find_entry(name, IMG_PRIORITIES)
+    return entry
+
+
 class Texture(object):
-    """Representa uma textura."""
+    """Representa uma textura.
+
+    O atributo `key` identifica a textura no cache de texturas. Ele é None
+    para texturas criadas a partir de imagens que não estão associadas a um
+    arquivo."""
 
     def __init__(self, path):
+        self.key = path
         if not os.path.isabs(path):
+            entry = _find_bundled_image(path)
+            if entry is not None:
+                self._pil = entry.load_image()
+                self.path = None
+                return
             path = resources.find_image_path(path)
         self._pil = PIL.Image.open(path)
         self._pil.load()
@@ -55,12 +78,24 @@ class Texture(object):
             raise TypeError('unsupported image: %r' % image)
 
     @classmethod
-    def __from_pil_image(cls, image):
+    def from_pil_image(cls, image, key=None):
         new = object.__new__(cls)
         new._pil = image
         new.path = None
+        new.key = key
         return new
 
+    @property
+    def nbytes(self):
+        """Estimativa da memória ocupada pela textura e sua representação no
+        backend."""
+
+        size = self.width * self.height
+        nbytes = size * len(self.mode)
+        if 'data' in self.__dict__:
+            nbytes += 4 * size
+        return nbytes
+
     @property
     def width(self):
         return self._pil.width
@@ -95,10 +130,76 @@ class Texture(object):
             raise RuntimeError('data attribute is not defined')
 
 
+class SubTexture(Texture):
+    """Referência a uma região retangular de outra textura (a página).
+
+    Sub-texturas não armazenam dados próprios: backends que as reconhecem
+    enviam a página uma única vez e desenham apenas a região `rect`. Para os
+    demais, get_pil_data() retorna um recorte da página.
+
+    Args:
+        page (Texture):
+            Textura que contém os dados da imagem.
+        rect:
+            Tupla (x, y, width, height) em pixels, com origem no canto superior
+            esquerdo da página (a mesma convenção do PIL).
+    """
+
+    def __init__(self, page, rect, name=None):
+        self.page = page
+        self.rect = tuple(map(int, rect))
+        self.path = name
+        self.key = None if page.key is None else (page.key, 'rect', self.rect)
+        self._pil_cache = None
+
+    @property
+    def _pil(self):
+        if self._pil_cache is None:
+            x, y, w, h = self.rect
+            self._pil_cache = self.page._pil.crop((x, y, x + w, y + h))
+        return self._pil_cache
+
+    @_pil.setter
+    def _pil(self, value):
+        # Modificações in-place separam a sub-textura da sua página
+        self._pil_cache = value
+        self.page = None
+        self.rect = (0, 0, value.width, value.height)
+
+    @property
+    def width(self):
+        return self.rect[2]
+
+    @property
+    def height(self):
+        return self.rect[3]
+
+    @property
+    def shape(self):
+        return self.rect[2], self.rect[3]
+
+    @property
+    def mode(self):
+        return (self.page or self)._pil.mode
+
+    @property
+    def nbytes(self):
+        # Sub-texturas compartilham a memória da página
+        if self.page is not None:
+            return 0
+        return super().nbytes
+
+    def __repr__(self):
+        return '%s(%r, %r)' % (type(self).__name__, self.page, self.rect)
+
+
 class Image(AABB):
-    """Imagem/pixmap não-animado com uma posição dada no mundo."""
+    """Imagem/pixmap não-animado com uma posição dada no mundo.
+
+    Enquanto existir, a imagem marca sua textura como em uso no cache de
+    texturas, impedindo que ela seja removida."""
 
-    __slots__ = ('texture')
+    __slots__ = ('_texture', '_texture_key')
 
     def __init__(
             self, path_or_texture, pos=(0, 0),
@@ -114,6 +215,23 @@ class Image(AABB):
         if reference is not None:
             self.pos = pos - self.get_reference_point(reference)
 
+    def __del__(self):
+        key = getattr(self, '_texture_key', None)
+        if key is not None and key in texture_cache:
+            texture_cache.release(key)
+
+    @property
+    def texture(self):
+        return self._texture
+
+    @texture.setter
+    def texture(self, texture):
+        old = getattr(self, '_texture_key', None)
+        self._texture = texture
+        self._texture_key = texture_cache.acquire_texture(texture)
+        if old is not None and old in texture_cache:
+            texture_cache.release(old)
+
     def get_reference_point(self, ref):
         # TODO: imove to HasAABB or something more generic
         point = getattr(self, REFERENCE_NAMES.get(ref, ref))
@@ -126,6 +244,20 @@ class Image(AABB):
     def draw(self, screen):
         screen.draw_image(self)
 
+    def draw_rotated(self, screen, theta, scale=1):
+        """Desenha a imagem rotacionada pelo ângulo theta (em radianos) em
+        torno do seu centro.
+
+        Utiliza a variante pré-computada mais próxima no cache de texturas em
+        vez de reamostrar a imagem a cada frame."""
+
+        texture = get_texture(self.texture, theta, scale)
+        if texture is self.texture:
+            return screen.draw_image(self)
+        x, y = self.pos
+        w, h = texture.shape
+        screen.draw_texture(texture, (x - w / 2, y - h / 2))
+
     def copy(self):
         new = super(Image, self).copy()
         new.texture = self.texture
@@ -174,11 +306,11 @@ class Image(AABB):
         if ymin <= 0 and ymax < 0:
             upper, lower = map(int, [-ymin, -ymax])
         else:
-            H = self.height
+            H = self.texture.height
             upper, lower = map(int, [H - ymax, H - ymin])
 
-        img = self.texture._pil.crop([left, upper, right, lower])
-        self.texture._pil = img
+        box = (left, upper, right, lower)
+        self.texture = texture_cache.transform(self.texture, 'crop', box)
 
     def __rescale(self, scale, resample):
         """Rescale image to the given scale factor *inplace*"""
@@ -202,17 +334,259 @@ class Image(AABB):
         except KeyError:
             raise ValueError('invalid sampling method: %r' % resample)
 
-        shape = (self.texture._pil.width, self.texture._pil.height)
-        shape = map(int, scale * asvector(shape))
-        self.texture._pil = self.texture._pil.resize(shape, resample)
+        shape = (self.texture.width, self.texture.height)
+        shape = tuple(map(int, scale * asvector(shape)))
+        self.texture = texture_cache.transform(self.texture, 'resize', shape,
+                                               resample)
 
 
 class TileSheet(object):
+    """Folha de sprites/tiles dividida em células de mesmo tamanho.
+
+    Args:
+        path_or_texture:
+            Textura ou caminho para a imagem com a folha.
+        shape:
+            Tupla (largura, altura) de cada célula em pixels.
+        origin:
+            Posição (x, y) em pixels do canto superior esquerdo da primeira
+            célula.
+
+    Cada célula é uma SubTexture obtida por indexação ``sheet[i, j]``, onde i
+    é a coluna e j a linha.
+    """
+
     def __init__(self, path_or_texture, shape, origin=(0, 0)):
         if isinstance(path_or_texture, Texture):
             self.texture = path_or_texture
         else:
             self.texture = get_texture(path_or_texture)
+        self.shape = tuple(map(int, shape))
+        self.origin = tuple(map(int, origin))
+        self._cells = {}
+
+    @property
+    def num_cols(self):
+        return (self.texture.width - self.origin[0]) // self.shape[0]
+
+    @property
+    def num_rows(self):
+        return (self.texture.height - self.origin[1]) // self.shape[1]
+
+    def __len__(self):
+        return self.num_cols * self.num_rows
+
+    def __getitem__(self, idx):
+        try:
+            return self._cells[idx]
+        except KeyError:
+            pass
+
+        i, j = idx
+        if not (0 <= i < self.num_cols and 0 <= j < self.num_rows):
+            raise IndexError(idx)
+        w, h = self.shape
+        x0, y0 = self.origin
+        cell = SubTexture(self.texture, (x0 + i * w, y0 + j * h, w, h))
+        self._cells[idx] = cell
+        return cell
+
+    def __iter__(self):
+        for j in range(self.num_rows):
+            for i in range(self.num_cols):
+                yield self[i, j]
+
+
+class TextureCache(object):
+    """Cache de texturas com orçamento de memória e remoção LRU.
+
+    Texturas são identificadas pelo caminho do arquivo ou, no caso de
+    texturas transformadas, por uma tupla (chave original, operação,
+    argumentos...). Desta forma, imagens que usam o mesmo arquivo e as mesmas
+    transformações compartilham a textura e sua representação no backend.
+
+    Quando o total de bytes excede `max_bytes`, as texturas usadas há mais
+    tempo são removidas do cache. Texturas marcadas como em uso com acquire()
+    nunca são removidas até que release() seja chamado o mesmo número de
+    vezes. Objetos Image marcam suas texturas como em uso automaticamente.
+    Outros objetos que ainda referenciam uma textura removida continuam
+    funcionando normalmente.
+
+    Example:
+        >>> cache = TextureCache(max_bytes=100)
+        >>> tex = cache.get('a', lambda: Texture.from_pil_image(
+        ...     PIL.Image.new('L', (5, 5))))
+        >>> cache.num_bytes, cache.misses
+        (25, 1)
+        >>> cache.get('a', None) is tex, cache.hits
+        (True, 1)
+    """
+
+    def __init__(self, max_bytes=256 * 1024 * 1024, rotation_steps=64):
+        self.max_bytes = max_bytes
+        self.rotation_steps = rotation_steps
+        self.num_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # key -> [texture, refcount, nbytes]
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key, factory):
+        """Retorna a textura associada à chave. Caso não exista, cria a
+        textura invocando factory() sem argumentos."""
+
+        try:
+            entry = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            texture = factory()
+            texture.key = key
+            nbytes = texture.nbytes
+            self._entries[key] = [texture, 0, nbytes]
+            self.num_bytes += nbytes
+            self._evict()
+            return texture
+
+        self.hits += 1
+        self._entries.move_to_end(key)
+        texture = entry[0]
+
+        # Backend data pode ter sido criado depois da inserção
+        nbytes = texture.nbytes
+        if nbytes != entry[2]:
+            self.num_bytes += nbytes - entry[2]
+            entry[2] = nbytes
+            self._evict()
+        return texture
+
+    def load(self, path):
+        """Retorna a textura para o caminho dado, carregando o arquivo caso
+        necessário."""
+
+        return self.get(path, lambda: Texture(path))
+
+    def transform(self, texture, op, *args):
+        """Retorna uma nova textura aplicando a operação op ('crop',
+        'resize' ou 'rotate') com os argumentos fornecidos.
+
+        O resultado é armazenado no cache se a textura original possuir uma
+        chave."""
+
+        func = _TRANSFORMS[op]
+        if texture.key is None:
+            return Texture.from_pil_image(func(texture.get_pil_data(), *args))
+        key = (texture.key, op) + args
+        return self.get(key, lambda: Texture.from_pil_image(
+            func(texture.get_pil_data(), *args)))
+
+    def variant(self, texture, theta=0, scale=1, resample=PIL.Image.BILINEAR):
+        """Retorna uma variante da textura rotacionada por theta (em
+        radianos) e reescalada pelo fator scale.
+
+        O ângulo é quantizado em `rotation_steps` orientações e as variantes
+        são criadas sob demanda e armazenadas no cache."""
+
+        if texture.key is None:
+            texture.key = ('anonymous', next(_anonymous_keys))
+
+        if scale != 1:
+            shape = (max(1, int(round(texture.width * scale))),
+                     max(1, int(round(texture.height * scale))))
+            texture = self.transform(texture, 'resize', shape, resample)
+
+        steps = self.rotation_steps
+        step = int(round(theta * steps / (2 * math.pi))) % steps
+        if step:
+            angle = step * 360.0 / steps
+            texture = self.transform(texture, 'rotate', angle, resample)
+        return texture
+
+    def acquire(self, key):
+        """Marca a textura como em uso, impedindo que seja removida do cache.
+
+        Strings são carregadas como caminhos caso ainda não estejam no
+        cache."""
+
+        if key not in self._entries and isinstance(key, str):
+            self.load(key)
+        entry = self._entries[key]
+        entry[1] += 1
+        return entry[0]
+
+    def acquire_texture(self, texture):
+        """Marca o objeto textura como em uso, caso ele esteja no cache.
+
+        Retorna a chave adquirida ou None se a textura não pertence ao
+        cache."""
+
+        entry = self._entries.get(texture.key)
+        if entry is None or entry[0] is not texture:
+            return None
+        entry[1] += 1
+        return texture.key
+
+    def release(self, key):
+        """Desfaz uma chamada a acquire() ou acquire_texture()."""
+
+        entry = self._entries[key]
+        if entry[1] <= 0:
+            raise ValueError('texture %r was not acquired' % (key,))
+        entry[1] -= 1
+        self._evict()
+
+    def discard(self, key):
+        """Remove textura do cache, caso exista."""
+
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.num_bytes -= entry[2]
+
+    def clear(self):
+        """Remove todas as texturas do cache."""
+
+        self._entries.clear()
+        self.num_bytes = 0
+
+    def stats(self):
+        """Retorna um dicionário com estatísticas de uso do cache."""
+
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(self._entries),
+            'bytes': self.num_bytes,
+            'max_bytes': self.max_bytes,
+        }
+
+    def _evict(self):
+        if self.num_bytes <= self.max_bytes:
+            return
+        for key, entry in list(self._entries.items()):
+            if entry[1]:
+                continue
+            del self._entries[key]
+            self.num_bytes -= entry[2]
+            self.evictions += 1
+            if self.num_bytes <= self.max_bytes:
+                break
+
+
+_TRANSFORMS = {
+    'crop': lambda img, box: img.crop(box),
+    'resize': lambda img, shape, resample: img.resize(shape, resample),
+    'rotate': lambda img, angle, resample: img.rotate(angle, resample,
+                                                      expand=True),
+}
+
+_anonymous_keys = itertools.count()
+texture_cache = TextureCache()
 
 
 #
@@ -221,17 +595,20 @@ class TileSheet(object):
 def get_texture(texture_or_path, theta=0, scale=1):
     """
     Return texture from path or object holding image data.
+
+    If theta (in radians) or scale are given, return a rotated/rescaled
+    variant from the texture cache. Angles are quantized to
+    ``texture_cache.rotation_steps`` orientations.
     """
 
     if isinstance(texture_or_path, str):
-        return __get_texture_from_path(texture_or_path)
+        texture = texture_cache.load(texture_or_path)
     elif isinstance(texture_or_path, Texture):
-        return texture_or_path
+        texture = texture_or_path
     else:
-        return Texture.from_image(texture_or_path)
-
+        texture = Texture.from_image(texture_or_path)
 
-@lru_cache
-def __get_texture_from_path(path):
-    return Texture(path)
+    if theta or scale != 1:
+        return texture_cache.variant(texture, theta, scale)
+    return texture
 
@@ -1,3 +1,9 @@
+import bisect
+import math
+
+_empty = object()
+
+
 class RenderTree(object):
     """Representa uma árvore de objetos que serão desenhados na tela
 
@@ -22,10 +28,17 @@ class RenderTree(object):
     >>> tree.remove('bar');
     >>> 'bar' in tree, 'foo' in tree
     (False, True)
+
+    Os objetos são identificados pela identidade (``is``) e não por igualdade
+    (``==``): remove(), count() e o operador ``in`` só encontram o próprio
+    objeto inserido na árvore, mesmo que outro objeto seja igual a ele.
     """
 
     is_tree = True
     visible = True
+    culling = True
+    batching = True
+    max_static_size = 4096
 
     def show(self):
         self.visible = True
@@ -34,104 +47,185 @@ class RenderTree(object):
         self.visible = False
 
     def __init__(self, parent=None):
-        self._data = []
+        self._layers = {}
+        self._order = []
+        self._where = {}
+        self._dirty = set()
+        self._walking = 0
+        self._static = {}
         self.parent = None
 
     def __contains__(self, obj):
-        return any(obj in L for _, L in self._data)
+        return id(obj) in self._where
 
     def __iter__(self):
         return self.walk()
 
     def __len__(self):
-        return sum(len(layer) for layer in self._data)
+        return len(self._where)
 
     def __getitem__(self, idx):
-        for i, obj in enumerate(self):
-            if i == idx:
-                return obj
+        self._compact()
+        if self._dirty:
+            try:
+                return list(self.walk())[idx]
+            except IndexError:
+                raise IndexError(idx)
+        if idx < 0:
+            idx += len(self._where)
+        if idx >= 0:
+            for layer in self._order:
+                L = self._layers[layer]
+                if idx < len(L):
+                    return L[idx]
+                idx -= len(L)
         raise IndexError(idx)
 
+    def _get_layer_list(self, layer):
+        try:
+            return self._layers[layer]
+        except KeyError:
+            L = self._layers[layer] = []
+            bisect.insort(self._order, layer)
+            return L
+
+    def _compact(self):
+        # Remoções apenas marcam a posição do objeto como vazia. Somente as
+        # camadas com posições vazias são compactadas, preguiçosamente, antes
+        # de qualquer iteração. A compactação é adiada enquanto algum walk()
+        # ou draw() estiver percorrendo as listas.
+        if not self._dirty or self._walking:
+            return
+
+        where = self._where
+        for layer in self._dirty:
+            L = self._layers[layer]
+            L[:] = [obj for obj in L if obj is not _empty]
+            for i, obj in enumerate(L):
+                where[id(obj)] = (layer, i)
+        self._dirty.clear()
+
     def add(self, obj, layer=0):
         """Adiciona um objeto ou um galho (outro elemento de RenderTree) na
-        camada especificada"""
-
-        for i, (layer_idx, data) in enumerate(list(self._data)):
-            if layer == layer_idx:
-                data.append(obj)
-                break
-            elif layer < layer_idx:
-                self._data.insert(i, (layer, [obj]))
-                break
-        else:
-            self._data.append((layer, [obj]))
+        camada especificada.
+
+        Um objeto aparece no máximo uma vez na árvore. Adicionar um objeto
+        existente o move para o final da camada especificada."""
+
+        if id(obj) in self._where:
+            self.remove(obj)
+        L = self._get_layer_list(layer)
+        self._where[id(obj)] = (layer, len(L))
+        L.append(obj)
+        if layer in self._static:
+            self._static[layer] = None
+
+    def add_many(self, objects, layer=0):
+        """Adiciona uma sequência de objetos na camada especificada"""
+
+        where = self._where
+        for obj in objects:
+            if id(obj) in where:
+                self.remove(obj)
+            L = self._get_layer_list(layer)
+            where[id(obj)] = (layer, len(L))
+            L.append(obj)
+        if layer in self._static:
+            self._static[layer] = None
 
     def remove(self, value):
-        """Remove a primeira ocorrência de um valor."""
+        """Remove o objeto (por identidade) da árvore em tempo constante."""
 
-        for _, L in self._data:
-            if value in L:
-                L.remove(value)
-                break
-        else:
+        try:
+            layer, idx = self._where.pop(id(value))
+        except KeyError:
             raise ValueError('object %r not in RenderTree' % value)
+        self._layers[layer][idx] = _empty
+        self._dirty.add(layer)
+        if layer in self._static:
+            self._static[layer] = None
+
+    def discard(self, value):
+        """Remove valor da árvore, caso exista."""
+
+        if id(value) in self._where:
+            self.remove(value)
+
+    def remove_many(self, values):
+        """Remove todos os valores fornecidos. Valores ausentes são
+        ignorados."""
+
+        for value in values:
+            self.discard(value)
 
     def remove_all(self, value):
         """Remove todas as ocorrências do valor dado."""
 
-        for _, L in self._data:
-            while value in L:
-                L.remove(value)
+        self.discard(value)
 
     def count(self, value):
-        """Count the number of occurrences of the given value"""
+        """Count the number of occurrences of the given value (compared by
+        identity)"""
 
-        count = 0
-        for obj in self.walk():
-            count += bool(obj == value)
-        return count
+        return int(id(value) in self._where)
+
+    def layer_of(self, value):
+        """Retorna a camada em que o objeto se encontra."""
+
+        try:
+            return self._where[id(value)][0]
+        except KeyError:
+            raise ValueError('object %r not in RenderTree' % value)
 
     def walk(self, reverse=False):
         """Percorre sobre todos os objetos na ordem correta. Se reverse=True,
         percorre os objetos na ordem contrária.
         """
 
-        if reverse:
-            for _, L in reversed(self._data):
-                for obj in reversed(L):
-                    yield obj
-        else:
-            for _, L in self._data:
-                for obj in L:
-                    yield obj
+        self._compact()
+        self._walking += 1
+        try:
+            layers = self._layers
+            if reverse:
+                for layer in reversed(self._order):
+                    for obj in reversed(layers[layer]):
+                        if obj is not _empty:
+                            yield obj
+            else:
+                for layer in self._order:
+                    for obj in layers[layer]:
+                        if obj is not _empty:
+                            yield obj
+        finally:
+            self._walking -= 1
+
+    def _get_objects(self, layer):
+        # Lista de objetos da camada sem as posições vazias
+        L = self._layers.get(layer, [])
+        if layer in self._dirty:
+            return [obj for obj in L if obj is not _empty]
+        return L
 
     def iter_layers(self, skip_empty=True):
         """Itera sobre as camadas retornando a lista de objetos em cada
         camada"""
 
+        self._compact()
         if skip_empty:
-            for (_, L) in self._data:
-                yield L
-
-        else:
-            idx = self._data[0][0]
-            for i, L in self._data:
-                if i == idx:
-                    idx += 1
+            for layer in self._order:
+                L = self._get_objects(layer)
+                if L:
                     yield L
-                else:
-                    while idx < i:
-                        idx += 1
-                        yield []
+
+        elif self._order:
+            for idx in range(self._order[0], self._order[-1] + 1):
+                yield self._get_objects(idx)
 
     def get_layer(self, idx):
         """Retorna uma lista com os objetos da i-ésima camada"""
 
-        for i, L in self._data:
-            if i == idx:
-                return L
-        else:
-            return []
+        self._compact()
+        return self._get_objects(idx)
 
     def screen_update(self, screen):
         """Percorre todos os objetos na árvore invocando o método 
@@ -147,26 +241,192 @@ class RenderTree(object):
 
     def draw(self, painter):
         """Percorre todos os objetos na árvore invocando o método
-        `obj.paint(screen)`"""
+        `obj.paint(screen)`.
 
-        for obj in self.walk():
-            if obj.visible:
-                try:
-                    obj.draw(painter)
-                except Exception:
-                    print('debug: error drawing %s' % obj)
-                    raise
+        Se o painter fornecer um método viewport() (ex.: Camera) e o atributo
+        `culling` for verdadeiro, os objetos cuja caixa de contorno não
+        intercepta a região visível não são desenhados.
+
+        Se o painter suportar desenho em lote e o atributo `batching` for
+        verdadeiro, sequências de objetos consecutivos de uma mesma camada
+        que retornam a mesma função em `obj.batch_drawer()` são desenhadas com
+        uma única chamada a esta função. A ordem de desenho dos objetos é
+        sempre preservada.
+
+        Camadas marcadas com set_static() são renderizadas uma única vez em
+        um buffer fora da tela, quando o backend suportar."""
+
+        viewport = getattr(painter, 'viewport', None)
+        if viewport is not None and self.culling:
+            viewport = viewport()
+        else:
+            viewport = None
+        batching = self.batching and getattr(painter, 'supports_batching',
+                                             False)
+
+        self._compact()
+        self._walking += 1
+        try:
+            static = self._static
+            for layer in self._order:
+                L = self._layers[layer]
+                if not L:
+                    continue
+                if layer in static and self._draw_static(layer, L, painter):
+                    continue
+                self._draw_layer(L, painter, viewport, batching)
+        finally:
+            self._walking -= 1
+
+    def _draw_layer(self, L, painter, viewport, batching):
+        if viewport is not None:
+            xmin, xmax, ymin, ymax = viewport
+        if batching:
+            run = []
+            run_drawer = None
+
+        for obj in L:
+            if obj is _empty or not obj.visible:
+                continue
+
+            if viewport is not None:
+                bounds = _get_bounds(obj)
+                if bounds is not None:
+                    o_xmin, o_xmax, o_ymin, o_ymax = bounds
+                    if (o_xmax < xmin or o_xmin > xmax or
+                            o_ymax < ymin or o_ymin > ymax):
+                        continue
+
+            if batching:
+                drawer = getattr(obj, 'batch_drawer', None)
+                drawer = drawer and drawer()
+                if run and drawer != run_drawer:
+                    run_drawer(painter, run)
+                    run = []
+                if drawer is not None:
+                    run.append(obj)
+                    run_drawer = drawer
+                    continue
+            _draw_object(obj, painter)
+
+        if batching and run:
+            run_drawer(painter, run)
+
+    def set_static(self, layer, static=True):
+        """Marca a camada como estática.
+
+        Camadas estáticas são rasterizadas uma única vez em um buffer fora da
+        tela e este buffer é copiado para a tela a cada frame. O cache é
+        invalidado automaticamente quando objetos são adicionados ou
+        removidos da camada ou quando algum objeto da camada possui o bit
+        `flags.dirty_draw` ligado (ex.: após mover o objeto ou mudar sua cor).
+        Este bit é desligado quando a camada é verificada. Objetos sem o
+        atributo `flags` exigem uma chamada explícita a invalidate() quando
+        modificados."""
+
+        if static:
+            self._static[layer] = None
+        else:
+            self._static.pop(layer, None)
+
+    def is_static(self, layer):
+        """Retorna True se a camada foi marcada como estática."""
+
+        return layer in self._static
+
+    def invalidate(self, layer=None):
+        """Descarta o cache da camada estática fornecida ou de todas as
+        camadas estáticas, caso nenhuma seja especificada."""
+
+        if layer is None:
+            for layer in self._static:
+                self._static[layer] = None
+        elif layer in self._static:
+            self._static[layer] = None
+
+    def _draw_static(self, layer, L, painter):
+        draw_cached = getattr(painter, 'draw_cached', None)
+        if draw_cached is None:
+            return False
+
+        changed = _clear_dirty_draw(L)
+        entry = self._static[layer]
+        if entry is None or entry[0] is not painter or changed:
+            entry = (painter,) + self._render_static(L, painter)
+            self._static[layer] = entry
+
+        handle, xmin, ymin = entry[1:]
+        if handle is None:
+            return False
+        draw_cached(handle, xmin, ymin)
+        return True
+
+    def _render_static(self, L, painter):
+        bounds = [_get_bounds(obj) for obj in L
+                  if obj is not _empty and obj.visible]
+        if not bounds or None in bounds:
+            return None, 0, 0
+
+        xmin = int(math.floor(min(b[0] for b in bounds)))
+        xmax = int(math.ceil(max(b[1] for b in bounds)))
+        ymin = int(math.floor(min(b[2] for b in bounds)))
+        ymax = int(math.ceil(max(b[3] for b in bounds)))
+        shape = (xmax - xmin + 1, ymax - ymin + 1)
+        if max(shape) > self.max_static_size:
+            return None, 0, 0
+
+        batching = self.batching and getattr(painter, 'supports_batching',
+                                             False)
+        handle = painter.render_offscreen(
+            (xmin, ymin), shape,
+            lambda camera: self._draw_layer(L, camera, None, batching))
+        return handle, xmin, ymin
 
     def linearize(self, layer=0):
         """Retorna uma versão linearizada da árvore de renderização onde
         todos os objetos são recolocados na mesma camada"""
 
-        data = (layer, list(self.walk()))
         new = RenderTree(parent=self.parent)
-        new._data.append(data)
+        new.add_many(self.walk(), layer)
         return new
 
 
+def _get_bounds(obj):
+    # Retorna (xmin, xmax, ymin, ymax) ou None para objetos sem caixa de
+    # contorno
+    bounds = getattr(obj, 'draw_bounds', None)
+    try:
+        if bounds is None:
+            return obj.xmin, obj.xmax, obj.ymin, obj.ymax
+        return bounds()
+    except AttributeError:
+        return None
+
+
+def _clear_dirty_draw(L):
+    # Desliga o bit dirty_draw dos objetos e retorna True se algum deles
+    # estava ligado
+    from FGAme.physics.flags import flags
+
+    dirty_draw = flags.dirty_draw
+    clear_mask = flags.not_dirty_draw
+    changed = False
+    for obj in L:
+        obj_flags = getattr(obj, 'flags', 0)
+        if obj_flags & dirty_draw:
+            obj.flags = obj_flags & clear_mask
+            changed = True
+    return changed
+
+
+def _draw_object(obj, painter):
+    try:
+        obj.draw(painter)
+    except Exception:
+        print('debug: error drawing %s' % obj)
+        raise
+
+
 if __name__ == '__main__':
     import doctest
 
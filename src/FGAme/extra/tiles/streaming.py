@@ -0,0 +1,185 @@
+import math
+from collections import OrderedDict
+
+from FGAme.extra.tiles.tilemanager import add_objects, remove_objects
+
+
+class TileStreamer(object):
+
+    '''Mantém no mundo somente os pedaços (chunks) de um tileset próximos à
+    câmera ou a um objeto alvo.
+
+    O tileset é dividido em pedaços de `chunk_size` ladrilhos. A cada chamada
+    de :meth:`update`, os pedaços a uma distância de até `radius` pedaços da
+    região visível são ativados: seus ladrilhos (ou colisores, no modo
+    `merge`) são criados e adicionados ao mundo de uma só vez. Pedaços que se
+    afastam mais que `radius + 1` pedaços são removidos. O custo por quadro e
+    a memória ocupada pelo mundo dependem do tamanho da tela e não do tamanho
+    da fase.
+
+    Para que a memória também não dependa do tamanho da fase, adicione o mapa
+    com ``tiles.add_tilemap(data, lazy=True)``: os ladrilhos de cada pedaço
+    são então gerados diretamente a partir da string de especificação quando
+    o pedaço é carregado.
+
+    Os objetos dos últimos `cache_size` pedaços removidos são guardados e
+    reutilizados caso o pedaço volte a ser carregado. Pedaços mais antigos
+    são descartados e gerados novamente quando necessário.
+
+    Se o tileset utiliza `collision_grid`, a grade de colisão (um byte por
+    célula) é adicionada uma única vez e permanece ativa para toda a fase.
+
+    Parameters
+    ----------
+
+    tiles : TileManager
+        Tileset de origem. Define o tamanho e a origem dos ladrilhos.
+    world : World
+        Mundo que recebe os ladrilhos.
+    chunk_size :
+        Tamanho de cada pedaço em número de ladrilhos.
+    radius : int
+        Número de pedaços carregados em volta da região visível.
+    target :
+        Objeto com um atributo `pos` (ex.: o jogador). Se não for dado, utiliza
+        a região visível pela câmera da tela.
+    layer : int
+        Camada em que os ladrilhos são adicionados.
+    loader : callable
+        Função ``loader(chunk)`` que retorna uma tupla ``(objetos, visuais)``
+        como :meth:`TileManager.chunk_objects`. Permite gerar fases
+        proceduralmente. Por padrão, utiliza os ladrilhos do tileset.
+    cache_size : int
+        Número de pedaços removidos cujos objetos são mantidos para
+        reutilização. Utilize 0 para sempre descartá-los.
+
+    Examples
+    --------
+
+    Normalmente o streamer é atualizado automaticamente a cada quadro::
+
+        streamer = TileStreamer(tm, world, target=player)
+        streamer.start()
+    '''
+
+    def __init__(self, tiles, world, chunk_size=(16, 16), radius=1,
+                 target=None, layer=0, loader=None, cache_size=8):
+        self.tiles = tiles
+        self.world = world
+        self.chunk_size = tuple(chunk_size)
+        self.radius = radius
+        self.target = target
+        self.layer = layer
+        self.loader = loader or self._default_loader
+        self.cache_size = cache_size
+        self.active = {}
+        self._cache = OrderedDict()
+        self._handler = None
+        self._tilegrid = None
+
+    def _default_loader(self, chunk):
+        return self.tiles.chunk_objects(chunk, self.chunk_size)
+
+    def chunk_at(self, pos):
+        '''Retorna as coordenadas do pedaço que contém o ponto dado.'''
+
+        x, y = pos
+        x0, y0 = self.tiles.origin
+        dx, dy = self.tiles.shape
+        cw, ch = self.chunk_size
+        return (int(math.floor((x - x0) / dx / cw)),
+                int(math.floor((y - y0) / dy / ch)))
+
+    def region(self):
+        '''Retorna a tupla (ci_min, ci_max, cj_min, cj_max) com os pedaços
+        que cobrem o alvo ou a região visível.'''
+
+        if self.target is not None:
+            ci, cj = self.chunk_at(self.target.pos)
+            return ci, ci, cj, cj
+
+        from FGAme import conf
+
+        xmin, xmax, ymin, ymax = conf.get_screen().camera.viewport()
+        ci_min, cj_min = self.chunk_at((xmin, ymin))
+        ci_max, cj_max = self.chunk_at((xmax, ymax))
+        return ci_min, ci_max, cj_min, cj_max
+
+    def update(self):
+        '''Ativa os pedaços próximos e remove os distantes.'''
+
+        if self._tilegrid is None and getattr(self.tiles, 'collision_grid',
+                                              False):
+            self._tilegrid = self.tiles.tilegrid()
+            self.world.add_tilegrid(self._tilegrid)
+
+        ci_min, ci_max, cj_min, cj_max = self.region()
+
+        r = self.radius + 1
+        for chunk in list(self.active):
+            ci, cj = chunk
+            if not (ci_min - r <= ci <= ci_max + r and
+                    cj_min - r <= cj <= cj_max + r):
+                self.unload(chunk)
+
+        r = self.radius
+        for ci in range(ci_min - r, ci_max + r + 1):
+            for cj in range(cj_min - r, cj_max + r + 1):
+                if (ci, cj) not in self.active:
+                    self.load((ci, cj))
+
+    def load(self, chunk):
+        '''Adiciona os ladrilhos do pedaço dado ao mundo.'''
+
+        chunk = tuple(chunk)
+        if chunk not in self.active:
+            try:
+                objects, visuals = self._cache.pop(chunk)
+            except KeyError:
+                objects, visuals = self.loader(chunk)
+            add_objects(self.world, objects, visuals, self.layer)
+            self.active[chunk] = (objects, visuals)
+
+    def unload(self, chunk):
+        '''Remove os ladrilhos do pedaço dado do mundo.
+
+        Os objetos do pedaço são guardados para reutilização se `cache_size`
+        for positivo.'''
+
+        chunk = tuple(chunk)
+        objects, visuals = self.active.pop(chunk)
+        remove_objects(self.world, objects, visuals)
+        if self.cache_size > 0:
+            self._cache[chunk] = (objects, visuals)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def unload_all(self):
+        '''Remove todos os pedaços ativos e descarta os pedaços guardados.'''
+
+        for chunk in list(self.active):
+            self.unload(chunk)
+        self._cache.clear()
+        if self._tilegrid is not None:
+            self.world.remove_tilegrid(self._tilegrid)
+            self._tilegrid = None
+
+    def start(self):
+        '''Atualiza o streamer no início de cada quadro.'''
+
+        from FGAme.mainloop import frame_enter_signal
+
+        self.update()
+        if self._handler is None:
+            self._handler = frame_enter_signal.connect(self.update)
+        return self
+
+    def stop(self, unload=True):
+        '''Interrompe as atualizações automáticas e, opcionalmente, remove
+        todos os pedaços ativos.'''
+
+        if self._handler is not None:
+            self._handler.disconnect()
+            self._handler = None
+        if unload:
+            self.unload_all()
@@ -6,16 +6,84 @@ from FGAme.mathtools import asvector
 TileSpec = namedtuple('TileSpec', ['tile', 'layer'])
 
 
+def merge_cells(cells):
+    '''Agrupa um conjunto de células (i, j) em retângulos usando um algoritmo
+    guloso.
+
+    Cada retângulo cresce primeiro para a direita e depois para cima enquanto
+    todas as células cobertas estiverem no conjunto. Retorna uma lista de
+    tuplas (i, j, largura, altura).
+
+    Examples
+    --------
+
+    >>> merge_cells({(0, 0), (1, 0), (0, 1), (1, 1), (3, 0)})
+    [(0, 0, 2, 2), (3, 0, 1, 1)]
+    '''
+
+    free = set(cells)
+    rects = []
+    for i, j in sorted(free, key=lambda c: (c[1], c[0])):
+        if (i, j) not in free:
+            continue
+
+        width = 1
+        while (i + width, j) in free:
+            width += 1
+        height = 1
+        while all((i + k, j + height) in free for k in range(width)):
+            height += 1
+
+        for di in range(width):
+            for dj in range(height):
+                free.discard((i + di, j + dj))
+        rects.append((i, j, width, height))
+    return rects
+
+
 class TileManager(object):
 
-    '''Configura um tileset que permite dispor objetos no mundo'''
+    '''Configura um tileset que permite dispor objetos no mundo
+
+    Parameters
+    ----------
+
+    shape :
+        Tamanho de cada ladrilho.
+    origin :
+        Posição de referência do ladrilho (0, 0).
+    merge : bool
+        Se verdadeiro, ladrilhos sólidos vizinhos do mesmo tipo são
+        substituídos por um número reduzido de colisores AABB invisíveis ao
+        adicionar o tileset ao mundo (veja :meth:`colliders`). Cada ladrilho
+        continua sendo desenhado individualmente, mas não participa da
+        simulação física. Isto reduz drasticamente o número de corpos e elimina
+        as quinas internas nas quais os objetos podem enroscar.
+    collision_grid : bool
+        Se verdadeiro, as colisões com ladrilhos sólidos são tratadas por uma
+        grade de colisão (:class:`FGAme.physics.TileGrid`, veja
+        :meth:`tilegrid`) em vez de corpos. Cada objeto dinâmico é testado
+        somente contra as células que ocupa. Tem precedência sobre `merge`.
+
+    Mapas adicionados com ``add_tilemap(data, lazy=True)`` guardam somente a
+    string de especificação. Os ladrilhos são criados sob demanda por
+    :meth:`chunk_objects` (veja :class:`TileStreamer`) e não aparecem em
+    `tiles`, `positions`, ``len(tm)`` ou ``iter(tm)``.
+    '''
 
-    def __init__(self, shape=(50, 50), origin=(0, 0)):
+    def __init__(self, shape=(50, 50), origin=(0, 0), merge=False,
+                 collision_grid=False):
         self.shape = asvector(shape)
         self.origin = asvector(origin)
+        self.merge = merge
+        self.collision_grid = collision_grid
         self.tiles = []
         self.specs = {}
         self.charspecs = {}
+        self.grid = {}
+        self.positions = []
+        self._tilemaps = []
+        self._chunks = {}
 
     def register_spec(self, name, char, tile=None, **kwds):
         '''
@@ -42,6 +110,8 @@ class TileManager(object):
 
         if tile is None:
             tilespec = self._make_tile(name, **kwds)
+        else:
+            tilespec = TileSpec(tile, kwds.get('layer') or 0)
         self.specs[name] = tilespec
         if char is not None:
             self.charspecs[char] = tilespec
@@ -114,26 +184,36 @@ class TileManager(object):
         cima a partir da origem definida em `self.origin`.
         '''
 
+        i, j = pos
+        if i == int(i) and j == int(j):
+            self.grid[int(i), int(j)] = len(self.tiles)
+        self.positions.append((i, j))
+        self.tiles.append(self._new_tile(pos, tile))
+        self._chunks.clear()
+
+    def _new_tile(self, pos, tile):
+        # Retorna um TileSpec com uma cópia do ladrilho na posição (i, j)
         i, j = pos
         dx, dy = self.shape
         x0, y0 = self.origin
         layer = 0
-        
+
         if isinstance(tile, str):
-            name = tile
-            try:
-                if len(name) == 1:
-                    tile, layer = self.charspecs[name]
-                else:
-                    tile, layer = self.specs[name]
-            except KeyError:
-                raise ValueError('%r is not a valid tile name' % name)
+            tile, layer = self._get_spec(tile)
 
         tile = tile.copy()
         tile.imove(x0 + i * dx, y0 + j * dy)
-        self.tiles.append(TileSpec(tile, layer))
+        return TileSpec(tile, layer)
 
-    def add_tilemap(self, data):
+    def _get_spec(self, name):
+        try:
+            if len(name) == 1:
+                return self.charspecs[name]
+            return self.specs[name]
+        except KeyError:
+            raise ValueError('%r is not a valid tile name' % name)
+
+    def add_tilemap(self, data, lazy=False):
         '''Adiciona um tileset completo a partir da string de especificação.
 
         Um exemplo de string ``data`` é dado abaixo::
@@ -166,26 +246,232 @@ class TileManager(object):
         Cada ladrilho deve ter sido criado previamente pela função
         :meth:`register_spec`. Caso o usuário utilize um caractere inválido,
         isto corresponderá a um erro.
-        '''
 
-        y = data.count('|') - 1
-        for line in data.splitlines():
-            line = line.lstrip()
-            if line.startswith('|'):
-                line = line[1:]
-            else:
-                continue
+        Se `lazy` for verdadeiro, somente as linhas do mapa são armazenadas e
+        os ladrilhos são criados sob demanda, pedaço a pedaço, por
+        :meth:`chunk_objects`. Isto permite utilizar fases grandes com o
+        :class:`TileStreamer` sem manter uma cópia de cada ladrilho na
+        memória.
+        '''
 
+        rows = [line.lstrip()[1:] for line in data.splitlines()
+                if line.lstrip().startswith('|')]
+        if lazy:
+            for row in rows:
+                for char in row:
+                    if char not in ' #':
+                        self._get_spec(char)
+            self._tilemaps.append((rows, len(rows) - 1))
+            return
+
+        for y, line in zip(range(len(rows) - 1, -1, -1), rows):
             for x, char in enumerate(line):
                 if char not in ' #':
                     self.add_tile((x, y), char)
-            y -= 1
+
+    def _lazy_cells(self, imin=None, imax=None, jmin=None, jmax=None):
+        # Itera sobre as tuplas (i, j, caractere) dos mapas criados com
+        # lazy=True dentro da região dada
+        for rows, top in self._tilemaps:
+            j0 = top - len(rows) + 1
+            j1 = top if jmax is None else min(top, jmax)
+            j0 = j0 if jmin is None else max(j0, jmin)
+            for j in range(j0, j1 + 1):
+                row = rows[top - j]
+                i0 = 0 if imin is None else max(imin, 0)
+                i1 = len(row) - 1 if imax is None else min(imax, len(row) - 1)
+                for i in range(i0, i1 + 1):
+                    char = row[i]
+                    if char not in ' #':
+                        yield i, j, char
 
     def update_world(self, world, layer=0):
         '''Usado por World.add() para adicionar o tileset'''
 
-        for tile, delta in self.tiles:
-            world.add(tile.copy(), layer + delta)
+        objects, visuals = self.materialize(range(len(self.tiles)))
+        if self._tilemaps:
+            lazy_objects, lazy_visuals = self._materialize(
+                self._lazy_entries(), copy=False)
+            objects.extend(lazy_objects)
+            visuals.extend(lazy_visuals)
+        add_objects(world, objects, visuals, layer)
+        if self.collision_grid:
+            world.add_tilegrid(self.tilegrid())
+
+    def materialize(self, indices):
+        '''Cria cópias dos ladrilhos com os índices dados.
+
+        Retorna duas listas de pares (objeto, camada): a primeira com os
+        objetos que devem ser adicionados ao mundo e a segunda com os objetos
+        que devem ser adicionados somente à árvore de renderização (ladrilhos
+        substituídos por colisores no modo `merge`).'''
+
+        return self._materialize(self._entries(sorted(set(indices))))
+
+    def _entries(self, indices):
+        # Converte índices em tuplas (i, j, TileSpec, na_grade)
+        grid = self.grid
+        entries = []
+        for idx in indices:
+            i, j = self.positions[idx]
+            on_grid = i == int(i) and j == int(j) and grid.get((i, j)) == idx
+            entries.append((i, j, self.tiles[idx], on_grid))
+        return entries
+
+    def _lazy_entries(self, *region):
+        # Cria os ladrilhos dos mapas preguiçosos na região dada
+        return [(i, j, self._new_tile((i, j), char), True)
+                for i, j, char in self._lazy_cells(*region)]
+
+    def _materialize(self, entries, copy=True):
+        # Implementa materialize() para uma lista de entradas. Se copy for
+        # falso, os ladrilhos das entradas são utilizados diretamente.
+        if self.merge or self.collision_grid:
+            merged = self._mergeable(entries)
+        else:
+            merged = []
+        is_merged = set(map(id, merged))
+        objects = []
+        visuals = []
+        for entry in entries:
+            tile, delta = entry[2]
+            tile = tile.copy() if copy else tile
+            if id(entry) in is_merged:
+                visuals.append((tile, delta))
+            else:
+                objects.append((tile, delta))
+        if merged and not self.collision_grid:
+            objects.extend(self._colliders(merged))
+        return objects, visuals
+
+    def tilegrid(self, **kwds):
+        '''Retorna uma :class:`FGAme.physics.TileGrid` em que as células
+        ocupadas por ladrilhos sólidos (AABBs estáticas do tamanho de uma
+        célula) são marcadas como sólidas.
+
+        Argumentos adicionais são repassados para o construtor de TileGrid.'''
+
+        from FGAme.physics import TileGrid
+
+        merged = self._mergeable(self._entries(self.grid.values()))
+        cells = [(int(i), int(j)) for i, j, _, _ in merged]
+        solid = {}
+        for i, j, char in self._lazy_cells():
+            try:
+                is_solid = solid[char]
+            except KeyError:
+                is_solid = solid[char] = self._is_cell_tile(
+                    self._get_spec(char).tile)
+            if is_solid:
+                cells.append((i, j))
+        if not cells:
+            return TileGrid(self.shape, 0, 0, **kwds)
+
+        # Origem da célula (0, 0) calculada a partir de um ladrilho real
+        if merged:
+            i, j, (tile, _), _ = merged[0]
+        else:
+            i, j = cells[0]
+            char = next(c for i_, j_, c in self._lazy_cells(i, i, j, j))
+            tile = self._new_tile((i, j), char).tile
+        dx, dy = self.shape
+        origin = (tile.xmin - i * dx, tile.ymin - j * dy)
+        return TileGrid.from_cells(cells, self.shape, origin, **kwds)
+
+    def chunks(self, chunk_size):
+        '''Retorna um dicionário que mapeia as coordenadas (ci, cj) de cada
+        pedaço de tamanho `chunk_size` (em número de ladrilhos) à lista de
+        índices dos ladrilhos contidos nele.
+
+        Ladrilhos de mapas adicionados com lazy=True não são incluídos.'''
+
+        chunk_size = tuple(chunk_size)
+        try:
+            return self._chunks[chunk_size]
+        except KeyError:
+            pass
+
+        cw, ch = chunk_size
+        chunks = {}
+        for idx, (i, j) in enumerate(self.positions):
+            chunks.setdefault((int(i // cw), int(j // ch)), []).append(idx)
+        self._chunks[chunk_size] = chunks
+        return chunks
+
+    def chunk_objects(self, chunk, chunk_size):
+        '''Como :meth:`materialize`, mas cria somente os ladrilhos do pedaço
+        dado. No modo `merge`, os colisores não ultrapassam os limites do
+        pedaço.
+
+        Os ladrilhos de mapas adicionados com lazy=True são gerados a partir
+        da string de especificação a cada chamada.'''
+
+        ci, cj = chunk
+        cw, ch = chunk_size
+        indices = self.chunks(chunk_size).get((ci, cj), ())
+        objects, visuals = self.materialize(indices)
+        if self._tilemaps:
+            entries = self._lazy_entries(ci * cw, (ci + 1) * cw - 1,
+                                         cj * ch, (cj + 1) * ch - 1)
+            lazy_objects, lazy_visuals = self._materialize(entries, copy=False)
+            objects.extend(lazy_objects)
+            visuals.extend(lazy_visuals)
+        return objects, visuals
+
+    def colliders(self, merged=None):
+        '''Retorna uma lista de pares (colisor, camada) com as AABBs que
+        substituem os ladrilhos sólidos no modo `merge`.
+
+        Se `merged` for dado, considera somente os ladrilhos com estes
+        índices.'''
+
+        if merged is None:
+            merged = self._mergeable(self._entries(self.grid.values()))
+        else:
+            merged = self._entries(merged)
+        return self._colliders(merged)
+
+    def _colliders(self, merged):
+        groups = {}
+        cells = {}
+        for i, j, (tile, delta), _ in merged:
+            i, j = int(i), int(j)
+            groups.setdefault((tile.name, delta), set()).add((i, j))
+            cells[i, j] = tile
+
+        result = []
+        ordered = sorted(groups.items(), key=lambda x: repr(x[0]))
+        for (_, delta), group in ordered:
+            for i, j, width, height in merge_cells(group):
+                first = cells[i, j]
+                last = cells[i + width - 1, j + height - 1]
+                result.append((self._make_collider(first, last), delta))
+        return result
+
+    def _mergeable(self, entries):
+        # Entradas dos ladrilhos que podem ser agrupados: AABBs estáticas que
+        # ocupam exatamente uma célula da grade
+        return [entry for entry in entries
+                if entry[3] and self._is_cell_tile(entry[2].tile)]
+
+    def _is_cell_tile(self, tile):
+        dx, dy = self.shape
+        tol = 1e-6 * (dx + dy)
+        return (isinstance(tile, FGAme.AABB) and
+                tile.mass == float('inf') and
+                abs(tile.xmax - tile.xmin - dx) < tol and
+                abs(tile.ymax - tile.ymin - dy) < tol)
+
+    def _make_collider(self, first, last):
+        # Cria colisor que cobre os ladrilhos entre first e last (inclusive)
+        collider = FGAme.AABB(first.xmin, last.xmax, first.ymin, last.ymax,
+                              mass='inf', visible=False)
+        collider.name = first.name
+        if first.owns_restitution:
+            collider.restitution = first.restitution
+        if first.owns_friction:
+            collider.friction = first.friction
+        return collider
 
     def __iter__(self):
         return iter(self.tiles)
@@ -193,6 +479,32 @@ class TileManager(object):
     def __len__(self):
         return len(self.tiles)
 
+
+def add_objects(world, objects, visuals, layer=0):
+    '''Adiciona listas de pares (objeto, camada) retornadas por
+    :meth:`TileManager.materialize` ao mundo, agrupando por camada.'''
+
+    for delta, group in _by_layer(objects):
+        world.add_many(group, layer + delta)
+    render_tree = world.render_tree()
+    for delta, group in _by_layer(visuals):
+        render_tree.add_many(group, layer + delta)
+
+
+def remove_objects(world, objects, visuals):
+    '''Remove do mundo os objetos adicionados por :func:`add_objects`.'''
+
+    world.remove_many([obj for obj, _ in objects])
+    world.render_tree().remove_many([obj for obj, _ in visuals])
+
+
+def _by_layer(pairs):
+    layers = {}
+    for obj, delta in pairs:
+        layers.setdefault(delta, []).append(obj)
+    return sorted(layers.items())
+
+
 class TileObject(object):
     '''Representa um objeto que está em uma grade de ladrilhos.
     
@@ -33,15 +33,22 @@ class MainLoop:
             Initialized input object for the current backend.
         fps (float):
             Desired frame rate.
+        dirty_rects (bool):
+            If True and the screen supports it, only the regions that changed
+            since the last frame are repainted and pushed to the screen.
+            Drawings made by handlers of the post-draw signal are only
+            updated inside these regions.
     """
 
     _instance = None
 
-    def __init__(self, screen, input, fps=None):
+    def __init__(self, screen, input, fps=None, dirty_rects=False):
         super(MainLoop, self).__init__()
         self.screen = screen
         self.input = input
         self.fps = fps or 60
+        self.dirty_rects = dirty_rects
+        self._dirty_tracker = None
         self.dt = 1.0 / self.fps
         self.time = 0.0
         self.sleep_time = 0.0
@@ -126,12 +133,36 @@ class MainLoop:
         """
 
         screen = self.screen
-        bg_color = getattr(state, 'background', 'white')
+        camera = screen.camera
+        tree = state.render_tree()
         pre_draw_signal.trigger(screen)
-        screen.draw_background()
-        state.render_tree().draw(screen.camera)
-        post_draw_signal.trigger(screen)
-        screen.flip()
+
+        regions = None
+        if self.dirty_rects and getattr(screen, 'supports_dirty_rects', False):
+            if self._dirty_tracker is None:
+                from FGAme.draw.dirty import DirtyRects
+                self._dirty_tracker = DirtyRects()
+            regions = self._dirty_tracker.collect(tree, camera.viewport())
+
+        if regions is None:
+            screen.draw_background()
+            tree.draw(camera)
+            post_draw_signal.trigger(screen)
+            screen.flip()
+        else:
+            dx, dy = camera.displacement
+            rects = [(xmin + dx, xmax + dx, ymin + dy, ymax + dy)
+                     for (xmin, xmax, ymin, ymax) in regions]
+            try:
+                for region, rect in zip(regions, rects):
+                    screen.clip_region(rect)
+                    camera.clip = region
+                    tree.draw(camera)
+            finally:
+                camera.clip = None
+                screen.clip_region(None)
+            post_draw_signal.trigger(screen)
+            screen.flip_regions(rects)
 
     def step_endframe(self, state, start_time, wait=True):
         """
@@ -3,18 +3,40 @@ Re-define os objetos do módulo FGAme.physics e adiciona propriades extras de
 renderização
 """
 
+from math import sqrt
+
 from PIL import ImageChops
 from FGAme import conf
 from FGAme import draw
 from FGAme import physics
 from FGAme.draw import Color, colorproperty, Image
 from FGAme.mathtools import asvector
+from FGAme.physics.flags import flags
 from FGAme.utils import lazy
 
 __all__ = [
     'AABB', 'Circle',  'Poly', 'RegularPoly', 'Rectangle',
 ]
 black = Color('black')
+DIRTY_DRAW = flags.dirty_draw
+
+
+def drawcolorproperty(name):
+    """
+    A colorproperty that marks the object to be redrawn when it changes.
+    """
+
+    prop = colorproperty(name)
+    fset = prop.fset
+
+    def fset_dirty(self, value):
+        fset(self, value)
+        try:
+            self.flags |= DIRTY_DRAW
+        except AttributeError:
+            pass  # called before physics initialization
+
+    return property(prop.fget, fset_dirty, prop.fdel)
 
 
 class Body(physics.Body):
@@ -79,15 +101,15 @@ class Body(physics.Body):
     def _input(self):
         return conf.get_input()
 
-    color = colorproperty('color')
-    linecolor = colorproperty('linecolor')
+    color = drawcolorproperty('color')
+    linecolor = drawcolorproperty('linecolor')
 
     @property
     def image(self):
         img = self._image
         if img is None:
             return None
-        img.pos = self.pos + img.offset
+        img.pos = self.pos
         return img
 
     @image.setter
@@ -131,13 +153,37 @@ class Body(physics.Body):
         Draw object in a canvas-like screen.
         """
 
-        img = self.image
+        img = self._image
         if img is not None:
-            img.pos = self.pos + img.offset
+            img.pos = self.pos
+            if self._theta:
+                return img.draw_rotated(screen, self._theta)
             return img.draw(screen)
         else:
             return self.draw_shape(screen)
 
+    def draw_bounds(self):
+        """
+        Return the (xmin, xmax, ymin, ymax) limits of the region touched by
+        draw().
+
+        Uses the image rectangle, if it exists, or the circular bounding box
+        maintained for the broad phase. This is cheaper than computing the
+        exact bounding box and is used for view culling.
+        """
+
+        x, y = self.pos
+        img = self._image
+        if img is not None:
+            if self._theta:
+                dx = dy = sqrt(img.width ** 2 + img.height ** 2) / 2
+            else:
+                dx = img.width / 2
+                dy = img.height / 2
+        else:
+            dx = dy = self.cbb_radius
+        return x - dx, x + dx, y - dy, y + dy
+
     def draw_shape(self, screen):
         """
         Draw a shape identical to the object's bounding box.
@@ -145,6 +191,33 @@ class Body(physics.Body):
 
         raise NotImplementedError('must be implemented on subclass.')
 
+    def batch_drawer(self):
+        """
+        Return a function f(screen, objects) that draws this object together
+        with the adjacent objects in the same layer that return the same
+        function.
+
+        Return None if the object must be drawn individually.
+        """
+
+        return None
+
+    @staticmethod
+    def _batch_fillcolors(objects):
+        return [black if obj._color is None else obj._color
+                for obj in objects]
+
+    @staticmethod
+    def _draw_batch_borders(objects, draw_func):
+        for obj in objects:
+            lc, lw = obj._linecolor, obj.linewidth
+            if lc is not None and lw:
+                draw_func(obj.bb, None, lc, lw)
+
+    def _is_batchable(self):
+        return self._image is None and (self._color is not None or
+                                        self.linewidth)
+
     def destroy(self):
         super().destroy()
         if self.world is not None:
@@ -170,11 +243,26 @@ class AABB(Body, physics.AABB):
         if self._color is not None:
             color = self._color
             lw, lc = self.linewidth, self._linecolor
-            screen.draw_aabb(bb, color, lw, lc)
+            screen.draw_aabb(bb, color, lc, lw)
 
         elif self.linewidth:
             lw, lc = self.linewidth, self._linecolor
-            screen.draw_aabb(bb, black, lw, lc)
+            screen.draw_aabb(bb, black, lc, lw)
+
+    def batch_drawer(self):
+        if self._is_batchable():
+            return self.draw_batch
+
+    @classmethod
+    def draw_batch(cls, screen, objects):
+        """
+        Draw a sequence of AABB objects with a single batched call.
+        """
+
+        screen.draw_aabbs(
+            [(obj.xmin, obj.xmax, obj.ymin, obj.ymax) for obj in objects],
+            cls._batch_fillcolors(objects))
+        cls._draw_batch_borders(objects, screen.draw_aabb)
 
     @property
     def drawshape(self):
@@ -197,11 +285,26 @@ class Circle(Body, physics.Circle):
         if self._color is not None:
             color = self._color
             lw, lc = self.linewidth, self._linecolor
-            screen.draw_circle(bb, color, lw, lc)
+            screen.draw_circle(bb, color, lc, lw)
 
         elif self.linewidth:
             lw, lc = self.linewidth, self._linecolor
-            screen.draw_circle(bb, black, lw, lc)
+            screen.draw_circle(bb, black, lc, lw)
+
+    def batch_drawer(self):
+        if self._is_batchable():
+            return self.draw_batch
+
+    @classmethod
+    def draw_batch(cls, screen, objects):
+        """
+        Draw a sequence of Circle objects with a single batched call.
+        """
+
+        screen.draw_circles([obj.pos for obj in objects],
+                            [obj.cbb_radius for obj in objects],
+                            cls._batch_fillcolors(objects))
+        cls._draw_batch_borders(objects, screen.draw_circle)
 
 
 class Poly(Body, physics.Poly):
@@ -213,11 +316,25 @@ class Poly(Body, physics.Poly):
         if self._color is not None:
             color = self._color
             lw, lc = self.linewidth, self._linecolor
-            screen.draw_poly(self.bb, color, lw, lc)
+            screen.draw_poly(self.bb, color, lc, lw)
 
         elif self.linewidth:
             lw, lc = self.linewidth, self._linecolor
-            screen.draw_poly(self.bb, black, lw, lc)
+            screen.draw_poly(self.bb, black, lc, lw)
+
+    def batch_drawer(self):
+        if self._is_batchable():
+            return self.draw_batch
+
+    @classmethod
+    def draw_batch(cls, screen, objects):
+        """
+        Draw a sequence of Poly objects with a single batched call.
+        """
+
+        screen.draw_polys([obj.vertices for obj in objects],
+                          cls._batch_fillcolors(objects))
+        cls._draw_batch_borders(objects, screen.draw_poly)
 
     def _init_drawshape(self, color=None, linecolor=None, linewidth=1):
         return draw.Poly(self.bb,
@@ -3,3 +3,4 @@ from .signals import *
 from .collision import get_collision, Collision
 from .bodies import *
 from .simulation import Simulation
+from .tilegrid import TileGrid
@@ -97,7 +97,7 @@ class AABB(LinearRigidBody):
 
 
 @get_collision.overload([AABB, AABB])
-def collision_aabb(A, B):
+def collision_aabb(A, B, collision_class=Collision):
     # Detects collision using bounding box shadows.
     x0, x1 = max(A.xmin, B.xmin), min(A.xmax, B.xmax)
     y0, y1 = max(A.ymin, B.ymin), min(A.ymax, B.ymax)
@@ -117,4 +117,4 @@ def collision_aabb(A, B):
         delta = dx
         normal = Vec2((1 if A.pos.x < B.pos.x else -1), 0)
 
-    return Collision(A, B, pos=pos, normal=normal, delta=delta)
+    return collision_class(A, B, pos=pos, normal=normal, delta=delta)
@@ -33,7 +33,7 @@ class Body(Solid, Particle):
     """
 
     __slots__ = (
-        '_invinertia',
+        '_invinertia', '_adamping',
         'cbb_radius', '_shape', 'base_shape',
         '_theta', '_omega', '_alpha',
     )
@@ -68,13 +68,16 @@ class Body(Solid, Particle):
     def theta(self, value):
         if self.flags & flags.can_rotate:
             self._theta = value + 0.0
+            self.flags |= flags.dirty_any
         elif value:
             self._raise_cannot_rotate_error()
 
     # Forces and torques
     @property
     def adamping(self):
-        return self._adamping
+        if self.flags & flags.owns_adamping:
+            return self._adamping
+        return self._globals.adamping
 
     @adamping.setter
     def adamping(self, value):
@@ -224,6 +227,9 @@ class Body(Solid, Particle):
         self._theta = float(theta)
         self._omega = float(omega)
         self._alpha = 0.0
+        self._adamping = 0.0
+        if adamping is not None:
+            self.adamping = adamping
 
         # Collision and shapes
         self.base_shape = base_shape
@@ -464,7 +470,11 @@ class Body(Solid, Particle):
         frame.
         """
 
-        self._alpha = - self._adamping * self._omega
+        if self.flags & flags.owns_adamping:
+            adamping = self._adamping
+        else:
+            adamping = self._globals.adamping
+        self._alpha = -adamping * self._omega
 
     def apply_torque(self, torque, dt, method=None):
         """
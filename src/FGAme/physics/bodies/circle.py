@@ -125,4 +125,5 @@ def circle_aabb(A, B, collision_class=Collision):
 def aabb_circle(A, B, collision_class=Collision):
     col = circle_aabb(B, A, collision_class=collision_class)
     if col is not None:
-        return col.swap()
\ No newline at end of file
+        col.iswap()
+        return col
\ No newline at end of file
@@ -8,7 +8,8 @@ from FGAme.physics import flags, object_added_signal
 from FGAme.physics.bodies.utils import flag_property, accept_vec_args, \
     vec_property
 from FGAme.physics.forces import ForceProperty
-from FGAme.physics.utils import normalize_flag_value
+from FGAme.physics.utils import normalize_flag_value, normalize_gravity, \
+    DEFAULT_PARAMETERS
 
 
 class ParticleMeta(type(smallshapes.core.mLocatable)):
@@ -41,9 +42,9 @@ class Particle(smallshapes.core.locatable.mLocatable,
     __slots__ = [
         '_invmass', '_pos', '_vel', '_acceleration',
         '_restitution', '_damping', '_friction', '_gravity',
-        '_col_layer_mask', '_col_group_mask',
+        '_col_layer_mask', '_col_group_mask', '_globals',
         'flags',
-        '__dict__',
+        '__dict__', '__weakref__',
     ]
 
     # Dynamic variables
@@ -126,21 +127,24 @@ class Particle(smallshapes.core.locatable.mLocatable,
     # External forces
     force = ForceProperty()
 
+    # Objects share the global parameters of the simulation unless they set
+    # the corresponding owns_* flag.
     @property
     def gravity(self):
-        return self._gravity
+        if self.flags & flags.owns_gravity:
+            return self._gravity
+        return self._globals.gravity
 
     @gravity.setter
     def gravity(self, value):
-        try:
-            self._gravity = Vec2(*value)
-        except TypeError:
-            self._gravity = Vec2(0, -value)
+        self._gravity = normalize_gravity(value)
         self.owns_gravity = True
 
     @property
     def damping(self):
-        return self._damping
+        if self.flags & flags.owns_damping:
+            return self._damping
+        return self._globals.damping
 
     @damping.setter
     def damping(self, value):
@@ -149,7 +153,9 @@ class Particle(smallshapes.core.locatable.mLocatable,
 
     @property
     def restitution(self):
-        return self._restitution
+        if self.flags & flags.owns_restitution:
+            return self._restitution
+        return self._globals.restitution
 
     @restitution.setter
     def restitution(self, value):
@@ -158,7 +164,9 @@ class Particle(smallshapes.core.locatable.mLocatable,
 
     @property
     def friction(self):
-        return self._friction
+        if self.flags & flags.owns_friction:
+            return self._friction
+        return self._globals.friction
 
     @friction.setter
     def friction(self, value):
@@ -204,6 +212,7 @@ class Particle(smallshapes.core.locatable.mLocatable,
         self._invmass = 1 / mass
 
         # Control object-local physical parameters
+        self._globals = DEFAULT_PARAMETERS
         self._gravity = null2D
         self._damping = 0.0
         self._friction = 0.0
@@ -360,12 +369,12 @@ class Particle(smallshapes.core.locatable.mLocatable,
     # Position and movement
     def move_vec(self, vec):
         self._pos += vec
-        self.flags |= flags.dirty_aabb
+        self.flags |= flags.dirty_moved
         return self
 
     def move_to_vec(self, vec):
         self._pos = asvector(vec)
-        self.flags |= flags.dirty_aabb
+        self.flags |= flags.dirty_moved
         return self
 
     def imove_vec(self, vec):
@@ -408,13 +417,24 @@ class Particle(smallshapes.core.locatable.mLocatable,
         frame.
         """
 
-        if self._damping:
+        oflags = self.flags
+        params = self._globals
+        if oflags & flags.owns_damping:
+            damping = self._damping
+        else:
+            damping = params.damping
+        if oflags & flags.owns_gravity:
+            gravity = self._gravity
+        else:
+            gravity = params.gravity
+
+        if damping:
             a = self._vel
-            a *= -self._damping
-            if self.gravity is not None:
-                a += self._gravity
-        elif self._gravity is not None:
-            a = self._gravity
+            a *= -damping
+            if gravity is not None:
+                a += gravity
+        elif gravity is not None:
+            a = gravity
         else:
             a = null2D
         self._acceleration = a
@@ -670,21 +690,17 @@ class Particle(smallshapes.core.locatable.mLocatable,
         Changes the simulation associated with object.
         """
 
-        self._simulation = self
-        oflags = self.flags
-        if not oflags & flags.owns_gravity:
-            self._gravity = simulation.gravity
-        if not oflags & flags.owns_damping:
-            self._damping = simulation.damping
-        if not oflags & flags.owns_adamping:
-            self._adamping = simulation.adamping
-        if not oflags & flags.owns_restitution:
-            self._restitution = simulation.restitution
-        if not oflags & flags.owns_friction:
-            self._friction = simulation.friction
-
-        self.autoconnect()
+        self._simulation = simulation
+        self._globals = simulation._globals
+
+        # Objects that return to a simulation (e.g., recycled from a pool)
+        # simply resume their handlers instead of connecting them twice.
+        if self.__dict__.get('_autoconnected', False):
+            self.resume_signals()
+        else:
+            self.autoconnect()
+            self._autoconnected = True
         object_added_signal.trigger(simulation, self)
 
-Particle.pos = vec_property(Particle._pos)
+Particle.pos = vec_property(Particle._pos, flags.dirty_moved)
 Particle.vel = vec_property(Particle._vel)
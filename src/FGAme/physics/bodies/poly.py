@@ -281,12 +281,10 @@ def aabb_poly(A, B, collision_class=Collision):
         return None
 
     A_poly = Rectangle(A.rect_coords)
-    col = collision_poly(A_poly, B)
+    col = collision_poly(A_poly, B, collision_class=collision_class)
     if col is not None:
-        return collision_class(A, B, pos=col.pos, normal=col.normal,
-                               delta=col.delta)
-    else:
-        return None
+        col.reset(A, B, pos=col.pos, normal=col.normal, delta=col.delta)
+    return col
 
 
 @get_collision.overload([Circle, Poly])
@@ -331,9 +329,9 @@ def circle_poly(A, B, collision_class=Collision):
 
 @get_collision.overload([Poly, Circle])
 def poly_circle(A, B, collision_class=Collision):
-    return circle_poly(B, A, collision_class=Collision)
+    return circle_poly(B, A, collision_class=collision_class)
 
 
 @get_collision.overload([Poly, AABB])
 def poly_aabb(A, B, collision_class=Collision):
-    return aabb_poly(B, A, collision_class=Collision)
+    return aabb_poly(B, A, collision_class=collision_class)
@@ -19,9 +19,11 @@ def flag_property(flag):
     return property(fget, fset)
 
 
-def vec_property(slot):
+def vec_property(slot, flag=0):
     """
     A property element that forces conversion to a Vec2 value.
+
+    If flag is given, it is set in obj.flags after each assignment.
     """
 
     getter = slot.__get__
@@ -34,6 +36,8 @@ def vec_property(slot):
             if not isinstance(value, Vec2):
                 value = asvector(value)
             setter(obj, value)
+            if flag:
+                obj.flags |= flag
 
         def __get__(self, obj, cls):
             if obj is None:
@@ -2,7 +2,8 @@ from collections import MutableSequence
 
 from FGAme.mathtools import shadow_y
 from FGAme.physics import flags
-from FGAme.physics.collision import CBBContact, AABBContact, get_collision
+from FGAme.physics.collision import CBBContact, AABBContact, Collision, \
+    ContactPool, get_collision
 
 
 class AbstractCollisionPhase(MutableSequence):
@@ -10,13 +11,14 @@ class AbstractCollisionPhase(MutableSequence):
     Base class for BroadPhase and NarrowPhase.
     """
 
-    __slots__ = ('simulation', '_data', '_collision_check')
+    __slots__ = ('simulation', '_data', '_collision_check', '_pools')
 
     def __init__(self, data=[], simulation=None, collision_check=None):
         self.simulation = simulation
         self._data = []
         self._data.extend(data)
         self._collision_check = collision_check or simulation.collision_check
+        self._pools = {}
 
     def __call__(self, objects):
         self.update(objects)
@@ -33,6 +35,21 @@ class AbstractCollisionPhase(MutableSequence):
 
         raise NotImplementedError
 
+    def contact_pool(self, contact_class):
+        """
+        Return the pool of recycled contacts of the given class.
+
+        Contacts created from the pool in the previous update are released for
+        reuse.
+        """
+
+        try:
+            pool = self._pools[contact_class]
+        except KeyError:
+            pool = self._pools[contact_class] = ContactPool(contact_class)
+        pool.recycle()
+        return pool
+
     def objects(self):
         """
         Iterates over all objects captured in the collision phase.
@@ -106,6 +123,7 @@ class BroadPhaseAABB(BroadPhase):
     def update(self, L):
         IS_SLEEP = flags.is_sleeping
         can_collide = self._collision_check
+        new_contact = self.contact_pool(AABBContact)
         col_idx = 0
         objects = sorted(L, key=lambda obj: obj.xmin)
         self._data[:] = []
@@ -138,7 +156,7 @@ class BroadPhaseAABB(BroadPhase):
 
                 # Adiciona à lista de colisões grosseiras
                 col_idx += 1
-                self._data.append(AABBContact(A, B))
+                self._data.append(new_contact(A, B))
 
 
 class BroadPhaseCBB(BroadPhase):
@@ -150,6 +168,7 @@ class BroadPhaseCBB(BroadPhase):
 
     def update(self, L):
         can_collide = self._collision_check
+        new_contact = self.contact_pool(CBBContact)
         L = sorted(L, key=lambda obj: obj.pos.x - obj.cbb_radius)
         N = len(L)
         self._data[:] = []
@@ -175,7 +194,7 @@ class BroadPhaseCBB(BroadPhase):
                     continue
 
                 # Adiciona à lista de colisões grosseiras
-                self._data.append(CBBContact(A, B))
+                self._data.append(new_contact(A, B))
 
 
 class BroadPhaseMixed(BroadPhase):
@@ -188,6 +207,7 @@ class BroadPhaseMixed(BroadPhase):
     def update(self, L):
         IS_SLEEP = flags.is_sleeping
         can_collide = self._collision_check
+        new_contact = self.contact_pool(AABBContact)
         col_idx = 0
         objects = sorted(L, key=lambda obj: obj.pos.x - obj.cbb_radius)
         self._data[:] = []
@@ -224,7 +244,7 @@ class BroadPhaseMixed(BroadPhase):
                 # Adiciona à lista de colisões grosseiras
                 col_idx += 1
                 if has_overlap(A.aabb, B.aabb):
-                    self._data.append(AABBContact(A, B))
+                    self._data.append(new_contact(A, B))
 
 
 class NarrowPhase(AbstractCollisionPhase):
@@ -243,9 +263,13 @@ class NarrowPhase(AbstractCollisionPhase):
         # Detecta colisões e atualiza as listas internas de colisões de
         # cada objeto
         self._data = cols = []
+        if getattr(self.simulation, 'recycle_contacts', False):
+            collision_class = self.contact_pool(Collision)
+        else:
+            collision_class = Collision
 
         for A, B in broad_cols:
-            col = get_collision(A, B)
+            col = get_collision(A, B, collision_class=collision_class)
 
             if col is not None:
                 # A.add_contact(col)
@@ -4,7 +4,7 @@ from math import sqrt, pi
 
 from generic import generic
 
-from FGAme.mathtools import Vec2, asvector, ux2D
+from FGAme.mathtools import Vec2, asvector, ux2D, null2D
 from FGAme.physics import pre_collision_signal, post_collision_signal
 
 DEFAULT_DIRECTIONS = [ux2D.rotate(n * pi / 12) for n in
@@ -67,12 +67,20 @@ class Pair(object):
     A pair of physical objects.
     """
 
-    __slots__ = ('_A', '_B')
+    __slots__ = ('A', 'B')
 
     def __init__(self, A, B):
         self.A = A
         self.B = B
 
+    def reset(self, A, B):
+        """
+        Re-initialize a recycled pair with new objects.
+        """
+
+        self.A = A
+        self.B = B
+
     def __eq__(self, other):
         return self is other
 
@@ -167,6 +175,8 @@ class BroadContact(Pair):
     Objects are close to each other and might or might not be touching.
     """
 
+    __slots__ = ()
+
     def get_collision(self):
         """
         Return the collision object if there is superposition.
@@ -180,27 +190,55 @@ class CBBContact(BroadContact):
     Broad phase contact using circular bounding boxes.
     """
 
+    __slots__ = ()
+
 
 class AABBContact(BroadContact):
     """
     Broad phase contact using AABBs.
     """
 
+    __slots__ = ()
+
 
 class Collision(Pair):
     """
     Collision between two overlapping objects.
+
+    Simulations created with ``recycle_contacts=True`` reuse collision
+    objects in the next step: a collision is only valid until the end of the
+    step in which it was created and any reference kept after that will be
+    silently overwritten. Use col.copy() to keep a collision for longer.
+    Recycling is disabled by default.
     """
 
+    __slots__ = ('normal', 'pos', 'delta', 'restitution', 'friction',
+                 'impulse', 'active', 'simulation')
+
     def __init__(self, A, B, normal=None, pos=None, delta=0.0):
-        super(Collision, self).__init__(A, B)
-        self.normal = normal = asvector(normal)
-        self.pos = pos = asvector(pos)
-        self.delta = delta = float(delta)
-        self.restitution = sqrt(A.restitution * B.restitution)
-        self.friction = sqrt(A.friction * B.friction)
+        self.simulation = None
+        self.reset(A, B, normal, pos, delta)
+
+    def reset(self, A, B, normal=None, pos=None, delta=0.0):
+        """
+        Re-initialize a recycled collision object.
+        """
+
+        self.A = A
+        self.B = B
+        self.normal = normal if normal.__class__ is Vec2 else asvector(normal)
+        self.pos = pos if pos.__class__ is Vec2 else asvector(pos)
+        self.delta = float(delta)
+        self.impulse = null2D
         self.active = True
 
+        # Mixed coefficients. Most objects share the global coefficients of
+        # the simulation, hence we avoid the square roots when possible.
+        e_a, e_b = A.restitution, B.restitution
+        self.restitution = e_a if e_a == e_b else sqrt(e_a * e_b)
+        mu_a, mu_b = A.friction, B.friction
+        self.friction = mu_a if mu_a == mu_b else sqrt(mu_a * mu_b)
+
     def iswap(self):
         super().iswap()
         self.normal *= -1
@@ -244,6 +282,7 @@ class Collision(Pair):
             # Total impulse
             A.apply_impulse_at(Jvec, pos)
             B.apply_impulse_at(-Jvec, pos)
+            self.impulse = Jvec
 
     def __resolve_with_friction(self):
         """
@@ -353,6 +392,7 @@ class Collision(Pair):
             Jvec = Jn * normal + Jt * tangent
             A.apply_impulse_at(Jvec, pos=pos)
             B.apply_impulse_at(-Jvec, pos=pos)
+            self.impulse = Jvec
 
     def cancel(self):
         """
@@ -390,6 +430,46 @@ class Collision(Pair):
         if B.invmass:
             B.collisions.remove(self)
 
+    def pre_collision_batched(self, simulation=None, handlers=()):
+        """
+        Like pre_collision(), but used when the simulation delivers collision
+        events in batch.
+
+        The global pre-collision signal is not triggered. Only objects that
+        override the pre_collision() method and the given filtered handlers
+        are notified. Collisions are still tracked in obj.collisions.
+        """
+
+        A, B = self
+        if overrides_callback(A, 'pre_collision'):
+            A.pre_collision(self)
+        if overrides_callback(B, 'pre_collision'):
+            B.pre_collision(self)
+        for handler in handlers:
+            handler(simulation, self)
+        if self.active:
+            if A.invmass:
+                A.collisions.append(self)
+            if B.invmass:
+                B.collisions.append(self)
+
+    def post_collision_batched(self, simulation=None, handlers=()):
+        """
+        Batched counterpart of post_collision().
+        """
+
+        A, B = self
+        if overrides_callback(A, 'post_collision'):
+            A.post_collision(self)
+        if overrides_callback(B, 'post_collision'):
+            B.post_collision(self)
+        for handler in handlers:
+            handler(simulation, self)
+        if A.invmass:
+            A.collisions.remove(self)
+        if B.invmass:
+            B.collisions.remove(self)
+
     def is_simple(self):
         """
         Return True if the current collision is the only contact for both
@@ -444,6 +524,65 @@ class ContactOrdered(Collision):
         super(ContactOrdered, self).__init__(A, B, world, pos, normal, **kwds)
 
 
+_CALLBACK_CACHE = {}
+
+
+def overrides_callback(obj, name):
+    """
+    Return True if the class of obj overrides the given collision callback
+    method inherited from Particle.
+
+    Results are cached by class.
+    """
+
+    cls = type(obj)
+    try:
+        return _CALLBACK_CACHE[cls, name]
+    except KeyError:
+        from FGAme.physics.bodies.particle import Particle
+
+        result = getattr(cls, name) is not getattr(Particle, name)
+        _CALLBACK_CACHE[cls, name] = result
+        return result
+
+
+class ContactPool(object):
+    """
+    Recycles contact objects of a given class between simulation steps.
+
+    Calling the pool with the arguments of the contact constructor returns a
+    contact object, reusing one that was released in a previous step if
+    possible.
+    """
+
+    __slots__ = ('contact_class', '_free', '_used')
+
+    def __init__(self, contact_class):
+        self.contact_class = contact_class
+        self._free = []
+        self._used = []
+
+    def __call__(self, A, B, *args, **kwargs):
+        if self._free:
+            contact = self._free.pop()
+            contact.reset(A, B, *args, **kwargs)
+        else:
+            contact = self.contact_class(A, B, *args, **kwargs)
+        self._used.append(contact)
+        return contact
+
+    def __len__(self):
+        return len(self._free)
+
+    def recycle(self):
+        """
+        Mark all contacts created since the last call as free for reuse.
+        """
+
+        self._free.extend(self._used)
+        self._used.clear()
+
+
 class Island(object):
     def __init__(self, collisions):
         self.collisions = collisions
@@ -33,6 +33,7 @@ class PhysicsFlags:
     # Temporary state
     dirty_shape = 1 << next(N)
     dirty_aabb = 1 << next(N)
+    dirty_draw = 1 << next(N)
 
     # Visualization
     has_visualization = 1 << next(N)
@@ -45,8 +46,11 @@ class PhysicsFlags:
     del N
 
     # Derived flags
-    dirty_any = dirty_shape | dirty_aabb
+    dirty_moved = dirty_aabb | dirty_draw
+    dirty_any = dirty_shape | dirty_aabb | dirty_draw
     not_dirty = full ^ dirty_any
+    not_dirty_aabb = full ^ dirty_aabb
+    not_dirty_draw = full ^ dirty_draw
 
 
 flags = PhysicsFlags()
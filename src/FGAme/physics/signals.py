@@ -11,6 +11,11 @@ post_collision_signal = global_signal(
     help_text='Like pre-collision, but it is triggered just *after* collision '
               'is resolved.'
 )
+collisions_signal = global_signal(
+    'collisions', ['simulation'], ['cols'],
+    help_text='Triggered once per step with the list of resolved collisions '
+              'when the simulation uses batched collision events.'
+)
 object_added_signal = global_signal(
     'object-added', ['simulation', 'object'], [],
     help_text='Triggered when an object is added to the simulation.'
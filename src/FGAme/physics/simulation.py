@@ -1,11 +1,16 @@
-from collections import defaultdict
+from collections import defaultdict, Counter
+from itertools import chain
+from math import ceil
 
-from FGAme.mathtools import Vec2, null2D
+from FGAme.mathtools import null2D
 from FGAme.physics import flags
 from FGAme.physics.broadphase import BroadPhase, BroadPhaseCBB, NarrowPhase
-from FGAme.physics.signals import object_removed_signal, \
+from FGAme.physics.utils import GlobalParameters, normalize_gravity
+from FGAme.utils import IndexedList
+from FGAme.physics.signals import object_removed_signal, collisions_signal, \
     gravity_changed_signal, damping_changed_signal, adamping_changed_signal, \
-    friction_changed_signal, restitution_changed_signal
+    friction_changed_signal, restitution_changed_signal, \
+    pre_collision_signal, post_collision_signal
 
 
 class Simulation:
@@ -14,84 +19,57 @@ class Simulation:
     solve their time evolution.
     """
 
-    # Physical properties and global forces
+    # Physical properties and global forces. Objects read these values from
+    # the shared GlobalParameters instance, unless they own a local value.
     @property
     def gravity(self):
-        return self._gravity
+        return self._globals.gravity
 
     @gravity.setter
     def gravity(self, value):
-        owns_prop = flags.owns_gravity
-        old = self._gravity
-        try:
-            gravity = self._gravity = Vec2(*value)
-        except TypeError:
-            gravity = self._gravity = Vec2(0, -value)
-
-        for obj in self._objects:
-            if not obj.flags & owns_prop:
-                obj._gravity = gravity
-                gravity_changed_signal.trigger(self, old, self._gravity)
+        old = self._globals.gravity
+        new = self._globals.gravity = normalize_gravity(value)
+        gravity_changed_signal.trigger(self, old, new)
 
     @property
     def damping(self):
-        return self._damping
+        return self._globals.damping
 
     @damping.setter
     def damping(self, value):
-        owns_prop = flags.owns_damping
-        old = self._damping
-        value = self._damping = float(value)
-
-        for obj in self._objects:
-            if not obj.flags & owns_prop:
-                obj._damping = value
-                damping_changed_signal.trigger(self, old, self._damping)
+        old = self._globals.damping
+        new = self._globals.damping = float(value)
+        damping_changed_signal.trigger(self, old, new)
 
     @property
     def adamping(self):
-        return self._adamping
+        return self._globals.adamping
 
     @adamping.setter
     def adamping(self, value):
-        owns_prop = flags.owns_adamping
-        old = self._adamping
-        value = self._adamping = float(value)
-
-        for obj in self._objects:
-            if not obj.flags & owns_prop:
-                obj._adamping = value
-                adamping_changed_signal.trigger(self, old, self._adamping)
+        old = self._globals.adamping
+        new = self._globals.adamping = float(value)
+        adamping_changed_signal.trigger(self, old, new)
 
     @property
     def restitution(self):
-        return self._restitution
+        return self._globals.restitution
 
     @restitution.setter
     def restitution(self, value):
-        owns_prop = flags.owns_restitution
-        old = self._restitution
-        value = self._restitution = float(value)
-
-        for obj in self._objects:
-            if not obj.flags & owns_prop:
-                obj._restitution = value
-                restitution_changed_signal.trigger(self, old, self._restitution)
+        old = self._globals.restitution
+        new = self._globals.restitution = float(value)
+        restitution_changed_signal.trigger(self, old, new)
 
     @property
     def friction(self):
-        return self._friction
+        return self._globals.friction
 
     @friction.setter
     def friction(self, value):
-        owns_prop = flags.owns_friction
-        old = self._friction
-        value = self._friction = float(value)
-
-        for obj in self._objects:
-            if not obj.flags & owns_prop:
-                obj._friction = value
-                friction_changed_signal.trigger(self, old, self._friction)
+        old = self._globals.friction
+        new = self._globals.friction = float(value)
+        friction_changed_signal.trigger(self, old, new)
 
     def __init__(self,
                  gravity=None,
@@ -100,16 +78,22 @@ class Simulation:
                  sleep_speed=3, sleep_angular_speed=0.05, max_speed=None,
                  bounds=None, broad_phase=None,
                  niter=5, beta=0.0,
-                 collision_check=None):
+                 collision_check=None, recycle_contacts=False,
+                 batch_collisions=False,
+                 adaptive=False, max_substeps=8, max_displacement=0.5,
+                 max_penetration=2.0, max_energy_drift=None,
+                 substep_hysteresis=15):
 
         super(Simulation, self).__init__()
 
         # Objects and constraints
-        self._objects = []
+        self._objects = IndexedList()
         self._constraints = []
         self._contacts = []
-        self._active = []
-        self._inactive = []
+        self._tilegrids = []
+        self._grid_contacts = []
+        self._active = IndexedList()
+        self._inactive = IndexedList()
 
         # Solver parameters
         self.niter = niter
@@ -119,6 +103,8 @@ class Simulation:
 
         # Collision detection algorithms
         self.collision_check = collision_check or can_collide
+        self.recycle_contacts = recycle_contacts
+        self.batch_collisions = batch_collisions
         self.broad_phase = normalize_broad_phase(broad_phase, self)
         self.narrow_phase = NarrowPhase(simulation=self)
 
@@ -126,14 +112,13 @@ class Simulation:
         self._kinetic0 = None
         self._potential0 = None
         self._interaction0 = None
-        self._gravity = null2D
-        self._damping = self._adamping = self._friction = 0
-        self._restitution = 1
-        self.gravity = gravity or (0, 0)
-        self.damping = damping
-        self.adamping = adamping
-        self.restitution = restitution
-        self.friction = friction
+        self._globals = GlobalParameters(
+            gravity=gravity or (0, 0),
+            damping=damping,
+            adamping=adamping,
+            restitution=restitution,
+            friction=friction,
+        )
         self.max_speed = max_speed
 
         # Bounds
@@ -144,6 +129,18 @@ class Simulation:
         self.num_steps = 0
         self.time = 0
 
+        # Adaptive sub-stepping
+        self.adaptive = adaptive
+        self.max_substeps = max_substeps
+        self.max_displacement = max_displacement
+        self.max_penetration = max_penetration
+        self.max_energy_drift = max_energy_drift
+        self.substep_hysteresis = substep_hysteresis
+        self.num_substeps = 1
+        self.substep_histogram = Counter()
+        self._substep_calm_frames = 0
+        self._last_energy_ratio = None
+
     def __iter__(self):
         return iter(self._objects)
 
@@ -156,9 +153,18 @@ class Simulation:
         Adds new physical object to the simulation.
         """
 
-        if obj not in self._objects:
-            self._objects.append(obj)
-            self._active.append(obj)
+        if self._objects.add(obj):
+            self._active.add(obj)
+            obj.set_simulation(self)
+
+    def add_many(self, objects):
+        """
+        Adds a sequence of physical objects to the simulation.
+        """
+
+        objects = self._objects.add_many(objects)
+        self._active.add_many(objects)
+        for obj in objects:
             obj.set_simulation(self)
 
     def remove(self, obj):
@@ -168,21 +174,26 @@ class Simulation:
         Raises ValueError() of object is not present in the simulation.
         """
 
-        try:
-            idx = self._objects.index(obj)
-        except IndexError:
-            raise ValueError('object not present')
-        else:
-            del self._objects[idx]
-            for L in self._active, self._inactive:
-                try:
-                    L.remove(obj)
-                except ValueError:
-                    pass
-            object_removed_signal.trigger(self, obj)
-
+        self._objects.remove(obj)
+        self._active.discard(obj)
+        self._inactive.discard(obj)
+        object_removed_signal.trigger(self, obj)
         obj._simulation = None
 
+    def remove_many(self, objects):
+        """
+        Remove a sequence of objects from simulation in a single pass.
+
+        Objects that are not present in the simulation are ignored.
+        """
+
+        removed = self._objects.remove_many(objects)
+        self._active.remove_many(removed)
+        self._inactive.remove_many(removed)
+        for obj in removed:
+            object_removed_signal.trigger(self, obj)
+            obj._simulation = None
+
     def discard(self, obj):
         """
         Discard object, if present.
@@ -193,8 +204,45 @@ class Simulation:
         except ValueError:
             pass
 
+    def add_tilegrid(self, grid):
+        """
+        Adds a static TileGrid collision layer to the simulation.
+        """
+
+        if grid not in self._tilegrids:
+            self._tilegrids.append(grid)
+
+    def remove_tilegrid(self, grid):
+        """
+        Remove TileGrid from simulation.
+        """
+
+        self._tilegrids.remove(grid)
+        self._grid_contacts = []
+
     # Simulation
     def update(self, dt):
+        """
+        Advance simulation by a frame of duration dt.
+
+        If adaptive sub-stepping is enabled, the frame may be split in a few
+        smaller steps of equal duration. The number of sub-steps used in the
+        last frame is saved in the ``num_substeps`` attribute and the
+        ``substep_histogram`` counter records how many frames used each
+        sub-step count.
+        """
+
+        dt = float(dt)
+        if self.adaptive:
+            num_substeps = self.adapt_substeps(dt)
+            self.substep_histogram[num_substeps] += 1
+            sub_dt = dt / num_substeps
+            for _ in range(num_substeps):
+                self.step(sub_dt)
+        else:
+            self.step(dt)
+
+    def step(self, dt):
         """
         Main iteration step.
         """
@@ -220,6 +268,66 @@ class Simulation:
         self.time += dt
         self.num_steps += 1
 
+    def adapt_substeps(self, dt):
+        """
+        Choose the number of sub-steps for the next frame of duration dt.
+
+        The estimate considers the largest displacement of a body relative to
+        its size, the deepest penetration found in the last step and,
+        optionally, the drift in the energy ratio between two frames. Increases
+        take effect immediately, but the number of sub-steps is decremented
+        only after ``substep_hysteresis`` consecutive calm frames in order to
+        prevent oscillations.
+        """
+
+        IS_SLEEP = flags.is_sleeping
+        current = self.num_substeps
+
+        # Displacement relative to body size
+        ratio = 0.0
+        for obj in self._active:
+            if obj.flags & IS_SLEEP or not obj._invmass:
+                continue
+            radius = obj.cbb_radius
+            if radius:
+                ratio = max(ratio, obj._vel.norm() / radius)
+        required = ceil(ratio * dt / self.max_displacement)
+
+        # Penetration depth in the previous step
+        max_penetration = self.max_penetration
+        if max_penetration:
+            contacts = chain(self.narrow_phase, self._grid_contacts)
+            delta = max((col.delta for col in contacts), default=0.0)
+            required = max(required, ceil(current * delta / max_penetration))
+
+        # Energy drift between frames
+        if self.max_energy_drift is not None:
+            try:
+                energy_ratio = self.energy_ratio()
+            except ZeroDivisionError:
+                energy_ratio = 1.0
+            last, self._last_energy_ratio = \
+                self._last_energy_ratio, energy_ratio
+            if last is not None and \
+                    abs(energy_ratio - last) > self.max_energy_drift:
+                required = max(required, current + 1)
+
+        # Hysteresis
+        required = min(max(required, 1), self.max_substeps)
+        if required > current:
+            self._substep_calm_frames = 0
+            current = required
+        elif required < current:
+            self._substep_calm_frames += 1
+            if self._substep_calm_frames >= self.substep_hysteresis:
+                self._substep_calm_frames = 0
+                current -= 1
+        else:
+            self._substep_calm_frames = 0
+
+        self.num_substeps = current
+        return current
+
     def accumulate_accelerations(self, dt):
         """
         Update the acceleration state due to external forces and torques for all
@@ -290,6 +398,13 @@ class Simulation:
 
         broad_cols = self.broad_phase(self._objects)
         narrow_cols = self.narrow_phase(broad_cols)
+        if self._tilegrids:
+            grid_cols = self._grid_contacts = []
+            for grid in self._tilegrids:
+                grid_cols.extend(grid.collisions(self._objects, self))
+            narrow_cols = list(narrow_cols) + grid_cols
+        if self.batch_collisions:
+            return self.resolve_collisions_batched(narrow_cols)
 
         # Resolve collisions
         for col in narrow_cols:
@@ -308,6 +423,37 @@ class Simulation:
             if col.active:
                 col.post_collision(self)
 
+    def resolve_collisions_batched(self, cols):
+        """
+        Resolve collisions delivering all events at once.
+
+        Instead of triggering the pre-collision and post-collision signals for
+        each contact, the list of active collisions is passed to the
+        "collisions" signal once per step. Objects that override the
+        pre_collision()/post_collision() methods and handlers filtered on this
+        simulation (e.g., obj.listen('pre-collision')) are still notified for
+        each contact.
+        """
+
+        pre_handlers = pre_collision_signal.filtered_handlers(self)
+        post_handlers = post_collision_signal.filtered_handlers(self)
+        for col in cols:
+            col.pre_collision_batched(self, pre_handlers)
+            if col.active:
+                col.resolve()
+
+        # Baumgarte stabilization
+        beta = self.beta
+        active = [col for col in cols if col.active]
+        for col in active:
+            col.baumgarte(beta)
+
+        # Post-collision callbacks and batched signal
+        for col in active:
+            col.post_collision_batched(self, post_handlers)
+        if active:
+            collisions_signal.trigger(self, active)
+
     def get_islands(self, contacts):
         """
         Return list of closed collision groups in the collision graph.
@@ -0,0 +1,210 @@
+from math import floor
+
+from FGAme.mathtools import Vec2
+from FGAme.physics.bodies.aabb import AABB
+from FGAme.physics.collision import Collision, ContactPool, get_collision
+from FGAme.physics.flags import flags
+
+
+class TileGrid(object):
+    """
+    Static collision layer made of solid cells in a regular grid.
+
+    Solidity is stored in a 2D array of bytes. Each step, dynamic bodies are
+    tested only against the cells covered by their bounding boxes, so the cost
+    per body does not depend on the number of tiles. Cells do not enter the
+    broad phase.
+
+    Contacts between AABBs and cells only use faces that are not covered by a
+    neighboring solid cell. Bodies sliding over a row of tiles thus never
+    catch on the internal edges between cells.
+
+    Args:
+        shape:
+            (width, height) of each cell.
+        num_cols, num_rows (int):
+            Grid dimensions. Cells outside the grid are empty.
+        origin:
+            Position of the bottom-left corner of cell (0, 0).
+        restitution, friction:
+            Coefficients used in contacts with the grid. Defaults to the
+            simulation's global values.
+
+    Example:
+        >>> grid = TileGrid((10, 10), 4, 2)
+        >>> grid[0, 0] = grid[1, 0] = True
+        >>> grid.cell_at((15, 5)), grid[1, 0], grid[2, 0]
+        ((1, 0), True, False)
+    """
+
+    def __init__(self, shape, num_cols, num_rows, origin=(0, 0),
+                 restitution=None, friction=None):
+        self.cell_width, self.cell_height = map(float, shape)
+        self.num_cols = num_cols
+        self.num_rows = num_rows
+        self.origin = Vec2(*origin)
+        self.restitution = restitution
+        self.friction = friction
+        self._rows = [bytearray(num_cols) for _ in range(num_rows)]
+        self._bodies = {}
+        self._pool = ContactPool(Collision)
+
+    @classmethod
+    def from_cells(cls, cells, shape, origin=(0, 0), **kwargs):
+        """
+        Create a grid just large enough to hold the given (i, j) solid cells.
+
+        Origin is the position of the bottom-left corner of cell (0, 0). The
+        cells of the new grid are shifted so that the first row and column
+        are not empty.
+        """
+
+        cells = list(cells)
+        if not cells:
+            return cls(shape, 0, 0, origin, **kwargs)
+        imin = min(i for i, _ in cells)
+        jmin = min(j for _, j in cells)
+        num_cols = max(i for i, _ in cells) - imin + 1
+        num_rows = max(j for _, j in cells) - jmin + 1
+        x0, y0 = origin
+        dx, dy = shape
+        grid = cls(shape, num_cols, num_rows,
+                   (x0 + imin * dx, y0 + jmin * dy), **kwargs)
+        for i, j in cells:
+            grid._rows[j - jmin][i - imin] = 1
+        return grid
+
+    def __getitem__(self, ij):
+        i, j = ij
+        if 0 <= i < self.num_cols and 0 <= j < self.num_rows:
+            return bool(self._rows[j][i])
+        return False
+
+    def __setitem__(self, ij, value):
+        i, j = ij
+        if not (0 <= i < self.num_cols and 0 <= j < self.num_rows):
+            raise IndexError('cell %r is outside the grid' % (ij,))
+        self._rows[j][i] = bool(value)
+
+    def __len__(self):
+        return sum(sum(row) for row in self._rows)
+
+    def cell_at(self, pos):
+        """
+        Return the (i, j) indexes of the cell containing the given point.
+        """
+
+        x, y = pos
+        return (int(floor((x - self.origin.x) / self.cell_width)),
+                int(floor((y - self.origin.y) / self.cell_height)))
+
+    def cell_rect(self, i, j):
+        """
+        Return the (xmin, xmax, ymin, ymax) coordinates of cell (i, j).
+        """
+
+        xmin = self.origin.x + i * self.cell_width
+        ymin = self.origin.y + j * self.cell_height
+        return xmin, xmin + self.cell_width, ymin, ymin + self.cell_height
+
+    def solid_cells(self, xmin, xmax, ymin, ymax):
+        """
+        Iterate over the (i, j) indexes of all solid cells that touch the
+        given rectangle.
+        """
+
+        imin, jmin = self.cell_at((xmin, ymin))
+        imax, jmax = self.cell_at((xmax, ymax))
+        imin, jmin = max(imin, 0), max(jmin, 0)
+        imax = min(imax, self.num_cols - 1)
+        jmax = min(jmax, self.num_rows - 1)
+        rows = self._rows
+        for j in range(jmin, jmax + 1):
+            row = rows[j]
+            for i in range(imin, imax + 1):
+                if row[i]:
+                    yield i, j
+
+    def cell_body(self, i, j):
+        """
+        Return a static AABB body for cell (i, j).
+
+        Bodies are created on demand and reused in the following steps. They
+        are never added to the simulation and are only used as the static
+        member of contacts.
+        """
+
+        try:
+            return self._bodies[i, j]
+        except KeyError:
+            pass
+        body = AABB(*self.cell_rect(i, j), mass='inf')
+        if self.restitution is not None:
+            body.restitution = self.restitution
+        if self.friction is not None:
+            body.friction = self.friction
+        self._bodies[i, j] = body
+        return body
+
+    def collisions(self, objects, simulation=None):
+        """
+        Return a list of collisions between the given objects and the grid.
+
+        Static and sleeping objects are ignored. If the simulation was
+        created with ``recycle_contacts=True``, collisions are recycled in the
+        next call.
+        """
+
+        if getattr(simulation, 'recycle_contacts', False):
+            new_contact = self._pool
+            new_contact.recycle()
+        else:
+            new_contact = Collision
+        check = getattr(simulation, 'collision_check', None)
+        params = getattr(simulation, '_globals', None)
+        skip = flags.is_sleeping
+        cols = []
+
+        for obj in objects:
+            if not obj._invmass or obj.flags & skip:
+                continue
+            is_aabb = isinstance(obj, AABB)
+            aabb = obj.aabb
+            for i, j in self.solid_cells(aabb.xmin, aabb.xmax,
+                                         aabb.ymin, aabb.ymax):
+                cell = self.cell_body(i, j)
+                if params is not None:
+                    cell._globals = params
+                if check is not None and not check(cell, obj):
+                    continue
+                if is_aabb:
+                    col = self._aabb_contact(i, j, cell, obj, new_contact)
+                else:
+                    col = get_collision(cell, obj, collision_class=new_contact)
+                if col is not None:
+                    col.simulation = simulation
+                    cols.append(col)
+        return cols
+
+    def _aabb_contact(self, i, j, cell, obj, collision_class):
+        # Collision between a cell and an AABB that ignores faces covered by
+        # solid neighbors.
+        x0, x1 = max(cell.xmin, obj.xmin), min(cell.xmax, obj.xmax)
+        y0, y1 = max(cell.ymin, obj.ymin), min(cell.ymax, obj.ymax)
+        if x1 < x0 or y1 < y0:
+            return None
+
+        best = None
+        for di, dj, delta in [(0, 1, cell.ymax - obj.ymin),
+                              (0, -1, obj.ymax - cell.ymin),
+                              (1, 0, cell.xmax - obj.xmin),
+                              (-1, 0, obj.xmax - cell.xmin)]:
+            if (best is None or delta < best[2]) and not self[i + di, j + dj]:
+                best = (di, dj, delta)
+        if best is None:
+            return None
+
+        di, dj, delta = best
+        pos = Vec2((x1 + x0) / 2, (y1 + y0) / 2)
+        return collision_class(cell, obj, pos=pos, normal=Vec2(di, dj),
+                               delta=delta)
@@ -1,4 +1,4 @@
-from FGAme.mathtools import null2D
+from FGAme.mathtools import null2D, Vec2
 from FGAme.physics import flags
 
 
@@ -155,4 +155,45 @@ def safe_div(x, y):
         return INF
 
 
-INF = float('inf')
\ No newline at end of file
+INF = float('inf')
+
+def normalize_gravity(value):
+    """
+    Normalize gravity to a Vec2 value.
+
+    Scalars are interpreted as the intensity of a downwards acceleration.
+    """
+
+    try:
+        return Vec2(*value)
+    except TypeError:
+        return Vec2(0, -value)
+
+
+class GlobalParameters:
+    """
+    Physical parameters shared by all objects in a simulation.
+
+    Objects read these values unless they own a local value (i.e., the
+    corresponding owns_* flag is set). Changing a global parameter thus costs
+    O(1) regardless of the number of objects.
+    """
+
+    __slots__ = ('gravity', 'damping', 'adamping', 'restitution', 'friction')
+
+    def __init__(self, gravity=null2D, damping=0.0, adamping=0.0,
+                 restitution=1.0, friction=0.0):
+        self.gravity = normalize_gravity(gravity)
+        self.damping = float(damping)
+        self.adamping = float(adamping)
+        self.restitution = float(restitution)
+        self.friction = float(friction)
+
+    def __repr__(self):
+        tname = type(self).__name__
+        data = ', '.join('%s=%r' % (k, getattr(self, k)) for k in
+                         self.__slots__)
+        return '%s(%s)' % (tname, data)
+
+
+DEFAULT_PARAMETERS = GlobalParameters()
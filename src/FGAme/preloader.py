@@ -0,0 +1,187 @@
+"""
+Background loading of images and sounds.
+
+Decoding assets is slow and, if done on demand, stalls the frame in which an
+asset is first used. The :class:`Preloader` decodes assets on a pool of worker
+threads and hands the results to the texture and sound caches from the main
+thread, at the beginning of each frame.
+"""
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from FGAme.signals import global_signal
+
+preload_progress_signal = global_signal(
+    'preload-progress', ['preloader'], ['done', 'total'],
+    help_text='Triggered each time a preloaded asset becomes available.'
+)
+preload_finished_signal = global_signal(
+    'preload-finished', ['preloader'],
+    help_text='Triggered when all assets of a preloader are available.'
+)
+
+
+class Preloader:
+    """
+    Loads images and sounds on a thread pool.
+
+    Args:
+        images:
+            List of image names or paths.
+        sounds:
+            List of sound effect names.
+        manifest:
+            A dictionary or the path to a JSON file with "images" and "sounds"
+            lists.
+        max_workers (int):
+            Number of worker threads.
+
+    Example:
+        >>> loader = Preloader(images=['hero', 'tiles'])       # doctest: +SKIP
+        >>> loader.start()                                     # doctest: +SKIP
+
+    After start(), the preloader polls finished jobs at the beginning of each
+    frame of the main loop. Ready assets are inserted in the caches used by
+    :func:`FGAme.draw.get_texture` and :class:`FGAme.sound.SFX`, and the
+    "preload-progress" and "preload-finished" signals are triggered. Decoding
+    errors are stored in the ``errors`` dictionary and do not interrupt the
+    remaining jobs.
+    """
+
+    def __init__(self, images=(), sounds=(), manifest=None, max_workers=4):
+        self.max_workers = max_workers
+        self.images = list(images)
+        self.sounds = list(sounds)
+        self.results = {}
+        self.errors = {}
+        self.done = 0
+        self.total = 0
+        self._pending = []
+        self._executor = None
+        self._handler = None
+        if manifest is not None:
+            self.add_manifest(manifest)
+
+    @property
+    def progress(self):
+        """
+        Fraction of jobs that have finished (between 0 and 1).
+        """
+
+        return self.done / self.total if self.total else 1.0
+
+    @property
+    def is_done(self):
+        """
+        True if all scheduled jobs finished and were processed.
+        """
+
+        return not self._pending and self._executor is None
+
+    def add_manifest(self, manifest):
+        """
+        Add all images and sounds from a manifest.
+        """
+
+        if isinstance(manifest, str):
+            with open(manifest) as F:
+                manifest = json.load(F)
+        self.images.extend(manifest.get('images', ()))
+        self.sounds.extend(manifest.get('sounds', ()))
+
+    def start(self):
+        """
+        Start loading all assets in background.
+
+        Asset paths are resolved on the calling thread, so start() must be
+        called from the main thread.
+        """
+
+        from FGAme.draw.image import Texture
+        from FGAme.mainloop import frame_enter_signal
+        from FGAme.sound import SFX, get_pygame_sound
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self.max_workers)
+        submit = self._executor.submit
+
+        for name in self.images:
+            future = submit(Texture, name)
+            self._pending.append(('image', name, future))
+        self.images = []
+
+        if self.sounds:
+            SFX.init()
+        for name in self.sounds:
+            sfx = SFX(name)
+            path = sfx.path if sfx.entry is None else sfx.entry
+            future = submit(get_pygame_sound, path, cache=False)
+            self._pending.append(('sound', path, future))
+        self.sounds = []
+
+        self.total = self.done + len(self._pending)
+        if self._handler is None:
+            self._handler = frame_enter_signal.connect(self.poll)
+        return self
+
+    def poll(self):
+        """
+        Process finished jobs. Never blocks.
+        """
+
+        pending = []
+        for job in self._pending:
+            if job[2].done():
+                self._install(*job)
+            else:
+                pending.append(job)
+        self._pending = pending
+        if not pending and self._executor is not None:
+            self._finish()
+
+    def wait(self, timeout=None):
+        """
+        Block until all jobs are finished and process them.
+        """
+
+        for kind, key, future in self._pending:
+            try:
+                future.result(timeout)
+            except Exception:
+                pass
+        self.poll()
+
+    def _install(self, kind, key, future):
+        from FGAme.draw.image import texture_cache
+        from FGAme.sound import set_pygame_sound
+
+        try:
+            value = future.result()
+        except Exception as ex:
+            self.errors[key] = ex
+        else:
+            if kind == 'image':
+                value = texture_cache.get(key, lambda: value)
+            else:
+                value = set_pygame_sound(key, value)
+            self.results[key] = value
+        self.done += 1
+        preload_progress_signal.trigger(self, self.done, self.total)
+
+    def _finish(self):
+        self._executor.shutdown(wait=False)
+        self._executor = None
+        if self._handler is not None:
+            self._handler.disconnect()
+            self._handler = None
+        preload_finished_signal.trigger(self)
+
+
+def preload(images=(), sounds=(), manifest=None, max_workers=4):
+    """
+    Create a Preloader and start loading the given assets in background.
+    """
+
+    loader = Preloader(images, sounds, manifest, max_workers)
+    return loader.start()
@@ -97,12 +97,13 @@ class ResourceManager(object):
         compatível com o valor fornecido
         '''
 
+        from FGAme.asset import get_index
+
         root = self.get_root()
-        root_size = len(root) + 1
-        for ext in priorities:
-            path = os.path.join(root, name + ext)
-            if os.path.exists(path):
-                return path[root_size:]
+        index = get_index(root)
+        path = index.lookup(name, priorities or [''])
+        if path is not None:
+            return os.path.relpath(path, index.root)
         raise RuntimeError('could not find %s' % os.path.join(root, name))
 
     def find_image(self, name):
@@ -1,6 +1,5 @@
 from contextlib import contextmanager
 
-import smallshapes.segment
 from FGAme.draw import colorproperty, Color
 from FGAme.mathtools import Vec2, asvector, shapes
 from FGAme.utils import delegate_to, accept_vec_args, caching_proxy_factory
@@ -27,6 +26,10 @@ class Screen(object):
     draw_ray = delegate_to('camera')
     draw_line = delegate_to('camera')
     draw_image = delegate_to('camera')
+    draw_texture = delegate_to('camera')
+    draw_circles = delegate_to('camera')
+    draw_aabbs = delegate_to('camera')
+    draw_polys = delegate_to('camera')
 
     @property
     def shape(self):
@@ -92,13 +95,55 @@ class Camera:
     world coordinates.
     """
 
-    def __init__(self, canvas, displacement=(0, 0), scale=1, rotation=0):
+    supports_batching = True
+    clip = None
+
+    def __init__(self, canvas, displacement=(0, 0), scale=1, rotation=0,
+                 cull_margin=0):
         if scale != 1 or rotation != 0:
             raise ValueError('rotations and rescaling are not supported')
 
         self.displacement = asvector(displacement)
         self.canvas = canvas
-        self._passthru = True
+        self.scale = scale
+        self.cull_margin = cull_margin
+        self._passthru = self.displacement == (0, 0)
+
+        # Scratch shapes that receive the transformed coordinates before
+        # being passed to the canvas. This avoids allocating a new shape for
+        # each object drawn on each frame.
+        self._circle = shapes.mCircle(0, (0, 0))
+        self._aabb = shapes.mAABB(0, 0, 0, 0)
+        self._segment = shapes.mSegment((0, 0), (1, 0))
+
+    def _transform_circle(self, circle):
+        dx, dy = self.displacement
+        scratch = self._circle
+        scratch.radius = circle.radius
+        scratch.pos = (circle.x + dx, circle.y + dy)
+        return scratch
+
+    def _transform_aabb(self, aabb):
+        dx, dy = self.displacement
+        scratch = self._aabb
+        scratch.xmin = aabb.xmin + dx
+        scratch.xmax = aabb.xmax + dx
+        scratch.ymin = aabb.ymin + dy
+        scratch.ymax = aabb.ymax + dy
+        return scratch
+
+    def _transform_poly(self, poly):
+        # Polygons have a variable number of vertices and cannot be resized
+        # in place, hence a new shape is created
+        dx, dy = self.displacement
+        return shapes.mPoly(*[(x + dx, y + dy) for (x, y) in poly])
+
+    def _transform_segment(self, start, end):
+        dx, dy = self.displacement
+        scratch = self._segment
+        scratch.start = (start[0] + dx, start[1] + dy)
+        scratch.end = (end[0] + dx, end[1] + dy)
+        return scratch
 
     @accept_vec_args
     def pan(self, vec):
@@ -157,13 +202,52 @@ class Camera:
     def xmax(self):
         return -self.displacement.x + self.width
 
+    @property
+    def ymin(self):
+        return -self.displacement.y
+
+    @property
+    def ymax(self):
+        return -self.displacement.y + self.height
+
+    def viewport(self):
+        """
+        Return the (xmin, xmax, ymin, ymax) coordinates of the visible region
+        in world coordinates.
+
+        The region is enlarged by cull_margin pixels in each direction. If the
+        clip attribute is set to a (xmin, xmax, ymin, ymax) rectangle, return
+        it instead.
+        """
+
+        if self.clip is not None:
+            return self.clip
+        x, y = self.displacement
+        margin = self.cull_margin
+        return (-x - margin, -x + self.width + margin,
+                -y - margin, -y + self.height + margin)
+
+    def is_visible(self, obj):
+        """
+        Return True if the bounding box of object intersects the viewport.
+
+        Objects that do not define a bounding box are always visible.
+        """
+
+        xmin, xmax, ymin, ymax = self.viewport()
+        try:
+            return not (obj.xmax < xmin or obj.xmin > xmax or
+                        obj.ymax < ymin or obj.ymin > ymax)
+        except AttributeError:
+            return True
+
     def draw_circle(self, circle, fillcolor=None, linecolor=None, linewidth=1):
         """
         Draw a circle on screen.
         """
 
         if not self._passthru:
-            circle = circle.move(self.displacement)
+            circle = self._transform_circle(circle)
 
         if fillcolor is not None:
             self.canvas.raw_circle_solid(circle, fillcolor)
@@ -176,7 +260,7 @@ class Camera:
         """
 
         if not self._passthru:
-            aabb = aabb.move(self.displacement)
+            aabb = self._transform_aabb(aabb)
 
         if fillcolor is not None:
             self.canvas.raw_aabb_solid(aabb, fillcolor)
@@ -189,20 +273,88 @@ class Camera:
         """
 
         if not self._passthru:
-            poly = poly.move(self.displacement)
+            poly = self._transform_poly(poly)
 
         if fillcolor is not None:
             self.canvas.raw_poly_solid(poly, fillcolor)
         if linecolor is not None and linewidth:
             self.canvas.raw_poly_border(poly, linewidth, linecolor)
 
+    def draw_circles(self, centers, radii, fillcolors):
+        """
+        Draw many solid circles in a single call.
+
+        Args:
+            centers: sequence of (x, y) positions.
+            radii: sequence of radii.
+            fillcolors: sequence of colors.
+        """
+
+        if not self._passthru:
+            dx, dy = self.displacement
+            centers = [(x + dx, y + dy) for (x, y) in centers]
+        self.canvas.raw_circles_solid(centers, radii, fillcolors)
+
+    def draw_aabbs(self, aabbs, fillcolors):
+        """
+        Draw many solid axis aligned rectangles in a single call.
+
+        Args:
+            aabbs: sequence of (xmin, xmax, ymin, ymax) tuples.
+            fillcolors: sequence of colors.
+        """
+
+        if not self._passthru:
+            dx, dy = self.displacement
+            aabbs = [(xmin + dx, xmax + dx, ymin + dy, ymax + dy)
+                     for (xmin, xmax, ymin, ymax) in aabbs]
+        self.canvas.raw_aabbs_solid(aabbs, fillcolors)
+
+    def draw_polys(self, polys, fillcolors):
+        """
+        Draw many solid polygons in a single call.
+
+        Args:
+            polys: sequence of vertex lists.
+            fillcolors: sequence of colors.
+        """
+
+        if not self._passthru:
+            dx, dy = self.displacement
+            polys = [[(x + dx, y + dy) for (x, y) in poly] for poly in polys]
+        self.canvas.raw_polys_solid(polys, fillcolors)
+
+    def render_offscreen(self, pos, shape, draw_func):
+        """
+        Render the region with lower left corner at pos (in world coordinates)
+        and the given shape into an off-screen buffer.
+
+        The draw_func(camera) function receives a camera that maps the region
+        to the buffer. Return a backend specific handle that can be passed to
+        draw_cached() or None if the backend does not support off-screen
+        rendering.
+        """
+
+        camera = Camera(self.canvas, displacement=(-pos[0], -pos[1]))
+        return self.canvas.raw_render_offscreen(shape,
+                                                lambda: draw_func(camera))
+
+    def draw_cached(self, handle, xmin, ymin):
+        """
+        Draw a buffer created by render_offscreen() with its lower left corner
+        at the given position.
+        """
+
+        dx, dy = self.displacement
+        self.canvas.raw_offscreen(handle, (xmin + dx, ymin + dy))
+
     def draw_segment(self, segment, linecolor=black, linewidth=1):
         """
         Draw a line segment on screen.
         """
 
         if not self._passthru:
-            segment = segment.move(self.displacement)
+            segment = self._transform_segment(segment.start, segment.end)
 
         if linecolor is not None and linewidth:
             self.canvas.raw_segment(segment, linewidth, linecolor)
@@ -226,24 +378,44 @@ class Camera:
         Draw an (possibly open) path on screen.
         """
 
-        if not self._passthru:
-            path = path.move(self.displacement)
-
         points = iter(path)
         pt0 = next(points)
+        if self._passthru:
+            dx = dy = 0
+        else:
+            dx, dy = self.displacement
+
+        # Segments are written into a scratch shape instead of creating a new
+        # Segment for each edge
+        segment = self._segment
+        raw_segment = self.canvas.raw_segment
+        segment.start = (pt0[0] + dx, pt0[1] + dy)
         for pt1 in points:
-            self.canvas.raw_segment(smallshapes.segment.Segment(pt0, pt1), linewidth,
-                                    linecolor)
-            pt0 = pt1
+            segment.end = (pt1[0] + dx, pt1[1] + dy)
+            raw_segment(segment, linewidth, linecolor)
+            segment.start = segment.end
 
     def draw_image(self, image):
         """
         Draw an image/sprite on screen.
         """
 
+        if self._passthru:
+            self.canvas.raw_image(image)
+        else:
+            dx, dy = self.displacement
+            pos = (image.xmin + dx, image.ymin + dy)
+            self.canvas.raw_texture(image.texture, pos)
+
+    def draw_texture(self, texture, pos):
+        """
+        Draw a texture with its lower left corner at the given position.
+        """
+
         if not self._passthru:
-            image = image.move(self.displacement)
-        self.canvas.raw_image(image)
+            dx, dy = self.displacement
+            pos = (pos[0] + dx, pos[1] + dy)
+        self.canvas.raw_texture(texture, pos)
 
     def draw(self, obj):
         """
@@ -277,6 +449,28 @@ class Canvas(Screen):
 
         raise NotImplementedError
 
+    # Dirty rectangles. Backends that can repaint and update only parts of the
+    # screen should set supports_dirty_rects = True and override the methods
+    # bellow. Rectangles are (xmin, xmax, ymin, ymax) tuples in canvas
+    # coordinates.
+    supports_dirty_rects = False
+
+    def clip_region(self, rect):
+        """
+        Restricts drawing to the given rectangle and clears its background.
+
+        Calling with rect=None removes clipping.
+        """
+
+        raise NotImplementedError
+
+    def flip_regions(self, rects):
+        """
+        Pushes only the given rectangles to the computer screen.
+        """
+
+        self.flip()
+
     @contextmanager
     def autoflip(self, clear=False):
         """
@@ -333,9 +527,39 @@ class Canvas(Screen):
     def raw_texture(self, texture, start_pos=(0, 0)):
         raise NotImplementedError
 
+    # Batched versions of the primitive operations. They receive sequences of
+    # plain coordinates and colors and should be overridden by backends that
+    # can draw many primitives with a single call. The default implementations
+    # simply call the single-primitive functions in a loop.
+    def raw_circles_solid(self, centers, radii, colors):
+        circle = shapes.mCircle(0, (0, 0))
+        for pos, radius, color in zip(centers, radii, colors):
+            circle.radius = radius
+            circle.pos = pos
+            self.raw_circle_solid(circle, color)
+
+    def raw_aabbs_solid(self, aabbs, colors):
+        aabb = shapes.mAABB(0, 0, 0, 0)
+        for (xmin, xmax, ymin, ymax), color in zip(aabbs, colors):
+            aabb.xmin, aabb.xmax, aabb.ymin, aabb.ymax = xmin, xmax, ymin, ymax
+            self.raw_aabb_solid(aabb, color)
+
+    def raw_polys_solid(self, polys, colors):
+        for vertices, color in zip(polys, colors):
+            self.raw_poly_solid(shapes.mPoly(*vertices), color)
+
     def raw_image(self, image):
         self.raw_texture(image.texture, image.pos_sw)
 
+    # Off-screen rendering. Backends that support it should draw everything
+    # painted by draw_func() into a new buffer of the given shape and return
+    # a handle that is later passed to raw_offscreen().
+    def raw_render_offscreen(self, shape, draw_func):
+        return None
+
+    def raw_offscreen(self, handle, pos=(0, 0)):
+        raise NotImplementedError
+
     def draw_background(self):
         raise NotImplementedError
 
@@ -2,7 +2,7 @@ import inspect
 import sys
 from functools import partial
 from types import FunctionType, MethodType
-from weakref import WeakKeyDictionary
+from weakref import WeakKeyDictionary, WeakMethod
 
 from lazyutils import lazy
 
@@ -42,14 +42,48 @@ def _ignoring_function_factory(function, required_args, ignores):
     return filtered
 
 
+def _weak_caller(ref):
+    """
+    Return a function that calls the bound method referenced by the given
+    WeakMethod, if it is still alive.
+    """
+
+    def caller(*args, **kwargs):
+        method = ref()
+        if method is not None:
+            return method(*args, **kwargs)
+
+    return caller
+
+
 class Handler:
     """
     A signal handler.
+
+    Functions are held by strong references. With weak=True, a bound method
+    is stored as a weak reference so that the handler does not keep its object
+    alive. Once the object is garbage collected the handler is marked as dead
+    and the signal removes it before its next dispatch.
     """
 
+    @property
+    def function(self):
+        if self._ref is None:
+            return self._function
+        return self._ref()
+
+    @property
+    def is_alive(self):
+        """
+        False if handler points to a bound method of a dead object.
+        """
+
+        return self._ref is None or self._ref() is not None
+
     def __init__(self, function, signal, filters, args=None, kwargs=None,
-                 active=True, connected=False):
-        self.function = function
+                 active=True, connected=False, weak=False):
+        self._function = function
+        self._ref = None
         self.signal = signal
         self.connected = connected
         self.active = active
@@ -63,6 +97,16 @@ class Handler:
         else:
             self._accept = None
 
+        # Bound methods may be held by weak references
+        if weak and isinstance(function, MethodType):
+            try:
+                self._ref = WeakMethod(function, self._prune)
+            except TypeError:
+                pass  # object does not support weak references
+            else:
+                self._function = None
+                function = _weak_caller(self._ref)
+
         # We now decide what is the optimal way of normalizing the callback
         # function. This function is saved on the .callback attribute
         if self.args or self.kwargs:
@@ -79,8 +123,21 @@ class Handler:
         return self.callback(*args, **kwargs)
 
     def __repr__(self):
-        data = ', '.join('%s=%r' for x in self.filters.items())
-        return '%s(%s)' % (self.function.__name__, data)
+        data = ', '.join('%s=%r' % x for x in self.filters.items())
+        name = getattr(self.function, '__name__', '<dead>')
+        return '%s(%s)' % (name, data)
+
+    def _prune(self, ref=None):
+        """
+        Mark dead handler for removal.
+
+        This runs as a weakref callback, possibly in the middle of a trigger,
+        so the list of handlers is only changed before the next dispatch.
+        """
+
+        if self.connected:
+            self.signal._has_dead = True
+            self.signal._invalidate()
 
     def accept(self, *args, **kwargs):
         """
@@ -115,6 +172,7 @@ class Handler:
 
         self.active = False
         self._accept = False
+        self.signal._invalidate()
 
     def resume(self):
         """
@@ -123,6 +181,7 @@ class Handler:
 
         self.active = True
         self._accept = True if not self.filters else None
+        self.signal._invalidate()
 
     def reconnect_before(self):
         """
@@ -148,6 +207,15 @@ class Handler:
 class Signal:
     """
     Represents a signal.
+
+    Handlers are indexed by the value of the first filter. Triggering a signal
+    only visits the handlers registered to the corresponding filter value plus
+    the handlers that do not define any filter.
+
+    The trigger() method is recompiled in the first call after the list of
+    handlers changes, so connecting, pausing or resuming handlers costs O(1).
+    Signals without active handlers are triggered by a no-op and signals whose
+    handlers do not define filters call them directly in sequence.
     """
 
     def __init__(self, name, filters=(), extra_args=(), help_text=''):
@@ -156,6 +224,10 @@ class Signal:
         self.extra_args = tuple(extra_args)
         self.handlers = []
         self.help_text = help_text
+        self._generic = []
+        self._index = {}
+        self._has_dead = False
+        self._compile()
 
     def __hash__(self):
         # We want to put signals in a dictionary.
@@ -168,7 +240,44 @@ class Signal:
     def __repr__(self):
         return '%s(%r)' % (self.__class__.__name__, self.name)
 
-    def connect(self, function, *filters, args=None, kwargs=None, **extra_args):
+    @property
+    def num_handlers(self):
+        """
+        Number of handlers connected to signal.
+        """
+
+        return len(self.handlers)
+
+    def prune(self):
+        """
+        Disconnect all handlers whose bound methods were garbage collected.
+
+        Dead handlers are usually removed automatically before the next
+        trigger. Return the number of pruned handlers.
+        """
+
+        self._has_dead = False
+        dead = [h for h in self.handlers if not h.is_alive]
+        if dead:
+            self.handlers = [h for h in self.handlers if h.is_alive]
+            for handler in dead:
+                handler.connected = False
+            self._update_index()
+        return len(dead)
+
+    def filtered_handlers(self, *args, **kwargs):
+        """
+        Return the list of handlers with explicit filters that accept the
+        given arguments.
+
+        Unfiltered handlers are not included.
+        """
+
+        return [h for h in self._candidates(args, kwargs)
+                if h.filters and h.accept(*args, **kwargs)]
+
+    def connect(self, function, *filters, args=None, kwargs=None, weak=False,
+                **extra_args):
         """
         Connects handler to the signal.
 
@@ -181,6 +290,9 @@ class Signal:
             kwargs (dict):
                 Any keyword arguments that must be applied to the handler
                 function.
+            weak (bool):
+                If True, keeps only a weak reference to bound methods. The
+                handler is dropped after its object is garbage collected.
 
         The remaining positional and keyword arguments must match the filters
         registered to the signal. If any filter is defined, the handler will be
@@ -207,11 +319,131 @@ class Signal:
             filters=filters_map,
             args=args,
             kwargs=kwargs,
-            connected=True
+            connected=True,
+            weak=weak,
         )
         self.handlers.append(handler)
+        self._index_handler(handler, len(self.handlers) - 1)
+        self._invalidate()
         return handler
 
+    def _index_handler(self, handler, order):
+        """
+        Insert handler in the index of filter values.
+        """
+
+        handler._order = order
+        if handler.filters:
+            value = handler.filters[self.filters[0]]
+            try:
+                self._index.setdefault(value, []).append(handler)
+                return
+            except TypeError:
+                pass
+
+        # Unfiltered handlers and handlers with unhashable filter values must
+        # be checked at each trigger
+        self._generic.append(handler)
+
+    def _update_index(self):
+        """
+        Rebuild index after handlers are removed or reordered.
+        """
+
+        self._generic = []
+        self._index = {}
+        for order, handler in enumerate(self.handlers):
+            self._index_handler(handler, order)
+        self._invalidate()
+
+    def _invalidate(self):
+        """
+        Schedule recompilation of trigger() for its next call.
+        """
+
+        self.trigger = self._compile_and_trigger
+
+    def _compile_and_trigger(self, *args, **kwargs):
+        if self._has_dead:
+            self.prune()
+        self._compile()
+        return self.trigger(*args, **kwargs)
+
+    def _compile(self):
+        """
+        Precompile the trigger() method for the current list of handlers.
+        """
+
+        # Remove any previously compiled function
+        self.__dict__.pop('trigger', None)
+        handlers = [h for h in self.handlers if h._accept is not False]
+
+        # Filtered handlers use the generic implementation
+        if any(h._accept is None for h in handlers):
+            return
+
+        if not handlers:
+            self.trigger = _do_nothing
+        elif len(handlers) == 1:
+            handler = handlers[0]
+            callback = handler.callback
+
+            def trigger(*args, **kwargs):
+                try:
+                    callback(*args, **kwargs)
+                except Exception:
+                    self._report_error(handler)
+                    raise
+
+            self.trigger = trigger
+        else:
+            callbacks = tuple((h, h.callback) for h in handlers)
+
+            def trigger(*args, **kwargs):
+                for handler, callback in callbacks:
+                    try:
+                        callback(*args, **kwargs)
+                    except Exception:
+                        self._report_error(handler)
+                        raise
+
+            self.trigger = trigger
+
+    def _report_error(self, handler):
+        print(
+            'Error processing %r signal:' % self.name,
+            '    %s callback raised an exception' % handler,
+            '-' * 70,
+            sep='\n', file=sys.stderr
+        )
+
+    def _candidates(self, args, kwargs):
+        """
+        Return the list of handlers that might accept the given arguments.
+        """
+
+        if not self._index:
+            return self._generic
+        if args:
+            value = args[0]
+        else:
+            try:
+                value = kwargs[self.filters[0]]
+            except KeyError:
+                return self.handlers
+        try:
+            bucket = self._index.get(value)
+        except TypeError:
+            return self.handlers
+
+        generic = self._generic
+        if not bucket:
+            return generic
+        elif not generic:
+            return bucket
+        else:
+            return sorted(generic + bucket, key=_handler_order)
+
     def _split_handlers(self, handler, silent=False):
         if isinstance(handler, Handler):
             try:
@@ -223,8 +455,8 @@ class Signal:
             return [handler], self.handlers[:idx] + self.handlers[idx + 1:]
 
         else:
-            filter_in = [x for x in self.handlers if x.handler == handler]
-            filter_out = [x for x in self.handlers if x.handler != handler]
+            filter_in = [x for x in self.handlers if x.function == handler]
+            filter_out = [x for x in self.handlers if x.function != handler]
             return filter_in, filter_out
 
     def reconnect_before(self, handler, silent=False):
@@ -240,6 +472,7 @@ class Signal:
 
         filtered, rest = self._split_handlers(handler, silent=silent)
         self.handlers[:] = filtered + rest
+        self._update_index()
 
     def reconnect_after(self, handler, silent=False):
         """
@@ -254,6 +487,7 @@ class Signal:
 
         filtered, rest = self._split_handlers(handler, silent=silent)
         self.handlers[:] = rest + filtered
+        self._update_index()
 
     def trigger(self, *args, **kwargs):
         """
@@ -264,17 +498,13 @@ class Signal:
         documented and must cover at least the values declared filter names in
         the creation of the signal instance.
         """
-        for handler in self.handlers:
+
+        for handler in self._candidates(args, kwargs):
             if handler.accept(*args, **kwargs):
                 try:
                     handler.callback(*args, **kwargs)
                 except Exception:
-                    print(
-                        'Error processing %r signal:' % self.name,
-                        '    %s callback raised an exception' % handler,
-                        '-' * 70,
-                        sep='\n', file=sys.stderr
-                    )
+                    self._report_error(handler)
                     raise
 
     def disconnect(self, handler, silent=False):
@@ -287,8 +517,19 @@ class Signal:
 
         filtered, rest = self._split_handlers(handler, silent=silent)
         self.handlers[:] = rest
-        if isinstance(handler, Handler) and filtered:
-            filtered[0].connected = False
+        self._update_index()
+        for handler in filtered:
+            handler.connected = False
+
+
+def _handler_order(handler):
+    return handler._order
+
+
+def _do_nothing(*args, **kwargs):
+    """
+    Trigger function for signals without active handlers.
+    """
 
 
 class Listener:
@@ -377,7 +618,8 @@ class Listener:
         if function is not None:
             handler = listen(signal, *filters, args=args, kwargs=kwargs,
                              function=function, **extra_args)
-            self._connected_handlers.append(function)
+            self._connected_handlers.append(handler)
+            return handler
         else:
             def decorator(func):
                 decorator = listen(signal, *filters, args=args, kwargs=kwargs,
@@ -424,6 +666,18 @@ def global_signal(name, *args, **kwargs):
     return signal
 
 
+def handler_counts():
+    """
+    Return a dictionary mapping the names of all registered signals to the
+    number of connected handlers.
+
+    Useful to diagnose listeners that are never disconnected.
+    """
+
+    return {name: signal.num_handlers
+            for name, signal in REGISTERED_SIGNALS.items()}
+
+
 def is_method(func):
     """
     Return True if function is a method and receives an implicit self argument.
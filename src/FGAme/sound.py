@@ -1,20 +1,287 @@
+import time
+
 from FGAme.asset import Asset
 from FGAme.configuration import conf
 from FGAme.signals import global_signal as _signal
-from FGAme.utils import lru_cache
 
 music_ended_signal = _signal('music-ended', ['sound'])
 sfx_ended_signal = _signal('music-ended', ['sound'])
 
 
-@lru_cache
-def get_pygame_sound(path):
+_pygame_sounds = {}
+
+
+def get_pygame_sound(path, cache=True):
+    """
+    Cached sound loader.
+
+    If cache=False, always decode the file and do not store the result. This
+    is safe to call from worker threads. Path can also be an entry of an
+    asset bundle.
+    """
+
+    if cache:
+        try:
+            return _pygame_sounds[path]
+        except KeyError:
+            pass
+
+    if isinstance(path, str):
+        import pygame
+        sound = pygame.mixer.Sound(path)
+    else:
+        sound = path.load_sound()
+    if cache:
+        _pygame_sounds[path] = sound
+    return sound
+
+
+def set_pygame_sound(path, sound):
+    """
+    Store a decoded sound in the cache used by get_pygame_sound(), unless
+    the path is already loaded. Return the cached sound.
+    """
+
+    return _pygame_sounds.setdefault(path, sound)
+
+
+class PygameMixer:
+    """
+    Plays sounds on the channels of pygame's mixer.
+    """
+
+    def init(self):
+        Sound.init()
+
+    @property
+    def num_channels(self):
+        import pygame
+        return pygame.mixer.get_num_channels()
+
+    def play(self, sound):
+        """
+        Play sound in a free channel and return the channel or None if all
+        channels are busy.
+        """
+
+        import pygame
+        channel = pygame.mixer.find_channel()
+        if channel is not None:
+            channel.play(sound._get_sound())
+        return channel
+
+    def stop(self, channel):
+        channel.stop()
+
+    def is_busy(self, channel):
+        return channel.get_busy()
+
+
+class NullMixer:
+    """
+    A mixer that does not produce any sound.
+
+    Each sound occupies a channel for `duration` seconds, as measured by the
+    given clock function. Useful for headless tests and servers.
+    """
+
+    def __init__(self, num_channels=8, duration=0.5, clock=time.monotonic):
+        self.num_channels = num_channels
+        self.duration = duration
+        self.clock = clock
+        self.history = []
+        self._busy = []
+
+    def init(self):
+        pass
+
+    def play(self, sound):
+        now = self.clock()
+        self._busy = [ch for ch in self._busy if self.is_busy(ch)]
+        if len(self._busy) >= self.num_channels:
+            return None
+        channel = [sound, now + self.duration]
+        self._busy.append(channel)
+        self.history.append(sound)
+        return channel
+
+    def stop(self, channel):
+        channel[1] = self.clock()
+
+    def is_busy(self, channel):
+        return self.clock() < channel[1]
+
+
+class Voice:
+    """
+    A sound playing on a mixer channel.
+    """
+
+    __slots__ = ('key', 'channel', 'priority', 'time')
+
+    def __init__(self, key, channel, priority, time):
+        self.key = key
+        self.channel = channel
+        self.priority = priority
+        self.time = time
+
+    def __repr__(self):
+        return '<Voice %r, priority=%s>' % (self.key, self.priority)
+
+
+class VoicePool:
     """
-    Cached sound loader
+    Limits and prioritizes the sound effects sent to the mixer.
+
+    Args:
+        mixer:
+            A PygameMixer (default) or NullMixer instance.
+        max_voices (int):
+            Maximum number of simultaneous voices. Defaults to the number of
+            mixer channels.
+        max_per_sound (int):
+            Maximum number of simultaneous voices of the same sound. Can be
+            overridden per sound with the ``max_voices`` attribute of SFX
+            objects.
+        coalesce_window (float):
+            Triggers of a sound that is already started less than this number
+            of seconds before are merged with the previous one.
+        clock:
+            Function that returns the current time in seconds.
+
+    When a sound exceeds its per-sound limit, its oldest voice is replaced.
+    When all voices are in use, the oldest voice with the lowest priority is
+    stolen if its priority is not greater than the priority of the new sound.
+    Otherwise the new sound is dropped. The ``stats`` dictionary counts the
+    "played", "coalesced", "stolen" and "rejected" triggers.
     """
 
-    import pygame
-    return pygame.mixer.Sound(path)
+    def __init__(self, mixer=None, max_voices=None, max_per_sound=4,
+                 coalesce_window=0.03, clock=None):
+        self.mixer = PygameMixer() if mixer is None else mixer
+        self._max_voices = max_voices
+        self.max_per_sound = max_per_sound
+        self.coalesce_window = coalesce_window
+        self.clock = clock or getattr(self.mixer, 'clock', time.monotonic)
+        self.voices = []
+        self.stats = dict.fromkeys(['played', 'coalesced', 'stolen',
+                                    'rejected'], 0)
+        self._last = {}
+
+    @property
+    def max_voices(self):
+        if self._max_voices is None:
+            return self.mixer.num_channels
+        return self._max_voices
+
+    @max_voices.setter
+    def max_voices(self, value):
+        self._max_voices = value
+
+    def reset_stats(self):
+        """
+        Set all counters to zero.
+        """
+
+        for k in self.stats:
+            self.stats[k] = 0
+
+    def active(self, key=None):
+        """
+        Return a list of playing voices. If key is given, return only voices
+        of the given sound.
+        """
+
+        self._reap()
+        if key is None:
+            return list(self.voices)
+        return [v for v in self.voices if v.key == key]
+
+    def play(self, sound, priority=0, max_voices=None):
+        """
+        Play sound and return the corresponding Voice or None, if the sound
+        was dropped.
+
+        Sound is an SFX instance or any other object accepted by the mixer.
+        """
+
+        key = getattr(sound, 'name', sound)
+        now = self.clock()
+        last = self._last.get(key)
+        if last is not None and now - last.time < self.coalesce_window:
+            if last in self.voices:
+                self.stats['coalesced'] += 1
+                return last
+
+        self._reap()
+        max_voices = self.max_per_sound if max_voices is None else max_voices
+        same = [v for v in self.voices if v.key == key]
+        if len(same) >= max_voices:
+            victim = min(same, key=lambda v: (v.priority, v.time))
+        elif len(self.voices) >= self.max_voices:
+            victim = min(self.voices, key=lambda v: (v.priority, v.time))
+        else:
+            victim = None
+        if victim is not None:
+            if victim.priority > priority:
+                self.stats['rejected'] += 1
+                return None
+            self._stop_voice(victim)
+            self.stats['stolen'] += 1
+
+        channel = self.mixer.play(sound)
+        if channel is None:
+            self.stats['rejected'] += 1
+            return None
+        voice = Voice(key, channel, priority, now)
+        self.voices.append(voice)
+        self._last[key] = voice
+        self.stats['played'] += 1
+        return voice
+
+    def stop(self, key=None):
+        """
+        Stop all voices of the given sound or all voices if no sound is
+        given.
+        """
+
+        key = getattr(key, 'name', key)
+        for voice in list(self.voices):
+            if key is None or voice.key == key:
+                self._stop_voice(voice)
+
+    def _stop_voice(self, voice):
+        self.voices.remove(voice)
+        self.mixer.stop(voice.channel)
+
+    def _reap(self):
+        is_busy = self.mixer.is_busy
+        self.voices = [v for v in self.voices if is_busy(v.channel)]
+
+
+_voice_pool = None
+
+
+def get_voice_pool():
+    """
+    Return the VoicePool used by SFX objects.
+    """
+
+    global _voice_pool
+    if _voice_pool is None:
+        _voice_pool = VoicePool()
+    return _voice_pool
+
+
+def set_voice_pool(pool):
+    """
+    Replace the VoicePool used by SFX objects. Use
+    ``set_voice_pool(VoicePool(NullMixer()))`` to disable sound output.
+    """
+
+    global _voice_pool
+    get_voice_pool().stop()
+    _voice_pool = pool
 
 
 class Sound(Asset):
@@ -126,7 +393,8 @@ class Sound(Asset):
     def _get_sound(self):
         self.init()
         if not hasattr(self, '_sound'):
-            self._sound = get_pygame_sound(self.path)
+            source = self.path if self.entry is None else self.entry
+            self._sound = get_pygame_sound(source)
         return self._sound
 
     def _play(self):
@@ -151,9 +419,16 @@ class Sound(Asset):
 class SFX(Sound):
     """
     Sound effect.
+
+    Sound effects are played through the shared :class:`VoicePool`, which
+    limits the number of simultaneous instances of each sound. Subclasses or
+    instances may set the ``priority`` and ``max_voices`` attributes to
+    control voice allocation.
     """
 
     file_type = 'sfx'
+    priority = 0
+    max_voices = None
     _active = set()
     _paused = set()
 
@@ -185,9 +460,25 @@ class SFX(Sound):
             sfx.pause()
 
     def play(self, repeat=False):
-        super().play(repeat)
+        pool = get_voice_pool()
+        pool.mixer.init()
+        voice = pool.play(self, self.priority, self.max_voices)
+        self.is_playing = voice is not None
+        self.repeat = repeat
         self._active.add(self)
 
+    def _play(self):
+        get_voice_pool().play(self, self.priority, self.max_voices)
+
+    def _stop(self):
+        get_voice_pool().stop(self)
+
+    def _pause(self):
+        get_voice_pool().stop(self)  # no pause for SFX
+
+    def _resume(self):
+        self._play()
+
 
 class Music(Sound):
     """
@@ -227,7 +518,11 @@ class Music(Sound):
 
     def _play(self):
         music = self._music()
-        music.load(self.path)
+        if self.entry is None:
+            music.load(self.path)
+        else:
+            self._stream = self.entry.open()  # pygame streams from it
+            music.load(self._stream)
         music.set_volume(self.volume)
         music.play(-1)
 
@@ -0,0 +1,49 @@
+import PIL.Image
+
+from FGAme.draw import TextureAtlas, TileSheet, Texture, Image
+from FGAme.draw.atlas import ShelfPacker
+
+
+def solid(shape, color):
+    return PIL.Image.new('RGBA', shape, color)
+
+
+def test_shelf_packer_does_not_overlap():
+    packer = ShelfPacker(100, 100)
+    rects = []
+    for w, h in [(40, 30), (40, 30), (40, 20), (60, 50), (10, 10)]:
+        x, y = packer.insert(w, h)
+        rects.append((x, y, w, h))
+    for i, (x, y, w, h) in enumerate(rects):
+        assert x + w <= 100 and y + h <= 100
+        for (x_, y_, w_, h_) in rects[i + 1:]:
+            assert x + w <= x_ or x_ + w_ <= x or y + h <= y_ or y_ + h_ <= y
+    assert packer.insert(200, 10) is None
+
+
+def test_atlas_packs_images_in_shared_pages():
+    atlas = TextureAtlas((64, 64))
+    red, blue = atlas.add_many([('red', solid((16, 8), 'red')),
+                                ('blue', solid((8, 16), 'blue'))])
+    assert red.page is blue.page
+    assert len(atlas.pages) == 1
+    assert atlas['red'] is red
+    assert red.shape == (16, 8)
+    assert red.get_pil_data().getpixel((0, 0)) == (255, 0, 0, 255)
+    assert blue.get_pil_data().getpixel((0, 0)) == (0, 0, 255, 255)
+
+    big = atlas.add(solid((100, 100), 'green'))
+    assert big.page is not red.page
+    assert Image(big).width == 100
+
+
+def test_tilesheet_cells_are_subtextures():
+    sheet_img = solid((32, 16), 'red')
+    sheet_img.paste(solid((16, 16), 'blue'), (16, 0))
+    sheet = TileSheet(Texture.from_image(sheet_img), (16, 16))
+    assert len(sheet) == 2
+    assert sheet[1, 0].get_pil_data().getpixel((0, 0)) == (0, 0, 255, 255)
+
+    atlas = TextureAtlas((64, 64))
+    cells = atlas.add_tilesheet(sheet, 'tiles')
+    assert atlas['tiles-1-0'] is cells[1]
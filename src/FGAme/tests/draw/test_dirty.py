@@ -0,0 +1,76 @@
+from FGAme.draw.dirty import DirtyRects
+from FGAme.draw.tree import RenderTree
+from FGAme.physics.flags import flags
+
+
+class Box:
+    visible = True
+
+    def __init__(self, xmin, xmax, ymin, ymax):
+        self.xmin, self.xmax, self.ymin, self.ymax = xmin, xmax, ymin, ymax
+        self.flags = 0
+
+    def move(self, dx):
+        self.xmin += dx
+        self.xmax += dx
+        self.flags |= flags.dirty_draw
+
+
+VIEWPORT = (0, 1000, 0, 1000)
+
+
+def test_dirty_rects_tracks_moved_objects():
+    a, b = Box(0, 10, 0, 10), Box(500, 510, 500, 510)
+    tree = RenderTree()
+    tree.add_many([a, b])
+    dirty = DirtyRects(margin=0)
+    assert dirty.collect(tree, VIEWPORT) is None
+    assert dirty.collect(tree, VIEWPORT) == []
+
+    a.move(5)
+    assert dirty.collect(tree, VIEWPORT) == [(0, 15, 0, 10)]
+    assert not a.flags & flags.dirty_draw
+
+    tree.remove(b)
+    assert dirty.collect(tree, VIEWPORT) == [(500, 510, 500, 510)]
+
+
+def test_dirty_rects_invalidates_static_layers():
+    a = Box(0, 10, 0, 10)
+    tree = RenderTree()
+    tree.add(a)
+    tree.set_static(0)
+    tree._static[0] = 'cached'
+    dirty = DirtyRects(margin=0)
+    dirty.collect(tree, VIEWPORT)
+    tree._static[0] = 'cached'
+
+    a.move(5)
+    dirty.collect(tree, VIEWPORT)
+    assert tree._static[0] is None
+
+
+def test_dirty_rects_requests_full_redraw_on_camera_move():
+    tree = RenderTree()
+    tree.add(Box(0, 10, 0, 10))
+    dirty = DirtyRects()
+    dirty.collect(tree, VIEWPORT)
+    assert dirty.collect(tree, (10, 1010, 0, 1000)) is None
+
+
+def test_dirty_rects_tracks_position_and_color_assignments():
+    from FGAme.objects import AABB
+
+    box = AABB(100, 110, 100, 110)
+    tree = RenderTree()
+    tree.add(box)
+    dirty = DirtyRects(margin=0)
+    dirty.collect(tree, VIEWPORT)
+    assert dirty.collect(tree, VIEWPORT) == []
+
+    old = box.draw_bounds()
+    box.pos = (505, 505)
+    assert dirty.collect(tree, VIEWPORT) == [old, box.draw_bounds()]
+
+    box.color = 'red'
+    assert dirty.collect(tree, VIEWPORT) == [box.draw_bounds()]
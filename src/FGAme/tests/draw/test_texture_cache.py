@@ -0,0 +1,68 @@
+import PIL.Image
+import pytest
+
+from FGAme.draw import Texture, TextureCache
+
+
+def factory(shape=(10, 10)):
+    return lambda: Texture.from_pil_image(PIL.Image.new('L', shape))
+
+
+def test_texture_cache_evicts_least_recently_used():
+    cache = TextureCache(max_bytes=250)
+    a = cache.get('a', factory())
+    cache.get('b', factory())
+    assert cache.get('a', None) is a
+    cache.get('c', factory())
+    assert 'b' not in cache
+    assert 'a' in cache and 'c' in cache
+    assert cache.stats()['evictions'] == 1
+    assert cache.num_bytes == 200
+
+
+def test_texture_cache_keeps_acquired_textures():
+    cache = TextureCache(max_bytes=150)
+    cache.get('a', factory())
+    cache.acquire('a')
+    cache.get('b', factory())
+    assert 'a' in cache and 'b' not in cache
+    cache.release('a')
+    with pytest.raises(ValueError):
+        cache.release('a')
+
+
+
+def test_images_keep_their_textures_in_cache(monkeypatch):
+    from FGAme.draw import image
+
+    cache = TextureCache(max_bytes=150)
+    monkeypatch.setattr(image, 'texture_cache', cache)
+    img = image.Image(cache.get('a', factory()))
+    copy = img.copy()
+    cache.get('b', factory())
+    assert 'a' in cache and 'b' not in cache
+
+    del img, copy
+    cache.get('c', factory())
+    assert 'a' not in cache and 'c' in cache
+
+def test_texture_cache_shares_transformed_textures():
+    cache = TextureCache()
+    tex = cache.get('a', factory((20, 20)))
+    crop1 = cache.transform(tex, 'crop', (0, 0, 5, 5))
+    crop2 = cache.transform(tex, 'crop', (0, 0, 5, 5))
+    assert crop1 is crop2
+    assert crop1.shape == (5, 5)
+    assert tex.shape == (20, 20)
+
+
+def test_texture_cache_quantizes_rotated_variants():
+    from math import pi
+
+    cache = TextureCache(rotation_steps=4)
+    tex = cache.get('a', factory((20, 10)))
+    assert cache.variant(tex, 0.1) is tex
+    rotated = cache.variant(tex, pi / 2)
+    assert rotated.shape == (10, 20)
+    assert cache.variant(tex, pi / 2 + 0.2) is rotated
+    assert cache.variant(tex, 0, 2).shape == (40, 20)
@@ -0,0 +1,179 @@
+from FGAme.draw.tree import RenderTree
+
+
+class Box:
+    visible = True
+
+    def __init__(self, xmin, xmax, ymin, ymax):
+        self.xmin, self.xmax, self.ymin, self.ymax = xmin, xmax, ymin, ymax
+
+    def draw(self, painter):
+        painter.drawn.append(self)
+
+
+class Painter:
+    def __init__(self, viewport):
+        self._viewport = viewport
+        self.drawn = []
+
+    def viewport(self):
+        return self._viewport
+
+
+def test_render_tree_culls_objects_outside_viewport():
+    inside = Box(10, 20, 10, 20)
+    partial = Box(-5, 5, -5, 5)
+    outside = Box(200, 210, 0, 10)
+    tree = RenderTree()
+    tree.add_many([inside, partial, outside])
+
+    painter = Painter((0, 100, 0, 100))
+    tree.draw(painter)
+    assert painter.drawn == [inside, partial]
+
+    tree.culling = False
+    painter = Painter((0, 100, 0, 100))
+    tree.draw(painter)
+    assert painter.drawn == [inside, partial, outside]
+
+
+def test_render_tree_remove_keeps_order():
+    objs = [Box(0, 1, 0, 1) for _ in range(5)]
+    tree = RenderTree()
+    tree.add(objs[4], 1)
+    tree.add_many(objs[:4])
+    tree.remove(objs[1])
+    assert objs[1] not in tree
+    assert len(tree) == 4
+    assert list(tree.walk()) == [objs[0], objs[2], objs[3], objs[4]]
+    assert tree[3] is objs[4]
+    assert tree.layer_of(objs[4]) == 1
+
+    tree.add(objs[0], 2)
+    assert list(tree) == [objs[2], objs[3], objs[4], objs[0]]
+    assert list(tree.iter_layers(skip_empty=False)) == [
+        [objs[2], objs[3]], [objs[4]], [objs[0]]]
+
+
+
+class EqBox(Box):
+    def __eq__(self, other):
+        return True
+
+    __hash__ = object.__hash__
+
+
+def test_render_tree_compares_objects_by_identity():
+    a, b = EqBox(0, 1, 0, 1), EqBox(0, 1, 0, 1)
+    tree = RenderTree()
+    tree.add(a)
+    assert a == b
+    assert b not in tree and tree.count(b) == 0
+    tree.discard(b)
+    assert list(tree) == [a]
+
+
+def test_render_tree_compacts_only_touched_layers():
+    objs = [Box(0, 1, 0, 1) for _ in range(4)]
+    tree = RenderTree()
+    tree.add_many(objs[:2], 0)
+    tree.add_many(objs[2:], 1)
+    tree.remove(objs[0])
+    assert tree._dirty == {0}
+    assert list(tree) == objs[1:]
+    assert not tree._dirty
+
+
+def test_render_tree_defers_compaction_during_walk():
+    objs = [Box(0, 1, 0, 1) for _ in range(4)]
+    tree = RenderTree()
+    tree.add_many(objs)
+    seen = []
+    for obj in tree.walk():
+        seen.append(obj)
+        if obj is objs[0]:
+            tree.remove(objs[1])
+            assert list(tree) == [objs[0], objs[2], objs[3]]
+            assert tree[1] is objs[2]
+    assert seen == [objs[0], objs[2], objs[3]]
+    assert tree._dirty == {0}
+    assert tree.get_layer(0) == [objs[0], objs[2], objs[3]]
+    assert not tree._dirty
+
+class Ball(Box):
+    @classmethod
+    def draw_batch(cls, painter, objects):
+        painter.drawn.append(list(objects))
+
+    def batch_drawer(self):
+        return self.draw_batch
+
+
+def test_render_tree_batches_consecutive_objects():
+    balls = [Ball(0, 1, 0, 1) for _ in range(3)]
+    box = Box(0, 1, 0, 1)
+    top = Ball(0, 1, 0, 1)
+    tree = RenderTree()
+    tree.add_many([balls[0], box, balls[1], balls[2]])
+    tree.add(top, 1)
+
+    painter = Painter((0, 100, 0, 100))
+    painter.supports_batching = True
+    tree.draw(painter)
+    assert painter.drawn == [[balls[0]], box, balls[1:], [top]]
+
+
+class OffscreenPainter(Painter):
+    def __init__(self, viewport):
+        super().__init__(viewport)
+        self.num_renders = 0
+        self.cached = []
+
+    def render_offscreen(self, pos, shape, draw_func):
+        self.num_renders += 1
+        draw_func(self)
+        return ('buffer', shape)
+
+    def draw_cached(self, handle, xmin, ymin):
+        self.cached.append((handle, xmin, ymin))
+
+
+def test_render_tree_caches_static_layers():
+    tree = RenderTree()
+    tree.add_many([Box(0, 10, 0, 10), Box(20, 30, 5, 15)])
+    tree.set_static(0)
+    dynamic = Box(0, 1, 0, 1)
+    tree.add(dynamic, 1)
+
+    painter = OffscreenPainter((0, 100, 0, 100))
+    tree.draw(painter)
+    tree.draw(painter)
+    assert painter.num_renders == 1
+    assert painter.cached == [(('buffer', (31, 16)), 0, 0)] * 2
+    assert painter.drawn.count(dynamic) == 2
+
+    tree.add(Box(0, 1, 0, 1))
+    tree.draw(painter)
+    assert painter.num_renders == 2
+
+
+def test_static_layers_are_rebuilt_when_objects_change():
+    from FGAme.physics.flags import flags
+
+    box = Box(0, 10, 0, 10)
+    box.flags = flags.dirty_draw
+    tree = RenderTree()
+    tree.add(box)
+    tree.set_static(0)
+
+    painter = OffscreenPainter((0, 100, 0, 100))
+    tree.draw(painter)
+    tree.draw(painter)
+    assert painter.num_renders == 1
+
+    box.xmax = 20
+    box.flags |= flags.dirty_draw
+    tree.draw(painter)
+    assert painter.num_renders == 2
+    assert painter.cached[-1] == (('buffer', (21, 11)), 0, 0)
+    assert not box.flags & flags.dirty_draw
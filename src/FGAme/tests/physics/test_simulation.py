@@ -22,3 +22,123 @@ def test_simulation_discard_object():
     w._simulation.discard(p)
     w.update(0.1)
     assert p._acceleration != gravity
+
+
+def test_adaptive_substeps_follow_speed():
+    sim = Simulation(adaptive=True, max_substeps=4, substep_hysteresis=2)
+    w = World(simulation=sim)
+    p = w.add.circle(1.0, pos=(0, 0), vel=(100, 0))
+    w.update(0.1)
+    assert sim.num_substeps == 4
+    p.vel = (0, 0)
+    for _ in range(2):
+        w.update(0.1)
+    assert sim.num_substeps == 3
+    assert sum(sim.substep_histogram.values()) == 3
+
+
+def test_adaptive_substeps_follow_tilegrid_penetration():
+    from FGAme.physics.tilegrid import TileGrid
+
+    sim = Simulation(adaptive=True, max_substeps=4, max_penetration=1.0)
+    w = World(simulation=sim)
+    grid = TileGrid((10, 10), 2, 1)
+    grid[0, 0] = grid[1, 0] = True
+    sim.add_tilegrid(grid)
+    w.add.aabb(0, 10, 5, 15)
+    w.update(0.01)
+    assert sim._grid_contacts
+    w.update(0.01)
+    assert sim.num_substeps > 1
+
+
+def test_global_parameters_are_shared_with_objects():
+    from FGAme.physics.signals import gravity_changed_signal
+
+    calls = []
+    w = World()
+    p1 = w.add.circle(1.0, pos=(0, 0))
+    p2 = w.add.circle(1.0, pos=(10, 0), gravity=5)
+    handler = gravity_changed_signal.connect(
+        lambda sim, old, new: calls.append(new))
+    try:
+        w.gravity = 10
+    finally:
+        handler.disconnect()
+    assert len(calls) == 1
+    assert p1.gravity == (0, -10)
+    assert p2.gravity == (0, -5)
+
+
+def resting_box_world(**kwargs):
+    # A box resting over a static floor keeps a contact in every step
+    sim = Simulation(gravity=100, restitution=0, **kwargs)
+    w = World(simulation=sim)
+    w.add.aabb(-50, 50, -10, 0, mass='inf')
+    w.add.aabb(-5, 5, -1, 9)
+    return sim
+
+
+def test_contacts_are_recycled_between_steps():
+    sim = resting_box_world(recycle_contacts=True)
+    sim.update(0.01)
+    col = sim.narrow_phase[0]
+    assert not hasattr(col, '__dict__')
+    for _ in range(3):
+        sim.update(0.01)
+        assert len(sim.narrow_phase) == 1
+        assert sim.narrow_phase[0] is col
+
+
+def test_contacts_are_not_recycled_by_default():
+    sim = resting_box_world()
+    sim.update(0.01)
+    col = sim.narrow_phase[0]
+    sim.update(0.01)
+    assert len(sim.narrow_phase) == 1
+    assert sim.narrow_phase[0] is not col
+    assert col.A is not None and col.B is not None
+
+
+def test_batched_collision_events():
+    from FGAme.physics.signals import collisions_signal, pre_collision_signal
+
+    batches = []
+    single = []
+    w = World(simulation=Simulation(batch_collisions=True))
+    w.add.circle(10, pos=(0, 0), vel=(10, 0))
+    w.add.circle(10, pos=(15, 0), vel=(-10, 0))
+    h1 = collisions_signal.connect(lambda sim, cols: batches.append(len(cols)))
+    h2 = pre_collision_signal.connect(lambda sim, col: single.append(col))
+    try:
+        w.update(0.01)
+    finally:
+        h1.disconnect()
+        h2.disconnect()
+    assert batches == [1]
+    assert single == []
+
+
+def test_batched_collisions_notify_filtered_handlers():
+    from FGAme.physics.signals import pre_collision_signal
+
+    seen = []
+    w = World(simulation=Simulation(batch_collisions=True))
+    a = w.add.circle(10, pos=(0, 0), vel=(10, 0))
+    b = w.add.circle(10, pos=(15, 0), vel=(-10, 0))
+    a.listen('pre-collision', function=lambda col: seen.append(col))
+    b.listen('post-collision',
+             function=lambda col: seen.append(list(a.collisions)))
+    unfiltered = []
+    h = pre_collision_signal.connect(lambda sim, col: unfiltered.append(col))
+    try:
+        w.update(0.01)
+    finally:
+        h.disconnect()
+        a.disconnect_signals()
+        b.disconnect_signals()
+    col, tracked = seen
+    assert set(col) == {a, b}
+    assert tracked == [col]
+    assert a.collisions == b.collisions == []
+    assert unfiltered == []
@@ -0,0 +1,41 @@
+import pytest
+
+from FGAme.physics import AABB, Simulation, TileGrid
+
+
+@pytest.fixture
+def grid():
+    # A floor with ten cells and a wall on top of cell 5
+    cells = [(i, 0) for i in range(10)] + [(5, 1)]
+    return TileGrid.from_cells(cells, (10, 10))
+
+
+def test_tilegrid_cells(grid):
+    assert (grid.num_cols, grid.num_rows) == (10, 2)
+    assert len(grid) == 11
+    assert grid[5, 1] and not grid[4, 1] and not grid[20, 0]
+    assert list(grid.solid_cells(12, 22, 5, 15)) == [(1, 0), (2, 0)]
+
+
+def test_tilegrid_contacts_skip_internal_edges(grid):
+    box = AABB(12, 22, 9, 19, mass=1)
+    cols = grid.collisions([box])
+    assert [tuple(col.normal) for col in cols] == [(0, 1), (0, 1)]
+    assert all(col.B is box for col in cols)
+
+
+def test_tilegrid_wall_contact(grid):
+    box = AABB(41, 51, 10.5, 20.5, mass=1)
+    cols = grid.collisions([box])
+    assert [tuple(col.normal) for col in cols] == [(-1, 0)]
+
+
+def test_tilegrid_stops_falling_body(grid):
+    sim = Simulation(gravity=500, restitution=0)
+    sim.add_tilegrid(grid)
+    box = AABB(12, 22, 12, 22, mass=1)
+    sim.add(box)
+    for _ in range(60):
+        sim.update(1 / 60)
+    assert box.ymin > 5
+    assert abs(box.vel.y) < 50
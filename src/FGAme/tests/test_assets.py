@@ -2,7 +2,7 @@ import os
 
 import pytest
 
-from FGAme.asset import Asset
+from FGAme.asset import Asset, AssetIndex
 
 
 @pytest.fixture
@@ -37,3 +37,46 @@ def test_assets_search_path(asset):
     join = os.path.join
     assert dirs[0].endswith(join('assets', 'sfx'))
     assert dirs[1].endswith(join('FGAme', 'assets', 'sfx'))
+
+
+def test_asset_index_lookup(tmpdir):
+    tmpdir.join('sfx').mkdir().join('boom.ogg').write('')
+    tmpdir.join('sfx', 'boom.wav').write('')
+    index = AssetIndex(str(tmpdir))
+    path = index.lookup('sfx/boom', ['.wav', '.ogg'])
+    assert path == os.path.join(str(tmpdir), 'sfx', 'boom.wav')
+    assert index.lookup('sfx/boom', ['.mp3']) is None
+    assert index.lookup('missing', ['.wav']) is None
+
+
+def test_asset_index_lookup_full_name(tmpdir):
+    tmpdir.join('data.json').write('{}')
+    index = AssetIndex(str(tmpdir))
+    assert index.lookup('data.json', ['']) == str(tmpdir.join('data.json'))
+    assert index.lookup('data.json') == str(tmpdir.join('data.json'))
+    assert index.lookup('data', ['']) is None
+
+
+def test_asset_index_manifest(tmpdir):
+    tmpdir.join('a.png').write('')
+    AssetIndex(str(tmpdir)).write_manifest()
+    tmpdir.join('b.png').write('')
+    index = AssetIndex(str(tmpdir))
+    assert 'a' in index and 'b' not in index
+
+
+def test_asset_index_finds_new_files_without_watch(tmpdir):
+    index = AssetIndex(str(tmpdir))
+    assert index.lookup('a', ['.png']) is None
+    tmpdir.join('a.png').write('')
+    assert index.lookup('a', ['.png']) == str(tmpdir.join('a.png'))
+    assert 'a' in index
+
+
+def test_asset_index_watch(tmpdir):
+    index = AssetIndex(str(tmpdir), watch=True)
+    index.watch_interval = 0
+    assert index.lookup('a', ['.png']) is None
+    tmpdir.join('a.png').write('')
+    os.utime(str(tmpdir), (0, 0))
+    assert index.lookup('a', ['.png']) is not None
@@ -0,0 +1,94 @@
+import io
+import wave
+
+import pytest
+
+from FGAme.bundle import Bundle, BundleError, build_bundle, ALIGN, mount, \
+    unmount, find_entry
+
+
+@pytest.fixture
+def assets(tmpdir):
+    tmpdir.join('data').mkdir().join('hello.txt').write('hello world')
+    tmpdir.join('data', 'empty.bin').write('')
+    with wave.open(str(tmpdir.mkdir('sfx').join('beep.wav')), 'wb') as F:
+        F.setnchannels(1)
+        F.setsampwidth(2)
+        F.setframerate(22050)
+        F.writeframes(b'\x01\x02' * 100)
+    return tmpdir
+
+
+def make_bundle(assets, decode=False):
+    path = str(assets.join('assets.fgb'))
+    build_bundle(str(assets), path, decode)
+    return Bundle(path)
+
+
+def test_bundle_stores_files(assets):
+    bundle = make_bundle(assets)
+    assert set(bundle) == {'data/hello', 'data/empty', 'sfx/beep'}
+    assert bytes(bundle.read('data/hello')) == b'hello world'
+    assert bytes(bundle.read('data/empty')) == b''
+    assert bundle.find('data/hello', ['.bin']) is None
+
+
+def test_bundle_blobs_are_aligned(assets):
+    bundle = make_bundle(assets)
+    for entry in bundle.entries():
+        assert (bundle._data_start + entry.offset) % ALIGN == 0
+
+
+def test_bundle_decodes_wav(assets):
+    bundle = make_bundle(assets, decode=True)
+    entry = bundle.find('sfx/beep')
+    assert entry.kind == 'pcm'
+    assert entry.meta == {'frequency': 22050, 'channels': 1, 'sampwidth': 2}
+    assert bytes(entry.data) == b'\x01\x02' * 100
+    with wave.open(io.BytesIO(entry.to_wav()), 'rb') as F:
+        assert F.readframes(100) == b'\x01\x02' * 100
+
+
+def test_invalid_bundle(tmpdir):
+    path = tmpdir.join('bad.fgb')
+    path.write('not a bundle')
+    with pytest.raises(BundleError):
+        Bundle(str(path))
+
+
+def test_bundle_find_generic_names(assets):
+    bundle = make_bundle(assets)
+    assert bundle.find('data/hello', ['']).ext == '.txt'
+    assert bundle.find('data/hello.txt', ['']).ext == '.txt'
+    assert bundle.find('data/hello.bin', ['']) is None
+
+
+def test_mounted_bundle_resolves_assets(assets):
+    from FGAme.asset import Asset
+
+    bundle = mount(make_bundle(assets))
+    try:
+        assert find_entry('sfx/beep', ['.wav']) is bundle.find('sfx/beep')
+        asset = Asset('hello', 'data')
+        assert asset.is_valid and asset.path is None
+        with asset as F:
+            assert F.read() == b'hello world'
+    finally:
+        unmount(bundle)
+    assert find_entry('sfx/beep') is None
+
+
+def test_mounted_rgba_image_loads_as_texture(tmpdir):
+    PIL_Image = pytest.importorskip('PIL.Image')
+    from FGAme.draw.image import Texture
+
+    image = PIL_Image.new('RGBA', (4, 2), (255, 0, 0, 255))
+    image.save(str(tmpdir.mkdir('images').join('bundled-hero.png')))
+    bundle = mount(make_bundle(tmpdir, decode=True))
+    try:
+        assert find_entry('images/bundled-hero').kind == 'rgba'
+        texture = Texture('bundled-hero')
+        assert texture.shape == (4, 2)
+        assert texture.get_pil_data().getpixel((3, 1)) == (255, 0, 0, 255)
+    finally:
+        unmount(bundle)
@@ -0,0 +1,28 @@
+from FGAme import draw
+from FGAme.preloader import Preloader, preload_progress_signal
+
+
+def test_preloader_installs_textures(tmpdir):
+    import PIL.Image
+
+    path = str(tmpdir.join('img.png'))
+    PIL.Image.new('RGBA', (4, 4)).save(path)
+
+    progress = []
+    loader = Preloader(images=[path], max_workers=1)
+    handler = preload_progress_signal.connect(
+        lambda done, total: progress.append((done, total)), loader)
+    loader.start()
+    loader.wait()
+    handler.disconnect()
+
+    assert loader.is_done
+    assert progress == [(1, 1)]
+    assert draw.get_texture(path) is loader.results[path]
+
+
+def test_preloader_records_errors():
+    loader = Preloader(images=['/does/not/exist.png'], max_workers=1)
+    loader.start().wait()
+    assert loader.is_done
+    assert '/does/not/exist.png' in loader.errors
@@ -0,0 +1,36 @@
+from FGAme.mathtools import shapes
+from FGAme.screen import Camera
+
+
+class RecordingCanvas:
+    width = 800
+    height = 600
+
+    def __init__(self):
+        self.calls = []
+
+    def raw_circle_solid(self, circle, color):
+        self.calls.append((circle, (circle.x, circle.y, circle.radius)))
+
+    def raw_segment(self, segment, width, color):
+        self.calls.append((segment, tuple(segment.start) + tuple(segment.end)))
+
+
+def test_camera_reuses_scratch_shapes():
+    canvas = RecordingCanvas()
+    camera = Camera(canvas)
+    camera.pan(-10, -20)
+    camera.draw_circle(shapes.Circle(5, (1, 2)), fillcolor='red')
+    camera.draw_circle(shapes.Circle(3, (0, 0)), fillcolor='red')
+    (c1, data1), (c2, data2) = canvas.calls
+    assert c1 is c2
+    assert data1 == (11, 22, 5)
+    assert data2 == (10, 20, 3)
+
+
+def test_camera_draw_path_translates_edges():
+    canvas = RecordingCanvas()
+    camera = Camera(canvas)
+    camera.pan(-1, 0)
+    camera.draw_path(shapes.Path((0, 0), (1, 0), (1, 1)))
+    assert [data for _, data in canvas.calls] == [(1, 0, 2, 0), (2, 0, 2, 1)]
@@ -0,0 +1,130 @@
+from FGAme.signals import Signal
+
+
+def test_filtered_handlers_are_dispatched_by_value():
+    signal = Signal('test-key', ['key'], ['x'])
+    calls = []
+    signal.connect(lambda x: calls.append(('a', x)), 'a')
+    signal.connect(lambda key, x: calls.append(('any', key, x)))
+    signal.connect(lambda x: calls.append(('b', x)), key='b')
+
+    signal.trigger('a', 1)
+    signal.trigger('c', 2)
+    signal.trigger(key='b', x=3)
+    assert calls == [('a', 1), ('any', 'a', 1), ('any', 'c', 2),
+                     ('any', 'b', 3), ('b', 3)]
+
+
+def test_dispatch_order_follows_reconnection():
+    signal = Signal('test-order', ['key'])
+    calls = []
+    h1 = signal.connect(lambda: calls.append(1), 'a')
+    h2 = signal.connect(lambda key: calls.append(2))
+    h2.reconnect_before()
+    signal.trigger('a')
+    h1.disconnect()
+    signal.trigger('a')
+    assert calls == [2, 1, 2]
+
+
+def test_signal_without_handlers_compiles_to_noop():
+    from FGAme.signals import _do_nothing
+
+    signal = Signal('test-compiled')
+    assert signal.trigger is _do_nothing
+
+    calls = []
+    handler = signal.connect(lambda: calls.append(1))
+    signal.trigger()
+    handler.pause()
+    signal.trigger()
+    assert signal.trigger is _do_nothing
+    handler.resume()
+    signal.trigger()
+    handler.disconnect()
+    signal.trigger()
+    assert calls == [1, 1]
+
+
+def test_handler_changes_do_not_recompile_trigger(monkeypatch):
+    signal = Signal('test-lazy')
+    compiled = []
+    compile = signal._compile
+    monkeypatch.setattr(signal, '_compile',
+                        lambda: compiled.append(1) or compile())
+
+    calls = []
+    handlers = [signal.connect(lambda i=i: calls.append(i)) for i in range(3)]
+    handlers[1].pause()
+    handlers[1].resume()
+    handlers[0].pause()
+    assert compiled == []
+
+    signal.trigger()
+    signal.trigger()
+    assert compiled == [1]
+    assert calls == [1, 2, 1, 2]
+
+
+def test_bound_method_handlers_do_not_keep_objects_alive():
+    import gc
+
+    class Counter:
+        value = 0
+
+        def incr(self):
+            self.value += 1
+
+    signal = Signal('test-weak')
+    counter = Counter()
+    signal.connect(counter.incr, weak=True)
+    signal.trigger()
+    assert counter.value == 1
+    assert signal.num_handlers == 1
+
+    del counter
+    gc.collect()
+    signal.trigger()
+    assert signal.num_handlers == 0
+
+
+def test_handlers_keep_temporary_objects_alive_by_default():
+    import gc
+
+    class Tmp:
+        def method(self):
+            calls.append(1)
+
+    calls = []
+    signal = Signal('test-strong')
+    signal.connect(Tmp().method)
+    gc.collect()
+    signal.trigger()
+    assert calls == [1]
+    assert signal.num_handlers == 1
+
+
+def test_dead_handlers_are_removed_after_dispatch():
+    import gc
+
+    class Tmp:
+        def method(self):
+            calls.append('dead')
+
+    def kill():
+        calls.append('kill')
+        del objs[:]
+        gc.collect()
+
+    calls = []
+    objs = [Tmp()]
+    signal = Signal('test-prune', ['key'])
+    signal.connect(kill, 'a')
+    signal.connect(objs[0].method, weak=True)
+    signal.connect(lambda key: calls.append('last'))
+    signal.trigger('a')
+    assert calls == ['kill', 'last']
+    assert signal.num_handlers == 3
+
+    signal.trigger('a')
+    assert signal.num_handlers == 2
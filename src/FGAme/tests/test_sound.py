@@ -1,6 +1,6 @@
 import pytest
 
-from FGAme.sound import play, music, mute, SFX, Music
+from FGAme.sound import play, music, mute, SFX, Music, NullMixer, VoicePool
 
 
 @pytest.fixture
@@ -56,3 +56,55 @@ def test_mute_sounds():
     mute()
     assert not sfx.is_playing
     assert not song.is_playing
+
+
+class Clock:
+    def __init__(self):
+        self.time = 0.0
+
+    def __call__(self):
+        return self.time
+
+
+@pytest.fixture
+def pool():
+    mixer = NullMixer(num_channels=4, duration=1.0, clock=Clock())
+    return VoicePool(mixer, max_per_sound=2, coalesce_window=0.05)
+
+
+def test_voice_pool_coalesces_triggers(pool):
+    voice = pool.play('hit')
+    assert pool.play('hit') is voice
+    pool.clock.time = 0.1
+    assert pool.play('hit') is not voice
+    assert pool.stats['played'] == 2
+    assert pool.stats['coalesced'] == 1
+
+
+def test_voice_pool_limits_voices_per_sound(pool):
+    for i in range(3):
+        pool.clock.time = i / 10
+        pool.play('hit')
+    assert len(pool.active('hit')) == 2
+    assert pool.stats['stolen'] == 1
+    assert [v.time for v in pool.active()] == [0.1, 0.2]
+
+
+def test_voice_pool_steals_by_priority(pool):
+    for i, name in enumerate('abcd'):
+        pool.clock.time = i / 10
+        pool.play(name, priority=1 if name == 'a' else 0)
+    pool.clock.time = 0.5
+    assert pool.play('e', priority=-1) is None
+    assert pool.play('f') is not None
+    assert sorted(v.key for v in pool.active()) == ['a', 'c', 'd', 'f']
+    assert pool.stats['rejected'] == 1
+
+
+def test_voice_pool_releases_finished_voices(pool):
+    pool.play('hit')
+    pool.clock.time = 2.0
+    assert pool.active() == []
+    pool.play('hit')
+    pool.stop('hit')
+    assert pool.active() == []
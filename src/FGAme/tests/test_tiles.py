@@ -0,0 +1,116 @@
+import pytest
+
+from FGAme import World
+from FGAme.extra.tiles.streaming import TileStreamer
+from FGAme.extra.tiles.tilemanager import TileManager, merge_cells
+
+TILEMAP = '''
+    |xx  o
+    |xxxxxxxx
+'''
+
+
+@pytest.fixture
+def tm():
+    tm = TileManager((10, 10), merge=True)
+    tm.register_spec('brick', 'x', color='red')
+    tm.register_spec('coin', 'o', shape='circle', color='yellow')
+    tm.add_tilemap(TILEMAP)
+    return tm
+
+
+def test_merge_cells_covers_all_cells():
+    cells = {(i, j) for i in range(5) for j in range(3)} | {(7, 0)}
+    rects = merge_cells(cells)
+    assert rects == [(0, 0, 5, 3), (7, 0, 1, 1)]
+
+
+def test_merged_colliders(tm):
+    colliders = [c for c, layer in tm.colliders()]
+    assert len(colliders) == 2
+    areas = [(c.xmax - c.xmin) * (c.ymax - c.ymin) for c in colliders]
+    assert sorted(areas) == [200, 800]
+    assert all(not c.visible and c.name == 'brick' for c in colliders)
+
+
+def test_merged_tilemap_in_world(tm):
+    world = World()
+    world.add(tm)
+    bodies = list(world._simulation)
+    assert len(bodies) == 3  # two colliders and the coin
+    assert len(list(world.render_tree().walk())) == len(tm) + 2
+
+
+class Target:
+    pos = (0, 0)
+
+
+def test_tile_streamer_loads_nearby_chunks():
+    tm = TileManager((10, 10))
+    tm.register_spec('brick', 'x', color='red')
+    tm.add_tilemap('|' + 'x' * 64)
+    world = World()
+    target = Target()
+    target.pos = (5, 5)
+    streamer = TileStreamer(tm, world, chunk_size=(8, 8), radius=0,
+                            target=target)
+
+    streamer.update()
+    assert set(streamer.active) == {(0, 0)}
+    assert len(world) == 8
+
+    target.pos = (305, 5)
+    streamer.update()
+    assert set(streamer.active) == {(3, 0)}
+    assert len(world) == 8
+
+    streamer.unload_all()
+    assert len(world) == 0
+
+
+
+def test_tile_streamer_generates_lazy_tilemaps_per_chunk():
+    tm = TileManager((10, 10), merge=True)
+    tm.register_spec('brick', 'x', color='red')
+    tm.add_tilemap('|' + 'x' * 64, lazy=True)
+    assert len(tm) == 0 and not tm.positions
+
+    world = World()
+    target = Target()
+    target.pos = (5, 5)
+    streamer = TileStreamer(tm, world, chunk_size=(8, 8), radius=0,
+                            target=target, cache_size=2)
+    streamer.update()
+    objects, visuals = streamer.active[0, 0]
+    assert len(objects) == 1 and len(visuals) == 8
+    collider = objects[0][0]
+    assert collider.xmax - collider.xmin == 80
+
+    target.pos = (305, 5)
+    streamer.update()
+    target.pos = (5, 5)
+    streamer.update()
+    assert streamer.active[0, 0][0] is objects
+    assert len(list(world._simulation)) == 1
+
+def test_collision_grid_replaces_tile_bodies():
+    tm = TileManager((10, 10), collision_grid=True)
+    tm.register_spec('brick', 'x', color='red')
+    tm.register_spec('coin', 'o', shape='circle', color='yellow')
+    tm.add_tilemap(TILEMAP)
+    world = World()
+    world.add(tm)
+    assert len(list(world._simulation)) == 1  # the coin
+    grid, = world._simulation._tilegrids
+    assert len(grid) == 10
+    assert grid[0, 1] and not grid[2, 1]
+
+
+def test_collision_grid_from_lazy_tilemap():
+    tm = TileManager((10, 10), collision_grid=True)
+    tm.register_spec('brick', 'x', color='red')
+    tm.register_spec('coin', 'o', shape='circle', color='yellow')
+    tm.add_tilemap(TILEMAP, lazy=True)
+    grid = tm.tilegrid()
+    assert len(grid) == 10
+    assert grid[0, 1] and not grid[2, 1]
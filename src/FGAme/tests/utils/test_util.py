@@ -0,0 +1,33 @@
+import pytest
+
+from FGAme.utils.util import IndexedList
+
+
+def test_indexed_list_add_and_remove():
+    L = IndexedList([1, 2, 3, 4])
+    assert not L.add(2)
+    L.remove(2)
+    assert list(L) == [1, 3, 4]
+    assert 2 not in L and 4 in L
+    assert L.index(3) == 1 and L[-1] == 4 and len(L) == 3
+    with pytest.raises(ValueError):
+        L.remove(2)
+
+
+def test_indexed_list_remove_many_preserves_order():
+    a, b, c, d, e = objs = [object() for _ in range(5)]
+    L = IndexedList(objs)
+    removed = L.remove_many([b, d, object()])
+    assert len(removed) == 2
+    assert list(L) == [a, c, e]
+    assert L.index(e) == 2
+
+
+def test_indexed_list_compacts_lazily():
+    objs = [object() for _ in range(6)]
+    L = IndexedList(objs)
+    for obj in objs[1:3]:
+        L.remove(obj)
+    assert len(L._data) == 6
+    assert list(L) == [objs[0]] + objs[3:]
+    assert len(L._data) == 4
@@ -0,0 +1,50 @@
+from FGAme.world.world import World
+from FGAme import objects
+
+
+def test_world_add_and_remove_many():
+    w = World()
+    circles = [objects.Circle(1, pos=(3 * i, 0)) for i in range(5)]
+    w.add_many(circles)
+    assert len(w) == 5
+    assert all(obj in w._simulation for obj in circles)
+
+    w.remove_many(circles[1:3])
+    assert len(w) == 3
+    assert circles[1] not in w
+    assert circles[1] not in w._simulation
+    assert circles[1] not in w.render_tree()
+    assert circles[1].world is None
+
+
+def test_world_remove_preserves_order():
+    w = World()
+    circles = [w.add.circle(1, pos=(3 * i, 0)) for i in range(5)]
+    w.remove(circles[1])
+    del w[1]
+    assert list(w) == [circles[0], circles[3], circles[4]]
+    assert w[1] is circles[3]
+    assert list(w._simulation._active) == list(w)
+
+
+def test_world_remove_body():
+    w = World()
+    obj = w.add.circle(1)
+    w.remove(obj)
+    assert obj not in w
+    assert obj not in w._simulation
+
+
+def test_body_pool_recycles_objects():
+    w = World()
+    pool = w.pool(objects.Circle(2, color='red'), size=2)
+    a = pool.acquire(pos=(10, 0), vel=(1, 0))
+    assert a in w and a in w._simulation
+    assert a.pos == (10, 0) and a.vel == (1, 0)
+
+    pool.release(a)
+    assert a not in w
+    b = pool.acquire(pos=(0, 5))
+    assert b is a
+    assert b.vel == (0, 0)
+    assert pool.num_created == 2 and pool.num_reused == 2
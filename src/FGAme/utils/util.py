@@ -3,7 +3,7 @@ import types
 
 __all__ = [
     'CachingProxy', 'caching_proxy_factory', 'autodoc', 'popattr', 'lru_cache',
-    'console_here']
+    'IndexedList', 'console_here']
 
 
 class CachingProxy:
@@ -102,6 +102,150 @@ except ImportError:
         return decorated
 
 
+_empty = object()
+
+
+class IndexedList:
+    """
+    A list of unique elements with O(1) membership tests, insertion and
+    removal.
+
+    Elements are indexed by identity, hence they do not need to be hashable.
+    Removal only marks the position of the element as empty and the list is
+    compacted lazily before the next indexed access or when more than half of
+    its slots are empty. Insertion order is always preserved.
+    """
+
+    __slots__ = ('_data', '_index', '_holes')
+
+    def __init__(self, data=()):
+        self._data = []
+        self._index = {}
+        self._holes = 0
+        self.add_many(data)
+
+    def __len__(self):
+        return len(self._index)
+
+    def __iter__(self):
+        self._compact()
+        return (x for x in self._data if x is not _empty)
+
+    def __reversed__(self):
+        self._compact()
+        return (x for x in reversed(self._data) if x is not _empty)
+
+    def __contains__(self, obj):
+        return id(obj) in self._index
+
+    def __getitem__(self, idx):
+        self._compact()
+        return self._data[idx]
+
+    def __repr__(self):
+        return '%s(%r)' % (type(self).__name__, list(self))
+
+    def _compact(self):
+        # A new list is created so iterators over the old one are not
+        # affected.
+        if self._holes:
+            self._data = data = [x for x in self._data if x is not _empty]
+            self._index = {id(x): i for i, x in enumerate(data)}
+            self._holes = 0
+
+    def add(self, obj):
+        """
+        Append object to the list, if not present.
+
+        Return True if object was inserted.
+        """
+
+        key = id(obj)
+        if key in self._index:
+            return False
+        self._index[key] = len(self._data)
+        self._data.append(obj)
+        return True
+
+    def add_many(self, objects):
+        """
+        Append all objects that are not present in the list.
+
+        Return the list of inserted objects.
+        """
+
+        index = self._index
+        data = self._data
+        added = []
+        for obj in objects:
+            key = id(obj)
+            if key not in index:
+                index[key] = len(data)
+                data.append(obj)
+                added.append(obj)
+        return added
+
+    def remove(self, obj):
+        """
+        Remove object from list.
+
+        Raises ValueError if object is not present.
+        """
+
+        try:
+            idx = self._index.pop(id(obj))
+        except KeyError:
+            raise ValueError('object not present: %r' % obj)
+
+        self._data[idx] = _empty
+        self._holes += 1
+        if 2 * self._holes > len(self._data):
+            self._compact()
+
+    def discard(self, obj):
+        """
+        Remove object from list, if present.
+        """
+
+        if id(obj) in self._index:
+            self.remove(obj)
+
+    def remove_many(self, objects):
+        """
+        Remove all given objects.
+
+        Objects that are not present are ignored. Return the list of removed
+        objects.
+        """
+
+        removed = []
+        for obj in objects:
+            if id(obj) in self._index:
+                self.remove(obj)
+                removed.append(obj)
+        return removed
+
+    def index(self, obj):
+        """
+        Return the position of object in the list.
+        """
+
+        self._compact()
+        try:
+            return self._index[id(obj)]
+        except KeyError:
+            raise ValueError('object not present: %r' % obj)
+
+    def clear(self):
+        """
+        Remove all elements.
+        """
+
+        self._data = []
+        self._index = {}
+        self._holes = 0
+
+
 #
 # Easy interactive console for debugging
 #
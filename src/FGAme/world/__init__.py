@@ -1,6 +1,7 @@
 from .state_objects import PosObject as _pos_class
 from .state_objects import VelObject as _vel_class
 from .world import World
+from .pool import BodyPool
 
 world = World()
 pos = _pos_class()
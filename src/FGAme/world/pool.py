@@ -0,0 +1,144 @@
+from FGAme.mathtools import asvector, null2D
+from FGAme.physics import flags
+
+# Per-instance attributes that must not be shared between a template and its
+# copies.
+_LISTENER_ATTRS = ('_connected_handlers', '_instance_signals',
+                   '_autoconnected')
+
+
+class BodyPool:
+    """
+    A pool of recycled bodies created from a template.
+
+    Short-lived objects such as bullets and particles can be acquired from the
+    pool and released back once they are not needed anymore. Recycled objects
+    keep their geometry and draw shapes and only have their dynamic state
+    reset, avoiding the cost of creating a new body from scratch.
+
+    Args:
+        template:
+            A body that serves as template for all objects in the pool. The
+            template itself is never added to the world.
+        world:
+            World in which acquired objects are inserted.
+        size:
+            Number of objects that are created in advance.
+
+    Example:
+        >>> pool = BodyPool(Circle(5, color='red'), world, size=100)
+        >>> bullet = pool.acquire(pos=(0, 0), vel=(500, 0))
+        >>> pool.release(bullet)
+    """
+
+    def __init__(self, template, world=None, size=0):
+        self.template = template
+        self.world = world
+        self.num_created = 0
+        self.num_reused = 0
+        self._flags = template.flags | flags.dirty_any
+        self._free = [self._new() for _ in range(size)]
+
+    def __len__(self):
+        return len(self._free)
+
+    def _new(self):
+        """
+        Create a new object as a shallow copy of the template.
+        """
+
+        template = self.template
+        obj = template.copy()
+        for attr in _LISTENER_ATTRS:
+            obj.__dict__.pop(attr, None)
+        obj.collisions = []
+        obj.world = None
+        for attr in ('_drawshape', '_image'):
+            value = getattr(template, attr, None)
+            if value is not None:
+                setattr(obj, attr, value.copy())
+        self.num_created += 1
+        return obj
+
+    def acquire(self, pos=None, vel=null2D, theta=0.0, omega=0.0, world=None):
+        """
+        Return an object from the pool with the given dynamic state and insert
+        it in the world.
+
+        A new object is created if the pool is empty.
+        """
+
+        obj = self._recycle(pos, vel, theta, omega)
+        world = world or self.world
+        if world is not None:
+            world.add(obj)
+        return obj
+
+    def acquire_many(self, states, world=None):
+        """
+        Acquire one object for each (pos, vel) pair in states and insert all
+        of them in the world in a single pass.
+        """
+
+        objects = [self._recycle(pos, vel) for pos, vel in states]
+        world = world or self.world
+        if world is not None:
+            world.add_many(objects)
+        return objects
+
+    def _recycle(self, pos=None, vel=null2D, theta=0.0, omega=0.0):
+        """
+        Pop an object from the pool (or create a new one) and reset its
+        dynamic state.
+        """
+
+        if self._free:
+            obj = self._free.pop()
+            self.num_reused += 1
+        else:
+            obj = self._new()
+
+        template = self.template
+        obj.flags = self._flags
+        obj._pos = template._pos if pos is None else asvector(pos)
+        obj._vel = asvector(vel)
+        obj._acceleration = null2D
+        if obj.flags & flags.can_rotate:
+            obj._theta = float(theta)
+            obj._omega = float(omega)
+            obj._alpha = 0.0
+        if hasattr(template, 'visible'):
+            obj.visible = template.visible
+        return obj
+
+    def release(self, obj):
+        """
+        Remove object from its world and return it to the pool.
+        """
+
+        world = obj.world
+        if world is not None:
+            world.remove(obj)
+        obj.pause_signals()
+        self._free.append(obj)
+
+    def release_many(self, objects):
+        """
+        Release a sequence of objects in a single pass.
+        """
+
+        objects = list(objects)
+        worlds = {id(obj.world): obj.world for obj in objects
+                  if obj.world is not None}
+        for world in worlds.values():
+            world.remove_many([obj for obj in objects if obj.world is world])
+        for obj in objects:
+            obj.pause_signals()
+        self._free.extend(objects)
+
+    def clear(self):
+        """
+        Discard all free objects in the pool.
+        """
+
+        self._free.clear()
@@ -9,8 +9,9 @@ from FGAme.draw import RenderTree, colorproperty
 from FGAme.objects import Body
 from FGAme.physics import Simulation
 from FGAme.utils import delegate_to
-from FGAme.utils import lazy
+from FGAme.utils import lazy, IndexedList
 from FGAme.world.factory import ObjectFactory
+from FGAme.world.pool import BodyPool
 from FGAme.world.tracker import Tracker
 
 
@@ -25,6 +26,8 @@ class World(Listener, collections.MutableSequence):
     damping = delegate_to('_simulation')
     adamping = delegate_to('_simulation')
     time = delegate_to('_simulation', readonly=True)
+    add_tilegrid = delegate_to('_simulation')
+    remove_tilegrid = delegate_to('_simulation')
 
     # Special properties
     @lazy
@@ -53,7 +56,7 @@ class World(Listener, collections.MutableSequence):
 
         self.background = background
         self._render_tree = RenderTree()
-        self._objects = []
+        self._objects = IndexedList()
 
         if simulation:
             self._simulation = simulation
@@ -84,6 +87,9 @@ class World(Listener, collections.MutableSequence):
     def __iter__(self):
         return iter(self._objects)
 
+    def __contains__(self, obj):
+        return obj in self._objects
+
     def __getitem__(self, i):
         return self._objects[i]
 
@@ -99,14 +105,29 @@ class World(Listener, collections.MutableSequence):
         """
 
         if isinstance(obj, (tuple, list)):
-            for obj in obj:
-                self.add(obj, layer=layer)
+            self.add_many(obj, layer=layer)
+        elif hasattr(obj, 'update_world'):
+            obj.update_world(self, layer)
         else:
             self._render_tree.add(obj, layer)
             if isinstance(obj, Body):
                 self._simulation.add(obj)
                 obj.world = self
-            self._objects.append(obj)
+            self._objects.add(obj)
+
+    def add_many(self, objects, layer=0):
+        """
+        Adds a sequence of objects to the world in a single pass.
+
+        Objects already present in the world are ignored.
+        """
+
+        objects = self._objects.add_many(objects)
+        bodies = [obj for obj in objects if isinstance(obj, Body)]
+        self._render_tree.add_many(objects, layer)
+        self._simulation.add_many(bodies)
+        for obj in bodies:
+            obj.world = self
 
     def insert(self, idx, obj):
         raise IndexError('cannot insert objects at specific positions. '
@@ -125,14 +146,39 @@ class World(Listener, collections.MutableSequence):
         """
 
         if getattr(obj, 'world', None) is self:
-            if obj in self._render_tree:
+            try:
                 self._render_tree.remove(obj)
-            self._simulation.remove(obj)
+            except ValueError:
+                pass
+            self._simulation.discard(obj)
             obj.world = None
         else:
             self._render_tree.remove(obj)
         self._objects.remove(obj)
 
+    def remove_many(self, objects):
+        """
+        Remove a sequence of objects from the world in a single pass.
+
+        Objects that are not present in the world are ignored.
+        """
+
+        removed = self._objects.remove_many(objects)
+        bodies = [obj for obj in removed
+                  if getattr(obj, 'world', None) is self]
+        self._render_tree.remove_many(removed)
+        self._simulation.remove_many(bodies)
+        for obj in bodies:
+            obj.world = None
+
+    def pool(self, template, size=0):
+        """
+        Return a BodyPool that recycles copies of the given template body in
+        this world.
+        """
+
+        return BodyPool(template, self, size)
+
     def init(self):
         """
         Executed after initialization.